@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""Dupes benchmark: DupesIndex vs. the dict of occurrence dicts
+create_dupes_database used to build, on a synthetic game.
+
+    python benchmarks/bench_dupes.py [files] [lines per file]
+"""
+
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from dupes_index import DupesIndex  # noqa: E402
+
+# short lines ('...', names, interjections) are the usual dupes
+COMMON = ['\n...\n', '\nHein ?\n', '\nMakoto\n', '\nQuoi ?!\n', '\n[EMPTY_LINE]\n'] + \
+         ['\nRéplique %d\n' % i for i in range(2000)] + \
+         ['\n<CLT 03>Réplique %d<CLT> \n' % i for i in range(0, 2000, 10)]
+
+
+def make_scripts(files, lines, seed=0):
+    rng = random.Random(seed)
+    scripts = dict()
+    for f in range(files):
+        script = '/script_data/dr1/e%02d_%03d_%03d.po' % (f % 8, f // 8, f)
+        scripts[script] = [rng.choice(COMMON) if rng.random() < 0.3 else
+                           '\nLigne %d du script %d\n' % (i, f) for i in range(lines)]
+    return scripts
+
+
+def legacy_dupes(scripts):
+    dupes = dict()
+    tmp = dict()
+    for file in scripts:
+        i = 0
+        for line in scripts[file]:
+            if line not in tmp.keys():
+                tmp[line] = [{'script_name': file, 'line_index': i}]
+            else:
+                tmp[line].append({'script_name': file, 'line_index': i})
+                dupes[line] = tmp[line]
+            i += 1
+    return dupes
+
+
+def measure(build, scripts):
+    """result, build time, and memory kept by the result (measured on a
+    second build, tracemalloc slows it down)"""
+    start = perf_counter()
+    build(scripts)
+    seconds = perf_counter() - start
+    tracemalloc.start()
+    result = build(scripts)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, seconds, size
+
+
+def main(files=1000, lines=100):
+    scripts = make_scripts(files, lines)
+    print('%d lines' % (files * lines))
+
+    legacy, legacy_time, legacy_size = measure(legacy_dupes, scripts)
+    index, index_time, index_size = measure(DupesIndex, scripts)
+    assert set(index) == set(legacy)
+    loose, loose_time, loose_size = measure(lambda data: DupesIndex(data, loose=True), scripts)
+
+    print('legacy dict   %7.3f s  %8.1f MB kept' % (legacy_time, legacy_size / 2 ** 20))
+    print('DupesIndex    %7.3f s  %8.1f MB kept' % (index_time, index_size / 2 ** 20))
+    print('loose dupes   %7.3f s  %8.1f MB kept' % (loose_time, loose_size / 2 ** 20))
+
+    script = next(iter(scripts))
+    runs = 10000
+    start = perf_counter()
+    for _ in range(runs):
+        index.siblings(script, 0)
+    print('siblings      %7.1f us' % ((perf_counter() - start) / runs * 1e6))
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
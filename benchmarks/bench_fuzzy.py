@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""Fuzzy matches benchmark: FuzzyIndex build and query times on a
+synthetic game (the queries must stay well under 10 ms).
+
+    python benchmarks/bench_fuzzy.py [files] [lines per file]
+"""
+
+import random
+import sys
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bench_search import make_game  # noqa: E402
+from fuzzy_index import FuzzyIndex  # noqa: E402
+
+
+def main(files=1000, lines=100, queries=200):
+    data = make_game(files, lines)
+    originals = [line for script_lines in data['ORIGINAL'].values() for line in script_lines]
+    print('%d lines' % len(originals))
+
+    start = perf_counter()
+    index = FuzzyIndex(originals)
+    print('index build    %7.3f s  (%d trigrams)' % (perf_counter() - start, len(index.postings)))
+
+    rng = random.Random(1)
+    times = list()
+    for line in rng.sample(originals, queries):
+        start = perf_counter()
+        index.search(line)
+        times.append(perf_counter() - start)
+    times.sort()
+    print('query median   %7.2f ms' % (times[len(times) // 2] * 1000))
+    print('query max      %7.2f ms' % (times[-1] * 1000))
+
+    start = perf_counter()
+    index.add('\nUne ligne traduite dans l\'éditeur\n')
+    print('add one line   %7.2f ms' % ((perf_counter() - start) * 1000))
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
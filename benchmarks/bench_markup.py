@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""Keystroke benchmark: the length checks of check_line_len with markup vs.
+the character loops and the 99 str.replace they used to run.
+
+    python benchmarks/bench_markup.py [keystrokes]
+"""
+
+import sys
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from markup import Markup, markup  # noqa: E402
+
+LINE = '<CLT 03>Makoto<CLT>, tu as vu <CLT 12>le couloir<CLT> ?\nIl faut qu\'on y aille, <CLT 04>vite<CLT> !'
+
+
+def legacy_count_rem(w_line, i):
+    if w_line.find('>') != -1:
+        count = 1
+    else:
+        count = 0
+    while i < len(w_line) and w_line[i] != '>':
+        count += 1
+        i += 1
+    return count, i + 1
+
+
+def legacy_find_to_remove(w_line):
+    i = 0
+    to_rem = 0
+    while i < len(w_line):
+        while i < len(w_line) and w_line[i] == '<':
+            rem, i = legacy_count_rem(w_line, i)
+            to_rem += rem
+        i += 1
+    return to_rem
+
+
+def legacy_cleaned_text(w_line):
+    i = 0
+    new_line = list()
+    while i < len(w_line):
+        while i < len(w_line) and w_line[i] == '<':
+            var, i = legacy_count_rem(w_line, i)
+        if i < len(w_line) and w_line[i] != '<':
+            new_line.append(w_line[i])
+        i += 1
+    return ''.join(new_line)
+
+
+def legacy_length_is_okay(line):
+    line = legacy_cleaned_text(line)
+    return all(len(row.replace('\r', '')) <= 64 for row in line.split('\n'))
+
+
+def legacy_save_length_is_okay(line):
+    if line.find('<CLT') != -1:
+        for i in range(99):
+            if i < 10:
+                line = line.replace('<CLT 0' + str(i) + '>', '')
+            else:
+                line = line.replace('<CLT ' + str(i) + '>', '')
+        line = line.replace('<CLT>', '')
+    return len(line.split('\n')[0]) <= 64
+
+
+def main(keystrokes=20000):
+    # the text typed so far, and the cursor at its end: each keystroke
+    # rechecks the whole line and the row of the cursor
+    texts = [(LINE * 3)[:i % (3 * len(LINE)) + 1] for i in range(keystrokes)]
+
+    start = perf_counter()
+    for text in texts:
+        row = text.rsplit('\n', 1)[-1]
+        len(row) - legacy_find_to_remove(row)
+        legacy_length_is_okay(text)
+        legacy_save_length_is_okay(text)
+    print('character loops  %8.1f ms' % ((perf_counter() - start) * 1000))
+
+    start = perf_counter()
+    for text in texts:
+        row = text.rsplit('\n', 1)[-1]
+        markup(row).visible_column(len(row))
+        max(markup(text).row_lengths()) <= 64
+        markup(text).row_lengths()[0] <= 64
+    print('markup           %8.1f ms' % ((perf_counter() - start) * 1000))
+
+    # the same without the memo: every line is tokenized again
+    start = perf_counter()
+    for text in texts:
+        row = text.rsplit('\n', 1)[-1]
+        Markup(row).visible_column(len(row))
+        max(Markup(text).row_lengths()) <= 64
+        Markup(text).row_lengths()[0] <= 64
+    print('markup, no memo  %8.1f ms' % ((perf_counter() - start) * 1000))
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""Microbenchmark: po_io._unquote_po_string vs. the old per-character loop.
+
+Run from the repository root:
+
+    python benchmarks/bench_po_escape.py
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from po_io import _unquote_po_string  # noqa: E402
+
+
+def legacy_unquote_po_string(s):
+    """The decoder po_io used before the regex codec (reference)."""
+
+    s = s.strip()
+    if not (len(s) >= 2 and s[0] == '"' and s[-1] == '"'):
+        raise ValueError(f"Invalid PO string literal: {s!r}")
+
+    body = s[1:-1]
+
+    out = []
+    i = 0
+    while i < len(body):
+        c = body[i]
+        if c != "\\":
+            out.append(c)
+            i += 1
+            continue
+
+        if i + 1 >= len(body):
+            out.append("\\")
+            i += 1
+            continue
+
+        n = body[i + 1]
+        if n == "n":
+            out.append("\n")
+            i += 2
+        elif n == "t":
+            out.append("\t")
+            i += 2
+        elif n == "r":
+            out.append("\r")
+            i += 2
+        elif n == '"':
+            out.append('"')
+            i += 2
+        elif n == "\\":
+            out.append("\\")
+            i += 2
+        else:
+            out.append(n)
+            i += 2
+
+    return "".join(out)
+
+
+SAMPLES = {
+    "plain": '"Makoto, tu es sûr de vouloir ouvrir cette porte ?"',
+    "escaped": '"<CLT 03>Il a dit \\"non\\"<CLT>\\nEt puis plus rien...\\n"',
+    "long": '"' + "Une phrase assez longue pour un dialogue. " * 20 + '"',
+}
+
+
+def main(number=200000):
+    for name, sample in SAMPLES.items():
+        assert _unquote_po_string(sample) == legacy_unquote_po_string(sample)
+        old = timeit.timeit(lambda: legacy_unquote_po_string(sample), number=number)
+        new = timeit.timeit(lambda: _unquote_po_string(sample), number=number)
+        print('%-8s legacy %7.1f ns  new %7.1f ns  x%.1f' % (
+            name, old / number * 1e9, new / number * 1e9, old / new))
+
+
+if __name__ == '__main__':
+    main()
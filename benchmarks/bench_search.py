@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""Search benchmark: SearchIndex vs. the linear scan search_in_all_database
+used to do, on a synthetic game.
+
+    python benchmarks/bench_search.py [files] [lines per file]
+"""
+
+import random
+import sys
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from search_index import SEARCH_TAGS, SearchIndex  # noqa: E402
+
+WORDS = ('Makoto', 'Kirigiri', 'Togami', 'porte', 'ouvrir', 'nuit', 'classe', 'procès', 'monokuma',
+         'désespoir', 'espoir', 'il', 'elle', 'est', 'dans', 'la', 'le', 'une', '<CLT 03>', '<CLT>')
+JP = '希望絶望学園の生徒がモノクマに会うかな'
+
+
+def make_game(files, lines, seed=0):
+    rng = random.Random(seed)
+    data = {tag: dict() for tag in SEARCH_TAGS}
+    for f in range(files):
+        script = '/script_data/dr1/e%02d_%03d_%03d.po' % (f % 8, f // 8, f)
+        data['ORIGINAL'][script] = ['\n%s\n' % ' '.join(rng.choice(WORDS) for _ in range(10)) for _ in range(lines)]
+        data['TRANSLATED'][script] = ['\n%s\n' % ' '.join(rng.choice(WORDS) for _ in range(10)) for _ in range(lines)]
+        data['JAPANESE'][script] = ['\n%s\n' % ''.join(rng.choice(JP) for _ in range(20)) for _ in range(lines)]
+        data['COMMENT'][script] = ['\n\n'] * lines
+    return data
+
+
+def linear_search(data, text):
+    hits = set()
+    for tag in SEARCH_TAGS:
+        for script, script_lines in data[tag].items():
+            for i, line in enumerate(script_lines):
+                if line.lower().find(text.lower()) != -1:
+                    hits.add((script, i))
+    return sorted(hits)
+
+
+def main(files=1000, lines=100):
+    data = make_game(files, lines)
+    print('%d lines' % (files * lines))
+
+    start = perf_counter()
+    index = SearchIndex(data)
+    print('index build                %.3f s' % (perf_counter() - start))
+
+    for query in ('Kirigiri ouvrir', 'désespoir procès', '学園の', 'monokuma est dans la', 'xyz', 'la'):
+        start = perf_counter()
+        scan = linear_search(data, query)
+        scan_time = perf_counter() - start
+        start = perf_counter()
+        hits = index.search(query)
+        index_time = perf_counter() - start
+        assert [(script, line) for script, line, *_ in hits] == scan
+        print('%-22s %6d hits  scan %7.1f ms  index %7.1f ms' % (
+            repr(query), len(hits), scan_time * 1e3, index_time * 1e3))
+
+
+if __name__ == '__main__':
+    main(*(int(a) for a in sys.argv[1:3]))
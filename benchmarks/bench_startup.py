@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""Startup benchmark: cold parse (serial and with worker processes) vs. warm
+load from the corpus snapshot.
+
+Builds a synthetic game folder and times loading it the way load_data does.
+
+    python benchmarks/bench_startup.py [files] [lines per file]
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from corpus_snapshot import load_game  # noqa: E402
+from po_io import PoEntry, write_po  # noqa: E402
+from script_analyser import TAG_NAMES, XmlAnalyser, default_workers  # noqa: E402
+
+
+def make_po_game(root, files, lines):
+    root.mkdir(parents=True)
+    for f in range(files):
+        entries = [
+            PoEntry(msgctxt='%04d | MAKOTO' % i,
+                    msgid='<CLT 03>Line %d of script %d, "quoted".<CLT>\nSecond row.' % (i, f),
+                    msgstr='Ligne %d du script %d.' % (i, f) if i % 3 else '',
+                    translator_comments=['note'] if i % 7 == 0 else [],
+                    extracted_comments=['日本語のセリフ %d' % i])
+            for i in range(lines)
+        ]
+        write_po(root / ('e%02d_%03d_%03d.po' % (f % 8, f // 8, f)), entries)
+
+
+def timed_load(root, **kw):
+    start = perf_counter()
+    xa = XmlAnalyser(str(root))
+    counts = load_game(xa, TAG_NAMES, **kw)
+    return perf_counter() - start, counts
+
+
+def main(files=900, lines=60):
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / 'dr1'
+        make_po_game(root, files, lines)
+
+        start = perf_counter()
+        XmlAnalyser(str(root)).analyse_all_scripts(TAG_NAMES)
+        print('parse only (no snapshot)   %.3f s' % (perf_counter() - start))
+
+        t, counts = timed_load(root, rebuild=True)
+        print('cold (parse + write)       %.3f s  %s' % (t, counts))
+        workers = default_workers()
+        t, counts = timed_load(root, rebuild=True, workers=workers)
+        print('cold, %2d workers           %.3f s  %s' % (workers, t, counts))
+        t, counts = timed_load(root)
+        print('warm (snapshot)            %.3f s  %s' % (t, counts))
+        print('snapshot size              %.1f KiB' % ((root / '.sdse_snapshot').stat().st_size / 1024))
+
+
+if __name__ == '__main__':
+    main(*(int(a) for a in sys.argv[1:3]))
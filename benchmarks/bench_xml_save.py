@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""XML save benchmark: XmlScript vs. the buffer.replace loop save_file
+used to run, on a synthetic DRAT .xml script.
+
+    python benchmarks/bench_xml_save.py [lines]
+"""
+
+import sys
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from save import get_key  # noqa: E402
+from xml_script import XmlScript  # noqa: E402
+
+TAGS = ('ORIGINAL', 'TRANSLATED', 'JAPANESE', 'COMMENT')
+
+
+def make_script(lines):
+    # keys stay under 1000, the legacy loop cannot go past 999
+    parts = list()
+    for i in range(lines):
+        key = '%03d' % (i % 999 + 1)
+        for tag in TAGS:
+            parts.append('<%s N°%s>\nLigne %d de %s, assez longue pour un vrai script\n</%s N°%s>\n'
+                         % (tag, key, i, tag, tag, key))
+    return ''.join(parts)
+
+
+def legacy_save(buffer, tagname, xml_file_data):
+    trad_begin = buffer.find('<' + tagname + ' N°') + len('<' + tagname + ' N°')
+    trad_end = buffer.find('</' + tagname + ' N°') + len('</' + tagname + ' N°') + 4
+
+    index = 0
+    while trad_begin != -1 and trad_end != -1:
+        short_key = get_key(buffer, trad_begin)
+
+        while buffer[trad_begin] != '>':
+            trad_begin += 1
+        trad_begin += 1
+
+        buffer = buffer.replace(buffer[trad_begin:trad_end], xml_file_data[index] + '</' + tagname + ' N°' + short_key + '>')
+
+        if index == len(xml_file_data) - 1:
+            break
+        trad_begin = buffer.find('<' + tagname + ' N°', trad_begin) + len('<' + tagname + ' N°')
+        trad_end = buffer.find('</' + tagname + ' N°', trad_begin) + len('</' + tagname + ' N°') + 4
+        index += 1
+    return buffer
+
+
+def main(lines=2000):
+    buffer = make_script(lines)
+    translated = XmlScript(buffer).lines('TRANSLATED')
+    translated[lines // 2] = '\nTraduction modifiée\n'
+    print('%d lines, %d characters' % (lines, len(buffer)))
+
+    start = perf_counter()
+    legacy = legacy_save(buffer, 'TRANSLATED', translated).encode('utf-16-le')
+    print('buffer.replace loop  %8.1f ms' % ((perf_counter() - start) * 1000))
+
+    start = perf_counter()
+    script = XmlScript(buffer)
+    print('XmlScript index      %8.1f ms' % ((perf_counter() - start) * 1000))
+
+    # the index is kept between saves: a save only splices and encodes
+    start = perf_counter()
+    spliced = script.with_lines('TRANSLATED', translated)
+    encoded = spliced.buffer.encode('utf-16-le')
+    print('XmlScript save       %8.1f ms' % ((perf_counter() - start) * 1000))
+    assert encoded == legacy
+
+    start = perf_counter()
+    for i in range(0, lines, 7):
+        assert script.line('TRANSLATED', i) == translated[i] or i == lines // 2
+    print('read every 7th line  %8.1f ms' % ((perf_counter() - start) * 1000))
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
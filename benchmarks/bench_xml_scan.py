@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""XML load benchmark: script_lines, one pass for the five tags, vs. the
+find loop get_file_script used to run once per tag, on a synthetic set of
+DRAT .xml scripts.
+
+    python benchmarks/bench_xml_scan.py [megabytes]
+"""
+
+import sys
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from script_analyser import TAG_NAMES  # noqa: E402
+from xml_script import script_lines  # noqa: E402
+
+LINES = 500
+
+
+def legacy_get_file_script(buf, tag_name='TRANSLATED'):
+    translated_s = '<' + tag_name + ' N°'
+    end_translated_s = '</' + tag_name
+
+    begin_trad_offset = len(translated_s) + 4
+    begin_trad = buf.find(translated_s) + begin_trad_offset
+    end_trad = buf.find(end_translated_s)
+
+    xml_script_data = list()
+    while begin_trad != -1 and end_trad != -1:
+        xml_script_data.append(buf[begin_trad:end_trad])
+        if buf.find(translated_s, end_trad) + begin_trad_offset < begin_trad:
+            break
+        begin_trad = buf.find(translated_s, end_trad) + begin_trad_offset
+        end_trad = buf.find(end_translated_s, begin_trad)
+    return xml_script_data
+
+
+def make_script(number):
+    parts = list()
+    for i in range(1, LINES + 1):
+        key = '%03d' % i
+        for tag in TAG_NAMES:
+            parts.append('<%s N°%s>\n<CLT 03>Réplique %d du script %d<CLT>, balise %s\n</%s N°%s>\n'
+                         % (tag, key, i, number, tag, tag, key))
+    return ''.join(parts)
+
+
+def main(megabytes=100):
+    buffers = list()
+    size = 0
+    while size < megabytes * 1000000:
+        buffers.append(make_script(len(buffers)))
+        size += len(buffers[-1])
+    print('%d scripts, %.0f MB of text' % (len(buffers), size / 1000000))
+
+    # the lines of each run are kept, as when a game is loaded, and dropped
+    # before the next one
+    start = perf_counter()
+    legacy = [{tag: legacy_get_file_script(buf, tag) for tag in TAG_NAMES} for buf in buffers]
+    print('find loop, per tag     %8.0f ms' % ((perf_counter() - start) * 1000))
+    del legacy
+
+    start = perf_counter()
+    tables = [script_lines(buf, TAG_NAMES) for buf in buffers]
+    print('script_lines, one pass %8.0f ms' % ((perf_counter() - start) * 1000))
+    del tables
+
+    for buf in buffers[::50]:
+        assert script_lines(buf, TAG_NAMES) == {tag: legacy_get_file_script(buf, tag) for tag in TAG_NAMES}
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
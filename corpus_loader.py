@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+from os.path import join
+from time import perf_counter
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from corpus_snapshot import iter_load_games
+from fuzzy_index import FuzzyIndex
+from script_analyser import XmlAnalyser, TAG_NAMES
+from search_index import SearchIndex
+
+
+class LoadThread(QThread):
+    """
+    Loads the games of script_data/ in the background. The priority game
+    (the one the editor reopens) is loaded first, on its own; the others
+    follow and are handed over one by one as soon as they are ready.
+    """
+    # game, scripts parsed so far, scripts to parse in that game
+    progress = pyqtSignal(str, int, int)
+    # game, its XmlAnalyser, its SearchIndex, scripts taken from the
+    # snapshot, scripts parsed
+    game_loaded = pyqtSignal(str, object, object, int, int)
+    # total loading time in seconds
+    loading_done = pyqtSignal(float)
+
+    def __init__(self, root, games, priority=None, rebuild_snapshot=False, workers=1):
+        QThread.__init__(self)
+        self.root = root
+        self.games = list(games)
+        self.priority = priority
+        self.rebuild_snapshot = rebuild_snapshot
+        self.workers = workers
+
+    def __del__(self):
+        self.wait()
+
+    def batches(self):
+        if self.priority in self.games:
+            others = [game for game in self.games if game != self.priority]
+            return [[self.priority], others] if others else [[self.priority]]
+        return [self.games]
+
+    def run(self):
+        start = perf_counter()
+
+        for games in self.batches():
+            analysers = {XmlAnalyser(join(self.root, game)): game for game in games}
+
+            def report(analyser, done, total):
+                self.progress.emit(analysers[analyser], done, total)
+
+            loaded = iter_load_games(list(analysers), TAG_NAMES, rebuild=self.rebuild_snapshot,
+                                     workers=self.workers, progress=report)
+            for analyser, (cached, parsed) in loaded:
+                index = SearchIndex(analyser.script_data)
+                self.game_loaded.emit(analysers[analyser], analyser, index, cached, parsed)
+
+        self.loading_done.emit(perf_counter() - start)
+
+
+class FuzzyIndexThread(QThread):
+    """
+    Builds the FuzzyIndex of the translated lines of the loaded games in
+    the background
+    """
+    index_ready = pyqtSignal(object)
+
+    def __init__(self, lines):
+        QThread.__init__(self)
+        self.lines = lines
+
+    def __del__(self):
+        self.wait()
+
+    def run(self):
+        self.index_ready.emit(FuzzyIndex(self.lines))
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""On-disk snapshot of a parsed game folder, for fast startup.
+
+Each game folder (script_data/<game>/) gets a `.sdse_snapshot` file holding
+the five tag tables of every script, along with the (mtime_ns, size) and a
+content hash of the file they were parsed from. At startup a script is
+taken from the snapshot when its stat is unchanged, or when only its mtime
+moved but its content hash still matches (git checkout, copies...). Only
+the other scripts are parsed again, then the snapshot is rewritten.
+
+File format: MAGIC, a big-endian uint16 format version, then a
+zlib-compressed UTF-8 JSON document. JSON is used rather than pickle on
+purpose: script folders are shared through git and must never be able to
+run code when loaded.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import zlib
+
+from script_analyser import TAG_NAMES, file_stat, iter_parse_script_jobs
+
+SNAPSHOT_NAME = '.sdse_snapshot'
+SNAPSHOT_MAGIC = b'SDSESNAP'
+SNAPSHOT_VERSION = 1
+
+_HEADER = struct.Struct('>H')
+
+
+def snapshot_path(game_dir):
+    return os.path.join(game_dir, SNAPSHOT_NAME)
+
+
+def file_digest(filename):
+    with open(filename, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+def read_snapshot(game_dir, mode, tag_names=TAG_NAMES):
+    """Return {relative path: entry} from the game snapshot.
+
+    A missing, corrupt, outdated or incompatible snapshot reads as empty.
+    """
+
+    try:
+        with open(snapshot_path(game_dir), 'rb') as f:
+            raw = f.read()
+    except OSError:
+        return dict()
+
+    header = SNAPSHOT_MAGIC + _HEADER.pack(SNAPSHOT_VERSION)
+    if not raw.startswith(header):
+        return dict()
+
+    try:
+        payload = json.loads(zlib.decompress(raw[len(header):]).decode('utf-8'))
+    except (zlib.error, ValueError):
+        return dict()
+
+    if payload.get('mode') != mode or payload.get('tags') != list(tag_names):
+        return dict()
+    return payload['files']
+
+
+def write_snapshot(game_dir, mode, tag_names, files):
+    """Atomically (re)write the game snapshot. Failures are not fatal."""
+
+    payload = {'mode': mode, 'tags': list(tag_names), 'files': files}
+    data = zlib.compress(json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), 1)
+
+    path = snapshot_path(game_dir)
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(SNAPSHOT_MAGIC + _HEADER.pack(SNAPSHOT_VERSION) + data)
+        os.replace(tmp_path, path)
+    except OSError:
+        return False
+    return True
+
+
+def _plan_game(analyser, tag_names, rebuild):
+    """Split the scripts of a game between snapshot hits and files to parse."""
+
+    game_dir = analyser.xml_path
+    old_files = dict() if rebuild else read_snapshot(game_dir, analyser.mode, tag_names)
+    plan = {
+        'analyser': analyser,
+        'old_count': len(old_files),
+        # relative path -> snapshot entry to write back
+        'files': dict(),
+        # path -> (file_stat, tables), kept in walk order
+        'scripts': dict(),
+        'pending': list(),
+        'changed': False,
+    }
+
+    for script_file in analyser.script_files():
+        rel = os.path.relpath(script_file, game_dir)
+        try:
+            stat = file_stat(script_file)
+        except FileNotFoundError:
+            continue
+
+        entry = old_files.get(rel)
+        if entry is not None and tuple(entry['stat']) != stat:
+            if entry['stat'][1] == stat[1] and file_digest(script_file) == entry['hash']:
+                # touched but identical: keep the tables, remember the new stat
+                entry['stat'] = list(stat)
+                plan['changed'] = True
+            else:
+                entry = None
+
+        if entry is None:
+            plan['scripts'][script_file] = None
+            plan['pending'].append(script_file)
+            continue
+
+        plan['scripts'][script_file] = stat, entry['tables']
+        plan['files'][rel] = entry
+
+    return plan
+
+
+def _finish_game(plan, results, tag_names):
+    """Store parsed results (in plan['pending'] order) and refresh the snapshot."""
+
+    analyser = plan['analyser']
+    game_dir = analyser.xml_path
+    scripts = plan['scripts']
+    parsed = 0
+
+    for script_file, result in zip(plan['pending'], results):
+        if result is None:
+            del scripts[script_file]
+            continue
+        stat, tables = scripts[script_file] = result
+        parsed += 1
+
+        try:
+            digest = file_digest(script_file)
+            unchanged = file_stat(script_file) == stat
+        except FileNotFoundError:
+            unchanged = False
+        # files modified while we were reading them stay out of the snapshot
+        if unchanged:
+            plan['files'][os.path.relpath(script_file, game_dir)] = {
+                'stat': list(stat), 'hash': digest, 'tables': tables}
+
+    analyser.store_scripts(scripts, tag_names)
+
+    if plan['changed'] or plan['pending'] or len(plan['files']) != plan['old_count']:
+        write_snapshot(game_dir, analyser.mode, tag_names, plan['files'])
+
+    return len(scripts) - parsed, parsed
+
+
+def iter_load_games(analysers, tag_names=TAG_NAMES, rebuild=False, workers=1, progress=None):
+    """Fill each analyser from its snapshot, parsing only what changed.
+
+    The files to parse of all games are fanned out together (see
+    iter_parse_script_jobs). Games are yielded in order as soon as their
+    last file is parsed, as (analyser, (scripts reused, scripts parsed)).
+    With rebuild=True the existing snapshots are ignored. `progress`, if
+    given, is called as progress(analyser, parsed so far, to parse) after
+    each parsed file.
+    """
+
+    plans = [_plan_game(analyser, tag_names, rebuild) for analyser in analysers]
+    jobs = [(script_file, plan['analyser'].mode, tag_names)
+            for plan in plans for script_file in plan['pending']]
+    results = iter_parse_script_jobs(jobs, workers)
+
+    for plan in plans:
+        game_results = list()
+        for _ in plan['pending']:
+            game_results.append(next(results))
+            if progress is not None:
+                progress(plan['analyser'], len(game_results), len(plan['pending']))
+        yield plan['analyser'], _finish_game(plan, game_results, tag_names)
+
+
+def load_game(analyser, tag_names=TAG_NAMES, rebuild=False, workers=1):
+    """Fill `analyser` from its snapshot, parsing only what changed.
+
+    Returns (scripts reused, scripts parsed).
+    """
+
+    for _, counts in iter_load_games([analyser], tag_names, rebuild, workers):
+        return counts
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""In-memory record of which script lines differ from what is on disk.
+
+The editor reports each new text of a line with edit(), and clears a
+file/tag pair once it has been written to (or re-read from) disk. The text
+a dirty line was loaded with is kept, so that setting it back makes the
+line clean again. Asking whether a file is modified is then O(1) and never
+touches the disk.
+"""
+
+
+class DirtyTracker:
+
+    def __init__(self):
+        # (script path, tag) -> one byte per line, 1 when edited in memory
+        self._bits = dict()
+        # (script path, tag) -> number of dirty lines
+        self._counts = dict()
+        # script path -> number of dirty lines, all tags together
+        self._file_counts = dict()
+        # (script path, tag) -> {line index: text on disk}, for dirty lines
+        self._loaded = dict()
+
+    def edit(self, script, tag, index, old, new):
+        """Line `index` goes from `old` to `new`: it is dirty unless `new`
+        is the text the line was loaded with"""
+        loaded = self._loaded.setdefault((script, tag), dict())
+        self.mark(script, tag, index, new != loaded.setdefault(index, old))
+
+    def mark(self, script, tag, index, dirty=True):
+        key = (script, tag)
+        if not dirty and key in self._loaded:
+            self._loaded[key].pop(index, None)
+        bits = self._bits.get(key)
+        if bits is None or index >= len(bits):
+            if not dirty:
+                return
+            if bits is None:
+                bits = self._bits[key] = bytearray()
+            bits.extend(bytes(index + 1 - len(bits)))
+
+        if bits[index] == dirty:
+            return
+        bits[index] = dirty
+        step = 1 if dirty else -1
+        self._counts[key] = self._counts.get(key, 0) + step
+        self._file_counts[script] = self._file_counts.get(script, 0) + step
+
+    def is_line_dirty(self, script, tag, index):
+        bits = self._bits.get((script, tag))
+        return bits is not None and index < len(bits) and bits[index] == 1
+
+    def dirty_lines(self, script, tag):
+        bits = self._bits.get((script, tag), b'')
+        return [index for index, dirty in enumerate(bits) if dirty]
+
+    def is_dirty(self, script, tag=None):
+        if tag is None:
+            return self._file_counts.get(script, 0) > 0
+        return self._counts.get((script, tag), 0) > 0
+
+    def clear(self, script, tag=None):
+        if tag is None:
+            keys = [key for key in self._bits if key[0] == script]
+        else:
+            keys = [(script, tag)]
+        for key in keys:
+            self._bits.pop(key, None)
+            self._loaded.pop(key, None)
+            count = self._counts.pop(key, 0)
+            if count:
+                self._file_counts[script] -= count
+
+    def dirty_files(self, tag=None):
+        if tag is None:
+            return sorted(s for s, count in self._file_counts.items() if count > 0)
+        return sorted(s for (s, t), count in self._counts.items() if t == tag and count > 0)
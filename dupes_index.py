@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""Index of the ORIGINAL lines that appear more than once in a game.
+
+Such a line is translated once: editing one of its occurrences updates all
+of them (see Ui_MainWindow.update_script_database). The index only holds
+integers. Scripts are numbered once, each group of identical lines gets an
+id, every line of a script knows its group (-1 if it is not duplicated),
+and the occurrences of all the groups are stored one after the other in
+two arrays, those of group g being between offsets[g] and offsets[g + 1].
+The text of a group is the string of the script data itself, not a copy.
+
+In loose mode, lines that only differ by their markup (<CLT 03>...) and
+whitespace are dupes too, see loose_keys.
+"""
+
+import re
+from array import array
+from itertools import islice
+
+from markup import tag_pattern
+
+# the tags of markup.py, that also stop at the NUL joining the lines in
+# loose_keys
+_MARKUP = tag_pattern('\x00')
+_SPACES = re.compile(r'\s+')
+
+
+def loose_keys(lines):
+    """
+    Keys of `lines` that are equal for the lines that only differ by their
+    markup and whitespace. The markup is removed, runs of whitespace and line
+    breaks become one space, and both ends are stripped. A line that is only
+    markup keeps its exact text as key.
+    All the lines are processed at once, as one text joined with NUL.
+    """
+    text = _SPACES.sub(' ', _MARKUP.sub('', '\x00'.join(lines)))
+    return [key.strip() or line for key, line in zip(text.split('\x00'), lines)]
+
+
+class DupesIndex:
+
+    def __init__(self, scripts, loose=False):
+        """
+        :param scripts: ORIGINAL lines by script, as in script_data
+        :param loose: group the lines by loose_keys instead of their text
+        """
+        self.scripts = list(scripts)
+        self.script_ids = {script: i for i, script in enumerate(self.scripts)}
+
+        lines = [line for script in self.scripts for line in scripts[script]]
+        keys = iter(loose_keys(lines) if loose else lines)
+        del lines
+
+        # number the distinct keys, count them, and note the number of the
+        # key of each line of each script
+        ids = dict()
+        counts = list()
+        self.line_groups = list()
+        for script in self.scripts:
+            line_ids = array('i')
+            for line in islice(keys, len(scripts[script])):
+                line_id = ids.setdefault(line, len(counts))
+                if line_id == len(counts):
+                    counts.append(1)
+                else:
+                    counts[line_id] += 1
+                line_ids.append(line_id)
+            self.line_groups.append(line_ids)
+
+        # only the keys seen twice or more make a group
+        group_ids = array('i', [-1]) * len(counts)
+        self.texts = list()
+        self.offsets = array('I', [0])
+        for line, line_id in ids.items():
+            if counts[line_id] > 1:
+                group_ids[line_id] = len(self.texts)
+                self.texts.append(line)
+                self.offsets.append(self.offsets[-1] + counts[line_id])
+        del ids, counts
+
+        self.script_of = array('I', [0]) * self.offsets[-1]
+        self.line_of = array('I', [0]) * self.offsets[-1]
+        ends = array('I', self.offsets[:-1])
+        for script_id, line_ids in enumerate(self.line_groups):
+            for line_index, line_id in enumerate(line_ids):
+                group = line_ids[line_index] = group_ids[line_id]
+                if group != -1:
+                    self.script_of[ends[group]] = script_id
+                    self.line_of[ends[group]] = line_index
+                    ends[group] += 1
+
+    def __len__(self):
+        return len(self.texts)
+
+    def __iter__(self):
+        """The duplicated lines (their keys in loose mode)"""
+        return iter(self.texts)
+
+    def group(self, script, line_index):
+        """Group of a line, -1 if it is not duplicated"""
+        script_id = self.script_ids.get(script)
+        if script_id is None:
+            return -1
+        return self.line_groups[script_id][line_index]
+
+    def occurrences(self, group):
+        """(script, line index) of the lines of a group"""
+        return [(self.scripts[self.script_of[i]], self.line_of[i])
+                for i in range(self.offsets[group], self.offsets[group + 1])]
+
+    def siblings(self, script, line_index):
+        """
+        (script, line index) of all the occurrences of a line, itself
+        included, or an empty list if the line is not duplicated
+        """
+        group = self.group(script, line_index)
+        if group == -1:
+            return []
+        return self.occurrences(group)
@@ -2,12 +2,13 @@
 import sys
 import warnings
 warnings.filterwarnings("ignore", message="sipPyTypeDict.*is deprecated")
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QModelIndex
 from os.path import basename, join, exists, expanduser
-from sys import argv, exit, stdout
+from sys import argv, exit
 from pathlib import Path
 import subprocess
 import threading
+from multiprocessing import freeze_support
 
 
 def resource_path(relative_path):
@@ -17,54 +18,87 @@ def resource_path(relative_path):
 
 from PyQt5.QtGui import QPixmap, QIcon, QKeySequence, QTextCursor
 from PyQt5.QtWidgets import QApplication, QMainWindow, QDialog, \
-    QTreeWidgetItem, QMessageBox, QShortcut
+    QMessageBox, QShortcut
 from os import listdir, remove
 from qtpy import uic
 
+from corpus_loader import LoadThread, FuzzyIndexThread
+from dirty_tracker import DirtyTracker
+from dupes_index import DupesIndex
 from json_file_working import load_json_file, dump_into_json
-from save import get_key
-from script_analyser import XmlAnalyser, length_is_okay, cleaned_text, \
-    find_w_line, find_to_remove
-from po_io import update_po_file, read_po, parse_context_speaker
+from list_models import LineIndexModel, SearchResultsModel
+from markup import markup
+from script_analyser import length_is_okay, cleaned_text, find_w_line, default_workers
+from po_io import update_po_file
+from script_catalog import ScriptCatalog
+from script_tree import ScriptTreeModel
+from search_index import SEARCH_TAGS
+from search_worker import DatabaseSearchThread
+from translation_memory import TranslationMemory
 from translator import SearchThread
 
 json_file_name = 'sdse_data_file.json'
 VERSION = "1.5"
 
+# similar translated lines shown in the Doublons tab, and their minimum score
+FUZZY_MATCHES = 5
+FUZZY_MIN_SCORE = 0.5
+
 
 def _git_commit_po(po_path: str):
     """
     Auto-commit a .po file to its local git repo (non-blocking background thread).
     Does NOT push — run `git push` manually or set up a periodic push.
     """
+    return _git_commit_pos([po_path])
+
+
+def _git_commit_pos(po_paths, message=None):
+    """
+    Auto-commit .po files to their local git repos, with one `git add` and
+    one commit per repo, in a single background thread (returned).
+    :param message: commit message when there are several files in a repo
+    """
+    po_paths = list(po_paths)
+
     def _run():
         try:
-            p = Path(po_path)
-            # Find repo root from the file's directory
-            result = subprocess.run(
-                ['git', 'rev-parse', '--show-toplevel'],
-                cwd=str(p.parent),
-                capture_output=True, text=True, timeout=5
-            )
-            if result.returncode != 0:
-                return  # Not a git repo, silently skip
-            repo_root = result.stdout.strip()
-
-            # Stage the file
-            subprocess.run(
-                ['git', 'add', po_path],
-                cwd=repo_root, capture_output=True, timeout=5
-            )
-            # Commit (skip if nothing staged)
-            msg = f'Updated {p.parent.name}/{p.name}'
-            subprocess.run(
-                ['git', 'commit', '-m', msg],
-                cwd=repo_root, capture_output=True, timeout=10
-            )
+            # repo root of each folder, found once
+            roots = dict()
+            by_repo = dict()
+            for po_path in po_paths:
+                folder = str(Path(po_path).parent)
+                if folder not in roots:
+                    result = subprocess.run(
+                        ['git', 'rev-parse', '--show-toplevel'],
+                        cwd=folder, capture_output=True, text=True, timeout=5
+                    )
+                    roots[folder] = result.stdout.strip() if result.returncode == 0 else None
+                if roots[folder] is not None:  # not a git repo: silently skip
+                    by_repo.setdefault(roots[folder], list()).append(po_path)
+
+            for repo_root, paths in by_repo.items():
+                # Stage the files
+                subprocess.run(
+                    ['git', 'add', '--'] + paths,
+                    cwd=repo_root, capture_output=True, timeout=30
+                )
+                # Commit (skip if nothing staged)
+                if len(paths) == 1:
+                    p = Path(paths[0])
+                    msg = f'Updated {p.parent.name}/{p.name}'
+                else:
+                    msg = message or f'Updated {len(paths)} files'
+                subprocess.run(
+                    ['git', 'commit', '-m', msg],
+                    cwd=repo_root, capture_output=True, timeout=30
+                )
         except Exception:
             pass  # Never crash the UI
 
-    threading.Thread(target=_run, daemon=True).start()
+    thread = threading.Thread(target=_run, daemon=True)
+    thread.start()
+    return thread
 
 
 class Ui_MainWindow(QMainWindow):
@@ -72,9 +106,13 @@ class Ui_MainWindow(QMainWindow):
     Another SDSE for your pleasure.
     """
 
-    def __init__(self):
+    def __init__(self, rebuild_snapshot=False, workers=None):
         """
         Initialization of the main GUI
+        :param rebuild_snapshot: parse every script again instead of using
+        the saved corpus snapshots
+        :param workers: number of processes parsing scripts at startup
+        (default: one per CPU)
         """
         QMainWindow.__init__(self)
         uic.loadUi(resource_path('gui/AnotherSDSE.ui'), self)
@@ -87,10 +125,40 @@ class Ui_MainWindow(QMainWindow):
         self.dupes = dict()
         self.data_modified_in_dupes = False
         self.dupes_files_to_save = list()
+        # lines that only differ by markup and whitespace are dupes too
+        self.loose_dupes = False
         self.script_ppath = None
         self.search_sepatator = '||'
 
-        self.search_data = dict()
+        # game -> SearchIndex of its searchable lines
+        self.search_index = dict()
+        # running search of the search dialog, and the number of the last one
+        self.search_thread = None
+        self.search_generation = 0
+        self.search_game = ''
+        self.search_text = ''
+
+        # file name -> (game, full path) of every loaded script
+        self.catalog = ScriptCatalog()
+
+        # translations of the lines of all the games, and the one offered
+        # for the current line
+        self.tm = TranslationMemory()
+        self.tm_suggestion = None
+        # fuzzy index of the lines of the memory, built in the background
+        # once the games are loaded, and the lines translated meanwhile
+        self.fuzzy = None
+        self.fuzzy_pending = list()
+        self.fuzzy_thread = None
+        # ORIGINAL line whose similar lines are shown
+        self.fuzzy_query = None
+
+        # lines edited in memory but not yet written to disk
+        self.modified = DirtyTracker()
+
+        # translated line counters: per file, and [translated, total] per game
+        self.file_progress = dict()
+        self.game_progress = dict()
 
         self.pixmap_line_len = None
 
@@ -108,6 +176,11 @@ class Ui_MainWindow(QMainWindow):
 
         self.games = list()
 
+        # loads the games in the background, see load_data
+        self.loader = None
+        # script to reopen once its game is loaded, see read_json
+        self.restore_state = dict()
+
         self.plaintexts = {
             'TRANSLATED': self.translated,
             'COMMENT': self.comment
@@ -121,15 +194,25 @@ class Ui_MainWindow(QMainWindow):
         self.search_ui = QDialog()
         uic.loadUi(resource_path('gui/search_ui.ui'), self.search_ui)
 
-        self.load_data()
-        self.init_open_ui_tree_view()
-        self.create_dupes_database()
+        # line indexes of the current script, and hits of the search dialog
+        self.line_model = LineIndexModel()
+        self.txt_files.setModel(self.line_model)
+        self.search_model = SearchResultsModel(self.search_sepatator)
+        self.search_ui.file_list.setModel(self.search_model)
+
+        # games and scripts of the open dialog, games are added by
+        # add_game_to_tree as they are loaded
+        self.tree_model = ScriptTreeModel(self.parts)
+        self.open_ui.treeView.setModel(self.tree_model)
+
         self.set_signals()
         self.set_shortcuts()
         try:
-            self.read_json()
+            self.restore_state = self.read_json()
         except:
             print('Could not read json.')
+        self.loose_dupes_action.setChecked(self.restore_state.get('loose_dupes', False))
+        self.load_data(rebuild_snapshot, workers)
 
     def set_signals(self):
         """
@@ -148,19 +231,23 @@ class Ui_MainWindow(QMainWindow):
         # DELETE JSON CONF FILE
         self.delete_json_file.triggered.connect(self.delete_json_conf_file)
 
-        self.txt_files.currentItemChanged.connect(self.change_text)
+        # LOOSE DUPES
+        self.loose_dupes_action.toggled.connect(self.set_loose_dupes)
+
+        self.txt_files.selectionModel().currentChanged.connect(self.change_text)
 
         ######################## OPEN GUI PART ########################
 
         # TREE VIEW ITEM DOUBLE CLICKED
-        self.open_ui.treeWidget.itemDoubleClicked.connect(self.change_file)
+        self.open_ui.treeView.doubleClicked.connect(self.change_file)
 
         self.open_ui.open_btn_box.accepted.connect(
-            lambda: self.change_file(
-                item=self.open_ui.treeWidget.currentItem(),
-                column=0
-            )
-        )
+            lambda: self.change_file(self.open_ui.treeView.currentIndex()))
+
+        # TYPE TO FILTER
+        self.open_ui.filter_le.textChanged.connect(self.filter_open_ui_tree)
+        self.open_ui.filter_le.returnPressed.connect(
+            lambda: self.change_file(self.open_ui.treeView.currentIndex()))
         self.open_ui.open_btn_box.rejected.connect(self.close_open_ui)
 
         ################################################################
@@ -169,10 +256,10 @@ class Ui_MainWindow(QMainWindow):
 
         self.search_ui.search_le.returnPressed.connect(
             self.search_in_all_database)
-        self.search_ui.file_list.currentRowChanged.connect(
-            self.show_search_results)
+        self.search_ui.file_list.selectionModel().currentChanged.connect(
+            lambda current, previous: self.show_search_results(current.row()))
 
-        self.search_ui.file_list.itemDoubleClicked.connect(self.go_to_script)
+        self.search_ui.file_list.doubleClicked.connect(self.go_to_script)
 
         ################################################################
 
@@ -185,6 +272,10 @@ class Ui_MainWindow(QMainWindow):
 
         self.copy_from_original.clicked.connect(self.copy_from_original_func)
         self.copy_from_japanese.clicked.connect(self.copy_from_japanese_func)
+        self.copy_from_tm.clicked.connect(self.copy_from_tm_func)
+
+        # TRANSLATION MEMORY
+        self.pretranslate_action.triggered.connect(self.pretranslate_from_tm)
 
         # TRANSLATOR JISHO
         self.jp_text.returnPressed.connect(self.jisho_search)
@@ -212,6 +303,10 @@ class Ui_MainWindow(QMainWindow):
         go_next_script_sc.activated.connect(self.go_next_script)
 
     def read_json(self):
+        """
+        Returns the script saved by put_in_json ({} if none), which is
+        reopened as soon as its game is loaded
+        """
 
         if load_json_file(expanduser('~/' + json_file_name)) == {}:
             with open(expanduser('~/' + json_file_name), 'w') as f:
@@ -219,7 +314,18 @@ class Ui_MainWindow(QMainWindow):
         else:
             data = load_json_file(expanduser('~/' + json_file_name))
             if data != {} and 'name' in data.keys():
-                self.switch_file(data['name'], data['game'], data['line_index'])
+                return data
+        return dict()
+
+    def restore_script(self):
+        name, game = self.restore_state.get('name'), self.restore_state.get('game')
+        if self.catalog.games.get(name) != game:
+            print('Could not reopen ' + str(name) + '.')
+            return
+        try:
+            self.switch_file(name, game, self.restore_state['line_index'])
+        except:
+            print('Could not reopen ' + str(name) + '.')
 
     def delete_json_conf_file(self):
         if exists(expanduser('~/' + json_file_name)):
@@ -238,12 +344,15 @@ class Ui_MainWindow(QMainWindow):
             {
                 'name': self.script_ppath,
                 'game': self.current_game,
-                'line_index': self.txt_files.currentRow()
+                'line_index': self.txt_files.currentIndex().row(),
+                'loose_dupes': self.loose_dupes
             })
 
-    def load_data(self):
+    def load_data(self, rebuild_snapshot=False, workers=None):
         """
         Loads the data present in /script_data
+        :param rebuild_snapshot: ignore the saved snapshots and parse every script
+        :param workers: number of processes parsing scripts (default: one per CPU)
         """
 
         if not exists('./script_data/'):
@@ -261,39 +370,128 @@ class Ui_MainWindow(QMainWindow):
         if len(game_dirs) == 0:
             return
 
-        percent = 100 / (len(game_dirs) * 6)
-        total = percent
-        to_retrieve = ('TRANSLATED', 'ORIGINAL', 'JAPANESE', 'COMMENT',
-                       'SPEAKER')
+        if workers is None:
+            workers = default_workers()
+
+        # the window is usable right away: games are added one by one by
+        # on_game_loaded, starting with the one of the script to reopen
+        self.loader = LoadThread('./script_data/', game_dirs, self.restore_state.get('game'),
+                                 rebuild_snapshot, workers)
+        self.loader.progress.connect(self.on_load_progress)
+        self.loader.game_loaded.connect(self.on_game_loaded)
+        self.loader.loading_done.connect(self.on_loading_done)
+        self.statusbar.showMessage('Chargement des scripts...')
+        self.loader.start()
+
+    def on_load_progress(self, game, done, total):
+        self.statusbar.showMessage('Chargement de %s : %d/%d scripts' % (game, done, total))
+
+    def on_game_loaded(self, game, analyser, index, cached, parsed):
+        """
+        Makes a game loaded by the LoadThread available in the editor
+        """
+        self.data[game] = analyser
+        self.search_index[game] = index
+        self.catalog.add_game(game, analyser.script_data['ORIGINAL'])
+        self.tm.add_game(game, analyser.script_data)
+        self.count_translated_lines(game)
+        self.create_game_dupes(game)
+        self.games.append(game)
+        self.add_game_to_tree(game)
+        print('%s loaded (%d from snapshot, %d parsed).' % (game, cached, parsed))
+        self.statusbar.showMessage('%s chargé' % game)
+
+        if self.restore_state.get('game') == game and self.script_ppath is None:
+            self.restore_script()
+
+    def on_loading_done(self, seconds):
+        print('All games loaded in %.2f s.' % seconds)
+        self.statusbar.showMessage('%d jeux chargés en %.2f s' % (len(self.games), seconds), 5000)
+
+        self.fuzzy_thread = FuzzyIndexThread(list(self.tm.translations))
+        self.fuzzy_thread.index_ready.connect(self.on_fuzzy_index_ready)
+        self.fuzzy_thread.start()
+
+    def on_fuzzy_index_ready(self, index):
+        index.add_lines(self.fuzzy_pending)
+        self.fuzzy_pending = list()
+        self.fuzzy = index
+        if self.fuzzy_query is not None:
+            self.show_fuzzy_matches(self.fuzzy_query)
+
+    def add_to_fuzzy_index(self, lines):
+        if self.fuzzy is None:
+            self.fuzzy_pending.extend(lines)
+        else:
+            self.fuzzy.add_lines(lines)
+
+    def count_translated_lines(self, game):
+        """
+        Count translated lines per file and for the whole game, once.
+        set_script_line keeps the counters up to date afterwards.
+        """
+        self.file_progress[game] = dict()
+        self.game_progress[game] = [0, 0]
 
-        for game in game_dirs:
-            stdout.write('\r' + str(round(total, 2)) + ' %')
-            total += percent
-            self.data[game] = XmlAnalyser("./script_data/" + game)
+        for script, lines in self.data[game].script_data['TRANSLATED'].items():
+            translated_count = sum(1 for line in lines if line[1:-1] != '')
+            self.file_progress[game][script] = translated_count
+            self.game_progress[game][0] += translated_count
+            self.game_progress[game][1] += len(lines)
 
-            for tagname in to_retrieve:
-                stdout.write('\r' + str(round(total, 2)) + ' %')
-                total += percent
-                self.data[game].analyse_scripts(tagname)
-            print('\r' + game + ' loaded.')
-            self.games.append(game)
+    def create_game_dupes(self, game):
+        self.dupes[game] = DupesIndex(self.data[game].script_data['ORIGINAL'], self.loose_dupes)
 
-    def create_dupes_database(self):
+    def set_loose_dupes(self, loose):
+        """
+        Propagate a translation to the lines that only differ from its
+        original by markup and whitespace too, or only to identical lines
+        """
+        self.loose_dupes = loose
         for game in self.games:
-            self.dupes[game] = dict()
-            scripts = self.data[game].script_data['ORIGINAL']
-
-            tmp = dict()
-            for file in scripts:
-                i = 0
-                for line in scripts[file]:
-                    if line not in tmp.keys():
-                        tmp[line] = [{'script_name': file, 'line_index': i}]
-                    else:
-                        tmp[line].append(
-                            {'script_name': file, 'line_index': i})
-                        self.dupes[game][line] = tmp[line]
-                    i += 1
+            self.create_game_dupes(game)
+
+    def refresh_scripts(self, game, scripts):
+        """
+        Re-parse only the given scripts of an already loaded game and keep
+        the counters, dupes and unsaved state in sync with them
+        """
+        analyser = self.data[game]
+        dupes_changed = False
+
+        for script in scripts:
+            # never read a script of another game into this one
+            owner = self.catalog.games.get(script)
+            if owner != game and (owner is not None or not analyser.owns(script)):
+                continue
+
+            original = analyser.script_data['ORIGINAL'].get(script)
+            translated = analyser.script_data['TRANSLATED'].get(script, [])
+            self.file_progress[game].pop(script, None)
+            self.game_progress[game][0] -= sum(1 for line in translated if line[1:-1] != '')
+            self.game_progress[game][1] -= len(translated)
+
+            if analyser.reload_script(script):
+                translated = analyser.script_data['TRANSLATED'][script]
+                translated_count = sum(1 for line in translated if line[1:-1] != '')
+                self.file_progress[game][script] = translated_count
+                self.game_progress[game][0] += translated_count
+                self.game_progress[game][1] += len(translated)
+                self.add_to_fuzzy_index(self.tm.add_script(game, analyser.script_data, script))
+                if script not in self.catalog.games:
+                    self.catalog.add_script(game, script)
+                    self.tree_model.add_script(game, script)
+            elif script in self.catalog.games:
+                self.catalog.remove_script(script)
+                self.tree_model.remove_script(game, script)
+
+            if analyser.script_data['ORIGINAL'].get(script) != original:
+                dupes_changed = True
+            self.search_index[game].invalidate(script)
+            self.modified.clear(script)
+
+        if dupes_changed:
+            self.create_game_dupes(game)
 
     def check_files_modifications(self):
         ret = self.modification_has_been_made('TRANSLATED')
@@ -325,48 +523,36 @@ class Ui_MainWindow(QMainWindow):
             if not self.check_files_modifications():
                 return
 
-            self.data[self.current_game] = XmlAnalyser(
-                "./script_data/" + self.current_game)
-            self.data[self.current_game].analyse_scripts('TRANSLATED')
-            self.data[self.current_game].analyse_scripts('ORIGINAL')
-            self.data[self.current_game].analyse_scripts('JAPANESE')
-            self.data[self.current_game].analyse_scripts('COMMENT')
-            self.data[self.current_game].analyse_scripts('SPEAKER')
+            # only what changed on disk, or differs from it in memory
+            game = self.current_game
+            stale = self.data[game].stale_scripts()
+            unsaved = [script for script in self.modified.dirty_files()
+                       if script in self.data[game].script_data['ORIGINAL']]
+            self.refresh_scripts(game, sorted(set(stale + unsaved)))
             if update_curr_text:
-                self.change_text(self.txt_files.currentItem(), None)
+                self.change_text(self.txt_files.currentIndex(), QModelIndex())
 
-    def init_open_ui_tree_view(self):
+    def add_game_to_tree(self, game):
         """
-        Initialize the tree widget of the "open gui" according to
-        the data loaded
+        Add a loaded game and its scripts to the tree of the "open gui"
         """
+        self.tree_model.add_game(game, self.data[game].script_data['ORIGINAL'])
 
-        main_treew_item = QTreeWidgetItem()
-        main_treew_item.setText(0, 'Script')
-        self.open_ui.treeWidget.setHeaderItem(main_treew_item)
-
-        main_tree_w = list()
-
-        for game in self.games:
-            qtreewidgetitem = QTreeWidgetItem()
-            qtreewidgetitem.setText(0, game)
-            main_tree_w.append(qtreewidgetitem)
-
-            tree_widgets = list()
-            for part in self.parts:
-                treewidgetitem = QTreeWidgetItem(qtreewidgetitem)
-                treewidgetitem.setText(0, part)
-                tree_widgets.append(treewidgetitem)
-
-            for elem in sorted(list(self.data[game].script_data['ORIGINAL'].keys())):
-                elem = basename(elem)
-                if elem[1:3].isnumeric() and int(elem[1:3]) <= 7:
-                    childtree = QTreeWidgetItem(tree_widgets[int(elem[2])])
-                else:
-                    childtree = QTreeWidgetItem(tree_widgets[-1])
-                childtree.setText(0, elem)
+    def filter_open_ui_tree(self, text):
+        """
+        Only show the scripts whose name starts with `text` in the tree of
+        the "open gui", and select the first one
+        """
+        self.tree_model.set_filter(text)
+        if not text:
+            self.open_ui.treeView.collapseAll()
+            return
 
-        self.open_ui.treeWidget.addTopLevelItems(main_tree_w)
+        self.open_ui.treeView.expandAll()
+        first = self.tree_model.first_script()
+        if first.isValid():
+            self.open_ui.treeView.setCurrentIndex(first)
+            self.open_ui.treeView.scrollTo(first)
 
     def open_ui_launch(self):
         """
@@ -374,10 +560,9 @@ class Ui_MainWindow(QMainWindow):
         """
         self.open_ui.show()
         self.open_ui.setFocus()
-        if self.open_ui.treeWidget.currentItem() is None:
-            self.open_ui.treeWidget.setCurrentItem(
-                self.open_ui.treeWidget.itemAt(0, 0))
-        self.open_ui.treeWidget.setFocus()
+        if not self.open_ui.treeView.currentIndex().isValid():
+            self.open_ui.treeView.setCurrentIndex(self.tree_model.index(0))
+        self.open_ui.treeView.setFocus()
         self.open_ui.exec_()
 
     def show_search_ui(self):
@@ -402,6 +587,10 @@ class Ui_MainWindow(QMainWindow):
         :param game: item.parent().parent().text(0)
         :param line_index:
         """
+        if self.catalog.games.get(script_name) != (self.current_game if game is None else game):
+            QMessageBox.warning(QMessageBox(), self, "Error", "Couldn't load script", QMessageBox.Ok)
+            return
+
         if not self.script_name.text() == '':
             self.previous_script_name = self.script_name.text()
         else:
@@ -420,65 +609,83 @@ class Ui_MainWindow(QMainWindow):
         self.overall_progress_label.setText(
             'Progress on ' + self.current_game)
         self.script_ppath = script_name
+
+        # reuse the loaded game: re-parse the script only if it changed on
+        # disk, and drop unsaved edits the user chose to discard
+        analyser = self.data[self.current_game]
+        to_refresh = [script for script in self.modified.dirty_files()
+                      if script in analyser.script_data['ORIGINAL']]
+        if script_name not in to_refresh and analyser.is_stale(script_name):
+            to_refresh.append(script_name)
+        self.refresh_scripts(self.current_game, to_refresh)
+
         # set the script files in the window
         txt_files = self.data[self.current_game].script_data['ORIGINAL'][script_name]
-        list_of_txt_index = [str(i) for i in range(len(txt_files))]
         self.file_has_changed = True
-        self.txt_files.clear()
-        self.txt_files.addItems(list_of_txt_index)
-        self.txt_files.setCurrentItem(self.txt_files.item(int(line_index)))
-        self.reload_ui()
-
-    def change_file(self, item, column):
-        if item.text(column) not in self.parts and item.text(
-                column) not in self.games:
+        self.line_model.set_count(len(txt_files))
+        self.txt_files.setCurrentIndex(self.line_model.index(int(line_index)))
+
+    def change_file(self, index):
+        if not index.isValid():
+            return
+
+        script = self.tree_model.script_at(index)
+        if script is not None:
+            game, script_name = script
             self.close_open_ui()
 
             if self.current_game != '':
                 if not self.check_files_modifications():
                     return
 
-            if not self.find_ppath(item.text(column)):
+            if not self.find_ppath(script_name, game):
                 return
 
-            self.switch_file(self.script_ppath, item.parent().parent().text(0))
+            self.switch_file(self.script_ppath, game)
         else:
-            if item.isExpanded():
-                self.open_ui.treeWidget.collapseItem(item)
+            if self.open_ui.treeView.isExpanded(index):
+                self.open_ui.treeView.collapse(index)
             else:
-                self.open_ui.treeWidget.expandItem(item)
+                self.open_ui.treeView.expand(index)
 
-            self.open_ui.treeWidget.scrollToItem(item)
+            self.open_ui.treeView.scrollTo(index)
 
-    def find_ppath(self, script_name):
-        for game in self.games:
-            for ppath in self.data[game].script_data['ORIGINAL']:
-                if ppath.find(script_name) != -1:
-                    self.script_ppath = ppath
-                    return True
+    def find_ppath(self, script_name, game=None):
+        """
+        Set script_ppath to the full path of a script (see find_script_path)
+        """
+        found = self.catalog.resolve(script_name, game, self.current_game)
+        if found is not None:
+            self.script_ppath = found[1]
+            return True
         QMessageBox.warning(QMessageBox(), self, "Error", "Couldn't load script", QMessageBox.Ok)
         return False
 
-    def find_script_path(self, script_name):
-        for game in self.games:
-            for ppath in self.data[game].script_data['ORIGINAL']:
-                if ppath.find(script_name) != -1:
-                    return ppath
+    def find_script_path(self, script_name, game=None):
+        """
+        Full path of a script given by file name or full path, looked up in
+        `game` if given. A name found in several games resolves to the one
+        of the current game.
+        """
+        found = self.catalog.resolve(script_name, game, self.current_game)
+        if found is not None:
+            return found[1]
         QMessageBox.warning(QMessageBox(), self, "Error", "Couldn't load script", QMessageBox.Ok)
         return script_name
 
-    def change_text(self, item, previous_item):
-        if item is None:
-            item = self.txt_files.item(0)
-        script_index = item.text()
+    def change_text(self, current, previous):
+        if not current.isValid():
+            current = self.line_model.index(0)
+        script_index = current.row()
 
-        # update data if previous item exists
-        if previous_item is not None:
-            prev_script_index = previous_item.text()
+        # update data if previous line exists
+        if previous.isValid():
+            prev_script_index = previous.row()
             if self.file_has_changed:
                 if not self.discard:
                     self.update_script_database(self.previous_game,
-                                                self.find_script_path(self.previous_script_name),
+                                                self.find_script_path(self.previous_script_name,
+                                                                      self.previous_game),
                                                 prev_script_index)
                 else:
                     self.discard = False
@@ -491,11 +698,11 @@ class Ui_MainWindow(QMainWindow):
                 else:
                     self.discard = False
 
-        translated_text = self.data[self.current_game].script_data['TRANSLATED'][self.script_ppath][int(script_index)][1:-1]
-        original_text = self.data[self.current_game].script_data['ORIGINAL'][self.script_ppath][int(script_index)][1:-1]
-        comment_text = self.data[self.current_game].script_data['COMMENT'][self.script_ppath][int(script_index)][1:-1]
+        translated_text = self.data[self.current_game].script_data['TRANSLATED'][self.script_ppath][script_index][1:-1]
+        original_text = self.data[self.current_game].script_data['ORIGINAL'][self.script_ppath][script_index][1:-1]
+        comment_text = self.data[self.current_game].script_data['COMMENT'][self.script_ppath][script_index][1:-1]
         try:
-            speaker = self.data[self.current_game].script_data['SPEAKER'][self.script_ppath][int(script_index)]
+            speaker = self.data[self.current_game].script_data['SPEAKER'][self.script_ppath][script_index]
         except IndexError:
             speaker = 'System Text'
         if speaker == 'NO NAME':
@@ -507,7 +714,7 @@ class Ui_MainWindow(QMainWindow):
                 tmp += word.capitalize() + ' '
             speaker = tmp[:-1]
         try:
-            japanese_text = self.data[self.current_game].script_data['JAPANESE'][self.script_ppath][int(script_index)][1:-1]
+            japanese_text = self.data[self.current_game].script_data['JAPANESE'][self.script_ppath][script_index][1:-1]
         except IndexError:
             japanese_text = ''
 
@@ -517,6 +724,18 @@ class Ui_MainWindow(QMainWindow):
         self.japanese.setPlainText(japanese_text)
         self.speaker.setText("Locuteur : %s" % speaker)
 
+        # offer the translation of the same line in any game, and show the
+        # similar ones
+        original_line = self.data[self.current_game].script_data['ORIGINAL'][self.script_ppath][script_index]
+        self.tm_suggestion = None
+        if translated_text == '':
+            self.tm_suggestion = self.tm.lookup(original_line)
+        self.copy_from_tm.setDisabled(self.tm_suggestion is None)
+        if self.tm_suggestion is not None:
+            self.statusbar.showMessage('Traduction en mémoire (%s) : %s' % (
+                self.tm_suggestion[1], self.tm_suggestion[0][1:-1]))
+        self.show_fuzzy_matches(original_line)
+
         if self.japanese.toPlainText() != '':
             self.jp_text.setText(cleaned_text(self.japanese.toPlainText()))
 
@@ -548,214 +767,104 @@ class Ui_MainWindow(QMainWindow):
 
     def update_script_database(self, game, script_name, prev_script_index):
         # retrieving texts data
-        original_line = self.data[game].script_data['ORIGINAL'][script_name][int(prev_script_index)]
         translated_text_to_save = '\n%s\n' % (
             self.translated.toPlainText().strip('\n').strip())
         comment_text_to_save = '\n%s\n' % (
             self.comment.toPlainText().strip('\n').strip())
 
         # check if the text modified belongs to the dupes database
-        if original_line in self.dupes[game].keys():
-            for element_to_save in self.dupes[game][original_line]:
-                if element_to_save['script_name'] != script_name:
+        dupes = self.dupes[game].siblings(script_name, int(prev_script_index))
+        if dupes:
+            for dupe_script, dupe_index in dupes:
+                if dupe_script != script_name:
                     self.data_modified_in_dupes = True
-                self.data[game].script_data['TRANSLATED'][element_to_save['script_name']][element_to_save['line_index']] = translated_text_to_save
-                self.dupes_files_to_save.append(element_to_save['script_name'])
+                self.set_script_line(game, dupe_script, 'TRANSLATED',
+                                     dupe_index, translated_text_to_save)
+                self.dupes_files_to_save.append(dupe_script)
             if self.data_modified_in_dupes:
                 self.dupes_files_to_save = list(set(self.dupes_files_to_save))
             else:
                 self.dupes_files_to_save = list()
         else:
-            self.data[game].script_data['TRANSLATED'][script_name][
-                int(prev_script_index)] = translated_text_to_save
-            self.data[game].script_data['COMMENT'][script_name][
-                int(prev_script_index)] = comment_text_to_save
+            self.set_script_line(game, script_name, 'TRANSLATED',
+                                 int(prev_script_index), translated_text_to_save)
+            self.set_script_line(game, script_name, 'COMMENT',
+                                 int(prev_script_index), comment_text_to_save)
+
+    def set_script_line(self, game, script_name, tagname, line_index, text):
+        """
+        Store one line of a script in memory and flag it as unsaved
+        if its text differs from the one on disk
+        """
+        lines = self.data[game].script_data[tagname][script_name]
+        if lines[line_index] == text:
+            return
+
+        if tagname == 'TRANSLATED':
+            was_translated = lines[line_index][1:-1] != ''
+            if was_translated != (text[1:-1] != ''):
+                step = -1 if was_translated else 1
+                self.file_progress[game][script_name] += step
+                self.game_progress[game][0] += step
+
+        self.modified.edit(script_name, tagname, line_index, lines[line_index], text)
+        lines[line_index] = text
+        if tagname in SEARCH_TAGS:
+            self.search_index[game].invalidate(script_name)
 
     def compute_file_progress(self):
-        translated_count = 0
+        translated_count = self.file_progress[self.current_game][self.script_ppath]
         total_txt = len(self.data[self.current_game].script_data['TRANSLATED'][self.script_ppath])
 
-        for k in range(total_txt):
-            if self.data[self.current_game].script_data['TRANSLATED'][self.script_ppath][k][1:-1] != '':
-                translated_count += 1
-
         self.progress_file_label.setText("%s / %s" % (translated_count, total_txt))
         self.xml_progress.setValue(int(translated_count / total_txt * 100))
 
     def compute_global_progress(self):
-        script_data = self.data[self.current_game].script_data['TRANSLATED']
-        total_script = 0
-        translated_count = 0
-        for scripts in script_data:
-            total_script += len(
-                self.data[self.current_game].script_data['TRANSLATED'][scripts])
-            curr_total_scripts = len(
-                self.data[self.current_game].script_data['TRANSLATED'][scripts])
-            for k in range(curr_total_scripts):
-                if self.data[self.current_game].script_data['TRANSLATED'][scripts][k][1:-1] != '':
-                    translated_count += 1
+        translated_count, total_script = self.game_progress[self.current_game]
         self.global_progress_label.setText("%s / %s" % (translated_count, total_script))
         self.overall_progress.setValue(int(translated_count / total_script * 100))
 
     def script_database_changed(self, tagname='TRANSLATED'):
-
-        # DRAT 1.5.2+ (.po)
-        if self.script_ppath.lower().endswith('.po'):
-            entries = read_po(Path(self.script_ppath))
-
-            disk_lines = []
-            if tagname == 'SPEAKER':
-                for e in entries:
-                    _, sp = parse_context_speaker(e.msgctxt)
-                    disk_lines.append(sp or '')
-            elif tagname == 'JAPANESE':
-                for e in entries:
-                    disk_lines.append('\n' + "\n".join(e.extracted_comments) + '\n')
-            elif tagname == 'COMMENT':
-                for e in entries:
-                    disk_lines.append('\n' + "\n".join(e.translator_comments) + '\n')
-            elif tagname == 'ORIGINAL':
-                for e in entries:
-                    o = '' if e.msgid == '[EMPTY_LINE]' else e.msgid
-                    disk_lines.append('\n' + o + '\n')
-            else:  # TRANSLATED
-                for e in entries:
-                    t = '' if e.msgstr == '[EMPTY_LINE]' else e.msgstr
-                    disk_lines.append('\n' + t + '\n')
-
-            mem_lines = self.data[self.current_game].script_data[tagname][self.script_ppath]
-            return disk_lines != mem_lines
-
-        # Legacy XML mode
-        # open file in binary mode
-        f = open(self.script_ppath, 'rb')
-        # store everything in a variable
-        buffer = f.read()
-        # close the file
-        f.close()
-        # decode the utf-16-le encoding, in order to be able to manipulate the actual content
-        buffer = buffer.decode('utf-16-le')
-        # get the index of the first line of script in the buffer
-        trad_begin = buffer.find('<' + tagname + ' N°') + len(
-            '<' + tagname + ' N°')
-        trad_end = buffer.find('</' + tagname + ' N°') + len(
-            '</' + tagname + ' N°') + 4
-        xml_file_data = self.data[self.current_game].script_data[tagname][self.script_ppath]
-
-        index = 0
-        while trad_begin != -1 and trad_end != -1:
-            short_key = get_key(buffer, trad_begin)  # '001'
-
-            while buffer[trad_begin] != '>':
-                trad_begin += 1
-            trad_begin += 1
-
-            if buffer[trad_begin:trad_end] != self.data[self.current_game].script_data[tagname][self.script_ppath][index] + '</' + tagname + ' N°' + short_key + '>':
-                return True
-
-            if index == len(xml_file_data) - 1:
-                break
-            trad_begin = buffer.find('<' + tagname + ' N°', trad_begin) + len('<' + tagname + ' N°')
-            trad_end = buffer.find('</' + tagname + ' N°', trad_begin) + len('</' + tagname + ' N°') + 4
-            index += 1
-
-        return False
+        return self.modified.is_dirty(self.script_ppath, tagname)
 
     def modification_has_been_made(self, tagname):
 
-        if self.txt_files.currentItem() is None:
+        prev_script_index = self.txt_files.currentIndex().row()
+        if prev_script_index == -1:
             return 0
-        prev_script_index = self.txt_files.currentItem().text()
-        translated_backup = self.data[self.current_game].script_data[tagname][self.script_ppath][int(prev_script_index)]
-        self.data[self.current_game].script_data[tagname][self.script_ppath][int(prev_script_index)] = '\n' + self.plaintexts[tagname].toPlainText().strip('\n').strip() + '\n'
-
-        # DRAT 1.5.2+ (.po)
-        if self.script_ppath.lower().endswith('.po'):
-            entries = read_po(Path(self.script_ppath))
-
-            disk_lines = []
-            if tagname == 'COMMENT':
-                for e in entries:
-                    disk_lines.append('\n' + "\n".join(e.translator_comments) + '\n')
-            else:  # TRANSLATED
-                for e in entries:
-                    t = '' if e.msgstr == '[EMPTY_LINE]' else e.msgstr
-                    disk_lines.append('\n' + t + '\n')
-
-            mem_lines = self.data[self.current_game].script_data[tagname][self.script_ppath]
-            if disk_lines != mem_lines:
-                answer = QMessageBox.question(
-                    self,
-                    'Fichier non sauvegardé',
-                    'Certains fichiers n\'ont pas été sauvegardé. Voulez vous sauvegarder ?',
-                    QMessageBox.Save | QMessageBox.Discard | QMessageBox.Cancel,
-                    QMessageBox.Cancel
-                )
-
-                if answer == QMessageBox.Save:
-                    return 1
-                elif answer == QMessageBox.Discard:
-                    self.data[self.current_game].script_data[tagname][self.script_ppath][int(prev_script_index)] = translated_backup
-                    return 0
-                elif answer == QMessageBox.Cancel:
-                    return 2
-
-            return 3
-
-        f = open(self.script_ppath, 'rb')
-        # store everything in a variable
-        buffer = f.read()
-        # close the file
-        f.close()
-        # decode the utf-16-le encoding, in order to be able to manipulate the actual content
-        buffer = buffer.decode('utf-16-le')
-        # get the index of the first line of script in the buffer
-        trad_begin = buffer.find('<' + tagname + ' N°') + len('<' + tagname + ' N°')
-        trad_end = buffer.find('</' + tagname + ' N°') + len('</' + tagname + ' N°') + 4
-        xml_file_data = self.data[self.current_game].script_data[tagname][self.script_ppath]
-
-        index = 0
-        while trad_begin != -1 and trad_end != -1:
-            short_key = get_key(buffer, trad_begin)  # '001'
-
-            while buffer[trad_begin] != '>':
-                trad_begin += 1
-            trad_begin += 1
-
-            if buffer[trad_begin:trad_end] != self.data[self.current_game].script_data[tagname][self.script_ppath][index] + '</' + tagname + ' N°' + short_key + '>':
-                answer = QMessageBox.question(
-                    self,
-                    'Fichier non sauvegardé',
-                    'Certains fichiers n\'ont pas été sauvegardé. Voulez vous sauvegarder ?',
-                    QMessageBox.Save | QMessageBox.Discard | QMessageBox.Cancel,
-                    QMessageBox.Cancel
-                )
-
-                if answer == QMessageBox.Save:
-                    return 1
-                elif answer == QMessageBox.Discard:
-                    self.data[self.current_game].script_data[tagname][self.script_ppath][int(prev_script_index)] = translated_backup
-                    return 0
-                elif answer == QMessageBox.Cancel:
-                    return 2
+        translated_backup = self.data[self.current_game].script_data[tagname][self.script_ppath][prev_script_index]
+        self.set_script_line(self.current_game, self.script_ppath, tagname, prev_script_index,
+                             '\n' + self.plaintexts[tagname].toPlainText().strip('\n').strip() + '\n')
+
+        if self.modified.is_dirty(self.script_ppath, tagname):
+            answer = QMessageBox.question(
+                self,
+                'Fichier non sauvegardé',
+                'Certains fichiers n\'ont pas été sauvegardé. Voulez vous sauvegarder ?',
+                QMessageBox.Save | QMessageBox.Discard | QMessageBox.Cancel,
+                QMessageBox.Cancel
+            )
 
-            if index == len(xml_file_data) - 1:
-                break
-            trad_begin = buffer.find('<' + tagname + ' N°', trad_begin) + len('<' + tagname + ' N°')
-            trad_end = buffer.find('</' + tagname + ' N°', trad_begin) + len('</' + tagname + ' N°') + 4
-            index += 1
+            if answer == QMessageBox.Save:
+                return 1
+            elif answer == QMessageBox.Discard:
+                self.set_script_line(self.current_game, self.script_ppath, tagname, prev_script_index,
+                                     translated_backup)
+                return 0
+            elif answer == QMessageBox.Cancel:
+                return 2
 
         return 3
 
     def go_prev_script(self):
-        if self.txt_files.currentRow() > 0:
-            self.txt_files.setCurrentItem(
-                self.txt_files.item(self.txt_files.currentRow() - 1))
+        row = self.txt_files.currentIndex().row()
+        if row > 0:
+            self.txt_files.setCurrentIndex(self.line_model.index(row - 1))
 
     def go_next_script(self):
-        if self.txt_files.currentRow() < self.txt_files.count() - 1:
-            self.txt_files.setCurrentItem(
-                self.txt_files.item(self.txt_files.currentRow() + 1))
+        row = self.txt_files.currentIndex().row()
+        if row < self.line_model.rowCount() - 1:
+            self.txt_files.setCurrentIndex(self.line_model.index(row + 1))
 
     def check_line_len(self):
 
@@ -763,9 +872,7 @@ class Ui_MainWindow(QMainWindow):
         cursor = self.translated.textCursor()
 
         w_line = find_w_line(cursor, blockText)
-        to_remove = find_to_remove(w_line[:cursor.columnNumber()])
-
-        self.line_count.display(cursor.columnNumber() - to_remove)
+        self.line_count.display(markup(w_line).visible_column(cursor.columnNumber()))
 
         if length_is_okay(self.translated.toPlainText()):
             if self.pixmap_line_len is None or self.pixmap_line_len == 'error':
@@ -782,9 +889,7 @@ class Ui_MainWindow(QMainWindow):
         cursor = self.translated.textCursor()
 
         w_line = find_w_line(cursor, blockText)
-        to_remove = find_to_remove(w_line[:cursor.columnNumber()])
-
-        self.line_count.display(cursor.columnNumber() - to_remove)
+        self.line_count.display(markup(w_line).visible_column(cursor.columnNumber()))
 
     def copy_from_original_func(self):
         self.translated.setPlainText(self.original.toPlainText())
@@ -794,6 +899,65 @@ class Ui_MainWindow(QMainWindow):
         self.translated.setPlainText(self.japanese.toPlainText())
         self.translated.moveCursor(QTextCursor.EndOfLine)
 
+    def show_fuzzy_matches(self, original):
+        """
+        Shows in the Doublons tab the translated lines most similar to the
+        ORIGINAL line `original`, with their score and translation
+        """
+        self.fuzzy_query = original
+        if self.fuzzy is None:
+            self.fuzzy_matches.setPlainText('Recherche de lignes similaires en préparation...')
+            return
+
+        matches = list()
+        for score, line in self.fuzzy.search(original, FUZZY_MATCHES, FUZZY_MIN_SCORE):
+            translated, game = self.tm.lookup(line)
+            matches.append('%d %% (%s)\n%s\n→ %s' % (round(score * 100), game, line[1:-1], translated[1:-1]))
+        self.fuzzy_matches.setPlainText('\n\n'.join(matches) if matches else 'Aucune ligne similaire traduite.')
+
+    def copy_from_tm_func(self):
+        if self.tm_suggestion is None:
+            return
+        self.translated.setPlainText(self.tm_suggestion[0][1:-1])
+        self.translated.moveCursor(QTextCursor.EndOfLine)
+
+    def pretranslate_from_tm(self):
+        """
+        Fill the untranslated lines of all the games with the translations
+        of the translation memory, and write each modified file once
+        """
+        if self.current_game != '':
+            if not self.check_files_modifications():
+                return
+            # the files are written whole: first drop the edits the user
+            # chose to discard, as switch_file does
+            for game in self.games:
+                analyser = self.data[game]
+                self.refresh_scripts(game, [script for script in self.modified.dirty_files()
+                                            if script in analyser.script_data['ORIGINAL']])
+
+        lines_count = files_count = 0
+        written = list()
+        for game in self.games:
+            for script, lines in self.tm.pretranslations(self.data[game].script_data).items():
+                for line_index, text in lines:
+                    self.set_script_line(game, script, 'TRANSLATED', line_index, text)
+                self.save_file(script, 'TRANSLATED', game, commit=False)
+                written.append(script)
+                lines_count += len(lines)
+                files_count += 1
+        # one commit per repo for the whole batch
+        po_files = [script for script in written if script.lower().endswith('.po')]
+        if po_files:
+            _git_commit_pos(po_files, 'Pretranslated %d files' % len(po_files))
+
+        if self.current_game != '':
+            # show what was filled in the current line, without storing the
+            # text of the widgets over it
+            self.change_text(self.txt_files.currentIndex(), QModelIndex())
+        self.statusbar.showMessage('%d ligne(s) prétraduite(s) dans %d fichier(s)' % (
+            lines_count, files_count))
+
     def save(self):
         """
         Saves into xml files
@@ -803,8 +967,9 @@ class Ui_MainWindow(QMainWindow):
 
             if self.current_game == '':
                 return
-            prev_script_index = self.txt_files.currentItem().text()
-            self.data[self.current_game].script_data[tagname][self.script_ppath][int(prev_script_index)] = '\n' + self.plaintexts[tagname].toPlainText().strip('\n').strip() + '\n'
+            prev_script_index = self.txt_files.currentIndex().row()
+            self.set_script_line(self.current_game, self.script_ppath, tagname, prev_script_index,
+                                 '\n' + self.plaintexts[tagname].toPlainText().strip('\n').strip() + '\n')
 
             # compute file progress
             self.compute_file_progress()
@@ -818,11 +983,18 @@ class Ui_MainWindow(QMainWindow):
                 self.data_modified_in_dupes = False
         self.setWindowTitle(self.script_name.text() + ' - Another SDSE ' + VERSION)
 
-    def save_file(self, xml_file, tagname):
+    def save_file(self, xml_file, tagname, game=None, commit=True):
+        """
+        Write a table of a script to its file
+        :param commit: auto-commit a .po file to its git repo
+        """
+        if game is None:
+            game = self.current_game
+
         # DRAT 1.5.2+ uses .po files.
         if xml_file.lower().endswith('.po'):
             try:
-                po_file_data = self.data[self.current_game].script_data[tagname][xml_file]
+                po_file_data = self.data[game].script_data[tagname][xml_file]
             except KeyError:
                 print("Key error " + xml_file + ". Dupe issue.")
                 return
@@ -830,102 +1002,86 @@ class Ui_MainWindow(QMainWindow):
             # Only TRANSLATED + COMMENT are editable in the UI.
             if tagname == 'TRANSLATED':
                 update_po_file(Path(xml_file), translated=po_file_data)
-                _git_commit_po(xml_file)
             elif tagname == 'COMMENT':
                 update_po_file(Path(xml_file), comment=po_file_data)
+            if commit and tagname in ('TRANSLATED', 'COMMENT'):
                 _git_commit_po(xml_file)
+            self.mark_saved(game, xml_file, tagname)
+            self.data[game].note_saved(xml_file)
             return
 
         try:
-            xml_file_data = self.data[self.current_game].script_data[tagname][xml_file]
-            # open file in binary mode
-            f = open(xml_file, 'rb')
+            xml_file_data = self.data[game].script_data[tagname][xml_file]
         except KeyError:
             print("Key error " + xml_file + ". Dupe issue.")
             return
-        # store everything in a variable
-        buffer = f.read()
-        # close the file
-        f.close()
-        # decode the utf-16-le encoding, in order to be able to manipulate the actual content
-        buffer = buffer.decode('utf-16-le')
-        # get the index of the first line of script in the buffer
-        trad_begin = buffer.find('<' + tagname + ' N°') + len('<' + tagname + ' N°')
-        trad_end = buffer.find('</' + tagname + ' N°') + len('</' + tagname + ' N°') + 4
-
-        index = 0
-        while trad_begin != -1 and trad_end != -1:
-            short_key = get_key(buffer, trad_begin)  # '001'
-
-            while buffer[trad_begin] != '>':
-                trad_begin += 1
-            trad_begin += 1
-
-            buffer = buffer.replace(buffer[trad_begin:trad_end], xml_file_data[index] + '</' + tagname + ' N°' + short_key + '>')
-
-            if index == len(xml_file_data) - 1:
-                break
-            trad_begin = buffer.find('<' + tagname + ' N°', trad_begin) + len('<' + tagname + ' N°')
-            trad_end = buffer.find('</' + tagname + ' N°', trad_begin) + len('</' + tagname + ' N°') + 4
-            index += 1
 
         try:
-            with open(xml_file, 'wb') as f:
-                f.write(buffer.encode('utf-16-le'))
-        except:
-            print("ERROR SAVING " + self.script_ppath)
+            self.data[game].save_xml_lines(xml_file, tagname, xml_file_data)
+        except OSError:
+            print("ERROR SAVING " + xml_file)
             return
+        self.mark_saved(game, xml_file, tagname)
+
+    def mark_saved(self, game, script, tagname):
+        """
+        A table of a script was written: its lines are no longer unsaved,
+        and the translation memory learns the TRANSLATED lines that changed.
+        Unsaved text is never learned, so a discarded edit is never offered.
+        """
+        if tagname == 'TRANSLATED':
+            originals = self.data[game].script_data['ORIGINAL'][script]
+            translated = self.data[game].script_data['TRANSLATED'][script]
+            self.add_to_fuzzy_index([originals[i] for i in self.modified.dirty_lines(script, tagname)
+                                     if self.tm.learn(game, originals[i], translated[i])])
+        self.modified.clear(script, tagname)
 
     def search_in_all_database(self):
         if self.search_ui.search_le.text() == '' or self.current_game == '':
             return
 
-        self.search_ui.file_list.clear()
-        self.search_data.clear()
+        # a new query replaces the running one, whose late batches are dropped
+        self.stop_search()
+        self.search_generation += 1
+        self.search_game = self.current_game
+        self.search_text = self.search_ui.search_le.text()
+
+        self.search_model.clear()
+
+        self.statusbar.showMessage('Recherche de "%s"...' % self.search_text)
+        self.search_thread = DatabaseSearchThread(
+            self.search_generation, self.search_index[self.search_game].snapshot(), self.search_text)
+        self.search_thread.results_found.connect(self.add_search_results)
+        self.search_thread.search_done.connect(self.search_finished)
+        self.search_thread.start()
+
+    def stop_search(self):
+        """Cancel the running search, if any, and wait for its thread (it
+        stops before scanning its next script)"""
+        if self.search_thread is not None:
+            self.search_thread.cancel()
+            self.search_thread.wait()
+
+    def add_search_results(self, generation, hits):
+        """
+        Add a batch of hits (sorted, and after the previous batches) to the
+        search dialog
+        """
+        if generation != self.search_generation:
+            return
 
-        tmp_search_data = list()
-        script = self.data[self.current_game].script_data
-        for section in script:
-            if section == 'SPEAKER':
-                continue
-            for file in script[section]:
-                i = 0
-                for line in script[section][file]:
-                    if line.lower().find(self.search_ui.search_le.text().lower()) != -1:
-                        if file + self.search_sepatator + str(i) not in tmp_search_data:
-                            tmp_search_data.append(file + self.search_sepatator + str(i))
-                            self.search_ui.file_list.addItem(file + self.search_sepatator + str(i))
-                            try:
-                                self.search_data[file] = {
-                                    'TRANSLATED': script['TRANSLATED'][file][i],
-                                    'ORIGINAL': script['ORIGINAL'][file][i],
-                                    'JAPANESE': script['JAPANESE'][file][i],
-                                    'index': i
-                                }
-                            except:
-                                try:
-                                    self.search_data[file] = {
-                                        'TRANSLATED': script['TRANSLATED'][file][i],
-                                        'ORIGINAL': script['ORIGINAL'][file][i],
-                                        'JAPANESE': script['COMMENT'][file][i],
-                                        'index': i
-                                    }
-                                except:
-                                    self.search_data[file] = {
-                                        'TRANSLATED': script['TRANSLATED'][file][i],
-                                        'ORIGINAL': script['ORIGINAL'][file][i],
-                                        'JAPANESE': "",
-                                        'index': i
-                                    }
-                    i += 1
-            self.search_ui.file_list.sortItems()
-            self.search_ui.file_list.setCurrentRow(0)
-
-    def go_to_script(self, item):
-        tmp = item.text().split(self.search_sepatator)
-
-        script_name = tmp[0]
-        line_index = tmp[1]
+        first_batch = self.search_model.rowCount() == 0
+        self.search_model.add_hits(hits)
+        if first_batch:
+            self.search_ui.file_list.setCurrentIndex(self.search_model.index(0))
+
+    def search_finished(self, generation, count):
+        if generation != self.search_generation:
+            return
+        self.statusbar.showMessage('%d résultat(s) pour "%s"' % (count, self.search_text))
+
+    def go_to_script(self, index):
+        script_name, line_index = self.search_model.hit(index.row())
 
         if script_name not in self.parts and script_name not in self.games:
             self.close_search_ui()
@@ -934,17 +1090,41 @@ class Ui_MainWindow(QMainWindow):
                 if not self.check_files_modifications():
                     return
 
-            if not self.find_ppath(script_name):
+            if not self.find_ppath(script_name, self.search_game):
                 return
-            self.switch_file(self.script_ppath, line_index=line_index)
+            self.switch_file(self.script_ppath, self.search_game, line_index)
 
     def show_search_results(self, row):
         if row == -1:
             return
-        s_name = self.search_ui.file_list.item(row).text().split(self.search_sepatator)[0]
-        self.search_ui.translated.setPlainText(self.search_data[s_name]['TRANSLATED'][1:-1])
-        self.search_ui.original.setPlainText(self.search_data[s_name]['ORIGINAL'][1:-1])
-        self.search_ui.japanese.setPlainText(self.search_data[s_name]['JAPANESE'][1:-1])
+        # texts are read from the script data when shown, not stored per hit
+        script = self.data[self.search_game].script_data
+        file, i = self.search_model.hit(row)
+        japanese = ''
+        for tagname in ('JAPANESE', 'COMMENT'):
+            try:
+                japanese = script[tagname][file][i]
+                break
+            except (KeyError, IndexError):
+                pass
+
+        previews = {
+            'TRANSLATED': self.search_ui.translated,
+            'ORIGINAL': self.search_ui.original,
+            'JAPANESE': self.search_ui.japanese
+        }
+        previews['TRANSLATED'].setPlainText(script['TRANSLATED'][file][i][1:-1])
+        previews['ORIGINAL'].setPlainText(script['ORIGINAL'][file][i][1:-1])
+        previews['JAPANESE'].setPlainText(japanese[1:-1])
+
+        # select the match (its span counts the leading newline of the line)
+        tag, start, end = self.search_model.hit_span(row)
+        if SEARCH_TAGS[tag] in previews:
+            text_edit = previews[SEARCH_TAGS[tag]]
+            cursor = text_edit.textCursor()
+            cursor.setPosition(max(start - 1, 0))
+            cursor.setPosition(max(end - 1, 0), QTextCursor.KeepAnchor)
+            text_edit.setTextCursor(cursor)
 
     def jisho_search(self):
         self.jp_text.setDisabled(True)
@@ -963,6 +1143,7 @@ class Ui_MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         if self.current_game == '':
+            self.stop_search()
             event.accept()
             return
         ret = self.modification_has_been_made('TRANSLATED')
@@ -992,11 +1173,18 @@ class Ui_MainWindow(QMainWindow):
                 event.accept()
 
         self.put_in_json()
+        # the search thread must not outlive the window
+        if ret != 2:
+            self.stop_search()
 
 
 def main():
+    # the script parsing pool re-imports this module in frozen builds
+    freeze_support()
     app = QApplication(argv)
-    w = Ui_MainWindow()
+    workers = [int(arg.split('=', 1)[1]) for arg in argv if arg.startswith('--workers=')]
+    w = Ui_MainWindow(rebuild_snapshot='--rebuild-snapshot' in argv,
+                      workers=workers[-1] if workers else None)
     w.show()
     exit(app.exec_())
 
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""Fuzzy matches of a line among the translated lines of all the games.
+
+Lines are compared on their character trigrams, once their markup and
+extra whitespace are removed (see dupes_index.loose_keys) and lowercased.
+The score of a match is the Dice coefficient of the two sets of trigrams:
+1 for lines equal up to markup, case and whitespace, 0 for lines that have
+nothing in common.
+
+The index maps each trigram to the ids of the lines containing it. A query
+counts, for the rarest trigrams of the line (up to a number of postings,
+so that trigrams like ' de' or 'the' do not make it scan the corpus), how
+many of them each line shares, and only scores the best candidates.
+"""
+
+from array import array
+from collections import Counter
+from heapq import nlargest
+from itertools import chain
+
+from dupes_index import loose_keys
+
+
+def trigrams(key):
+    """Trigrams of a normalized line, padded so that short words count"""
+    key = ' %s ' % key
+    return {key[i:i + 3] for i in range(len(key) - 2)}
+
+
+class FuzzyIndex:
+
+    def __init__(self, lines=()):
+        # the lines, by id, and their id
+        self.lines = list()
+        self.ids = dict()
+        # trigram -> ids of the lines containing it
+        self.postings = dict()
+        self.add_lines(lines)
+
+    def __len__(self):
+        return len(self.lines)
+
+    def add_lines(self, lines):
+        lines = [line for line in dict.fromkeys(lines) if line not in self.ids]
+        postings = self.postings
+        for line, key in zip(lines, loose_keys(lines)):
+            line_id = self.ids[line] = len(self.lines)
+            self.lines.append(line)
+            for gram in trigrams(key.lower()):
+                ids = postings.get(gram)
+                if ids is None:
+                    ids = postings[gram] = array('I')
+                ids.append(line_id)
+
+    def add(self, line):
+        """Index one more line (nothing if it already is)"""
+        if line not in self.ids:
+            self.add_lines([line])
+
+    def search(self, line, count=5, min_score=0.0, candidates=40, budget=10000):
+        """
+        The `count` lines most similar to `line`, itself excluded, as
+        (score, line), best first
+        :param min_score: ignore the lines less similar than that
+        :param candidates: number of lines scored
+        :param budget: number of postings read
+        """
+        grams = trigrams(loose_keys([line])[0].lower())
+        lists = sorted((self.postings[gram] for gram in grams if gram in self.postings), key=len)
+
+        chosen = list()
+        total = 0
+        for ids in lists:
+            if chosen and total + len(ids) > budget:
+                break
+            chosen.append(ids)
+            total += len(ids)
+
+        scored = list()
+        exclude = self.ids.get(line)
+        for line_id, _ in Counter(chain.from_iterable(chosen)).most_common(candidates + 1):
+            if line_id == exclude:
+                continue
+            other = self.lines[line_id]
+            other_grams = trigrams(loose_keys([other])[0].lower())
+            score = 2 * len(grams & other_grams) / (len(grams) + len(other_grams))
+            if score >= min_score:
+                scored.append((score, other))
+        return nlargest(count, scored, key=lambda match: match[0])
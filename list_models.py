@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""Models of the list views of the editor.
+
+Both lists can hold tens of thousands of rows, so no row is an object:
+the line list only knows how many lines the script has, and the search
+results are kept in parallel integer arrays that point into the script
+data instead of copying its text.
+"""
+
+from array import array
+
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+
+
+class LineIndexModel(QAbstractListModel):
+    """
+    Line indexes of the current script (txt_files)
+    """
+
+    def __init__(self):
+        QAbstractListModel.__init__(self)
+        self.count = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.count
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            return str(index.row())
+        return None
+
+    def set_count(self, count):
+        self.beginResetModel()
+        self.count = count
+        self.endResetModel()
+
+
+class SearchResultsModel(QAbstractListModel):
+    """
+    Hits of the search dialog (file_list), shown as "script||line index".
+    Each hit also records the tag that matched (index in search_index
+    SEARCH_TAGS) and where, as returned by SearchIndex.search.
+    """
+
+    def __init__(self, separator='||'):
+        QAbstractListModel.__init__(self)
+        self.separator = separator
+        self.reset_hits()
+
+    def reset_hits(self):
+        # script paths, and their position in that list
+        self.scripts = list()
+        self.script_ids = dict()
+        # one entry per hit
+        self.file_ids = array('I')
+        self.lines = array('I')
+        self.tags = array('B')
+        self.starts = array('I')
+        self.ends = array('I')
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.lines)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            script, line = self.hit(index.row())
+            return script + self.separator + str(line)
+        return None
+
+    def hit(self, row):
+        return self.scripts[self.file_ids[row]], self.lines[row]
+
+    def hit_span(self, row):
+        """(tag index, start, end) of the match of a hit."""
+        return self.tags[row], self.starts[row], self.ends[row]
+
+    def clear(self):
+        self.beginResetModel()
+        self.reset_hits()
+        self.endResetModel()
+
+    def add_hits(self, hits):
+        """Append (script, line index, tag index, start, end) hits at the
+        end of the list."""
+        if not hits:
+            return
+        first = len(self.lines)
+        self.beginInsertRows(QModelIndex(), first, first + len(hits) - 1)
+        for script, line, tag, start, end in hits:
+            file_id = self.script_ids.get(script)
+            if file_id is None:
+                file_id = self.script_ids[script] = len(self.scripts)
+                self.scripts.append(script)
+            self.file_ids.append(file_id)
+            self.lines.append(line)
+            self.tags.append(tag)
+            self.starts.append(start)
+            self.ends.append(end)
+        self.endInsertRows()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""Markup of the script lines.
+
+Lines hold markup the game does not display, mostly <CLT 03>...<CLT>
+colour tags. A tag runs from '<' to the next '>', or to the end of the line
+if it is not closed. A line is split into text and tags once: markup(line)
+is memoized per string, as the length checks of the editor run on every
+keystroke and cursor move, mostly on the same lines.
+"""
+
+import re
+from functools import lru_cache
+
+
+def tag_pattern(stop=''):
+    """Regex of a tag. Besides '>', a tag ends before any of the characters
+    of `stop`, for texts that join several lines with a separator."""
+    return re.compile('<[^>%s]*>?' % stop)
+
+
+_TAG = tag_pattern()
+
+# longest visible row the game displays
+MAX_ROW_LENGTH = 64
+
+
+class Markup:
+
+    __slots__ = ('line', 'tags', 'text')
+
+    def __init__(self, line):
+        self.line = line
+        # (start, end) offsets of the tags in the line
+        self.tags = [match.span() for match in _TAG.finditer(line)]
+        # the line without its tags
+        self.text = _TAG.sub('', line) if self.tags else line
+
+    def hidden(self):
+        """Number of characters of markup"""
+        return len(self.line) - len(self.text)
+
+    def visible_column(self, column):
+        """Column of the visible text at `column` of the line"""
+        hidden = 0
+        for start, end in self.tags:
+            if start >= column:
+                break
+            hidden += min(end, column) - start
+        return column - hidden
+
+    def row_lengths(self):
+        """Visible length of each row of the line, '\\r' left out"""
+        return [len(row) - row.count('\r') for row in self.text.split('\n')]
+
+
+@lru_cache(maxsize=1024)
+def markup(line):
+    return Markup(line)
@@ -15,9 +15,10 @@ all formatting). This is enough for DRAT/Poedit workflows.
 
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator
 
 
 @dataclass
@@ -29,6 +30,18 @@ class PoEntry:
     extracted_comments: list[str] = field(default_factory=list)
 
 
+# "" is a trailing backslash with nothing to escape: kept as is.
+_PO_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", '"': '"', "\\": "\\", "": "\\"}
+
+_PO_ESCAPE_RE = re.compile(r"\\(.?)", re.DOTALL)
+
+
+def _decode_po_escape(m: re.Match) -> str:
+    c = m.group(1)
+    # Unknown escape: keep literal char.
+    return _PO_ESCAPES.get(c, c)
+
+
 def _unquote_po_string(s: str) -> str:
     """Decode a PO quoted string line: "..." with C-style escapes."""
 
@@ -38,43 +51,11 @@ def _unquote_po_string(s: str) -> str:
 
     body = s[1:-1]
 
-    # Interpret common PO escapes.
-    out: list[str] = []
-    i = 0
-    while i < len(body):
-        c = body[i]
-        if c != "\\":
-            out.append(c)
-            i += 1
-            continue
-
-        if i + 1 >= len(body):
-            out.append("\\")
-            i += 1
-            continue
-
-        n = body[i + 1]
-        if n == "n":
-            out.append("\n")
-            i += 2
-        elif n == "t":
-            out.append("\t")
-            i += 2
-        elif n == "r":
-            out.append("\r")
-            i += 2
-        elif n == '"':
-            out.append('"')
-            i += 2
-        elif n == "\\":
-            out.append("\\")
-            i += 2
-        else:
-            # Unknown escape: keep literal char.
-            out.append(n)
-            i += 2
-
-    return "".join(out)
+    # Most lines have no escape at all.
+    if "\\" not in body:
+        return body
+
+    return _PO_ESCAPE_RE.sub(_decode_po_escape, body)
 
 
 def _quote_po_string(s: str) -> str:
@@ -83,115 +64,103 @@ def _quote_po_string(s: str) -> str:
     return f'"{s}"'
 
 
-def _read_multiline_value(lines: list[str], i: int) -> tuple[str, int]:
-    """Read msgid/msgstr/msgctxt value starting at line i.
-
-    Returns (value, next_index).
-    """
-
-    # First line contains key + value.
-    parts = lines[i].split(None, 1)
-    if len(parts) == 1:
-        raise ValueError(f"Missing PO value at line {i + 1}: {lines[i]!r}")
-
-    val = _unquote_po_string(parts[1])
-    i += 1
+# Text is decoded incrementally from buffered chunks of this size.
+_READ_BUFFER_SIZE = 64 * 1024
 
-    # Continuation lines are just quoted strings.
-    while i < len(lines):
-        s = lines[i].strip()
-        if not s.startswith('"'):
-            break
-        val += _unquote_po_string(s)
-        i += 1
 
-    return val, i
+def _make_entry(path: Path, values: dict[str, str], tc: list[str], ec: list[str]) -> PoEntry | None:
+    """Build the entry collected so far, or None if no msg* line was seen."""
 
+    if not values:
+        return None
+    if "msgid" not in values:
+        raise ValueError(f"Invalid PO: missing msgid in {path}")
+    return PoEntry(
+        msgctxt=values.get("msgctxt"),
+        msgid=values["msgid"],
+        msgstr=values.get("msgstr", ""),
+        translator_comments=tc,
+        extracted_comments=ec,
+    )
 
-def read_po(path: Path) -> list[PoEntry]:
-    """Parse a .po file."""
 
-    raw = path.read_text(encoding="utf-8", errors="replace")
-    lines = raw.splitlines()
+def iter_po(path: Path) -> Iterator[PoEntry]:
+    """Parse a .po file lazily.
 
-    entries: list[PoEntry] = []
+    The file is read in buffered chunks and each entry is yielded as soon as
+    its block is complete, so memory stays flat on large catalogs and callers
+    can stop early.
+    """
 
     # State for current entry.
     tc: list[str] = []
     ec: list[str] = []
-    msgctxt: str | None = None
-    msgid: str | None = None
-    msgstr: str | None = None
-
-    def flush():
-        nonlocal tc, ec, msgctxt, msgid, msgstr
-        if msgid is None and msgstr is None and msgctxt is None:
-            tc = []
-            ec = []
-            return
-        if msgid is None:
-            raise ValueError(f"Invalid PO: missing msgid in {path}")
-        if msgstr is None:
-            msgstr = ""
-        entries.append(
-            PoEntry(
-                msgctxt=msgctxt,
-                msgid=msgid,
-                msgstr=msgstr,
-                translator_comments=tc,
-                extracted_comments=ec,
-            )
-        )
-        tc = []
-        ec = []
-        msgctxt = None
-        msgid = None
-        msgstr = None
-
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        s = line.strip()
-
-        # Blank line separates entries.
-        if s == "":
-            flush()
-            i += 1
-            continue
-
-        if s.startswith("#."):
-            ec.append(s[2:].lstrip())
-            i += 1
-            continue
-
-        if s.startswith("#"):
-            # translator comment (includes '# ')
-            tc.append(s[1:].lstrip())
-            i += 1
-            continue
-
-        if s.startswith("msgctxt"):
-            msgctxt, i = _read_multiline_value(lines, i)
-            continue
-
-        if s.startswith("msgid"):
-            msgid, i = _read_multiline_value(lines, i)
-            continue
-
-        if s.startswith("msgstr"):
-            msgstr, i = _read_multiline_value(lines, i)
-            continue
-
-        # Unknown line: ignore but keep parsing.
-        i += 1
-
-    flush()
-
-    # Drop header entry (msgid == "") if present.
-    if entries and entries[0].msgid == "":
-        return entries[1:]
-
-    return entries
+    values: dict[str, str] = {}
+    # msgid/msgstr/msgctxt extended by quoted continuation lines.
+    key: str | None = None
+    header_checked = False
+    lineno = 0
+
+    with path.open(encoding="utf-8", errors="replace", buffering=_READ_BUFFER_SIZE) as f:
+        for raw in f:
+            # Same line boundaries as str.splitlines() on the whole text.
+            for line in raw.splitlines():
+                lineno += 1
+                s = line.strip()
+
+                if key is not None and s.startswith('"'):
+                    values[key] += _unquote_po_string(s)
+                    continue
+                key = None
+
+                # Blank line separates entries.
+                if s == "":
+                    entry = _make_entry(path, values, tc, ec)
+                    tc = []
+                    ec = []
+                    values = {}
+                    if entry is None:
+                        continue
+                    # Drop header entry (msgid == "") if present.
+                    if not header_checked:
+                        header_checked = True
+                        if entry.msgid == "":
+                            continue
+                    yield entry
+                    continue
+
+                if s.startswith("#."):
+                    ec.append(s[2:].lstrip())
+                    continue
+
+                if s.startswith("#"):
+                    # translator comment (includes '# ')
+                    tc.append(s[1:].lstrip())
+                    continue
+
+                for k in ("msgctxt", "msgid", "msgstr"):
+                    if s.startswith(k):
+                        key = k
+                        break
+                else:
+                    # Unknown line: ignore but keep parsing.
+                    continue
+
+                # First line contains key + value.
+                parts = line.split(None, 1)
+                if len(parts) == 1:
+                    raise ValueError(f"Missing PO value at line {lineno}: {line!r}")
+                values[key] = _unquote_po_string(parts[1])
+
+    entry = _make_entry(path, values, tc, ec)
+    if entry is not None and (header_checked or entry.msgid != ""):
+        yield entry
+
+
+def read_po(path: Path) -> list[PoEntry]:
+    """Parse a .po file."""
+
+    return list(iter_po(path))
 
 
 def write_po(path: Path, entries: Iterable[PoEntry]) -> None:
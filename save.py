@@ -1,3 +1,6 @@
+from markup import MAX_ROW_LENGTH, markup
+
+
 def get_key(buffer, index, long=False):
     """
     this function gets the key to unlock the inner strength of human kind.
@@ -45,22 +48,5 @@ def right_key(key, buffer, index):
 
 
 def length_is_okay(line):
-    if line.find('<CLT') != -1:
-        for i in range(99):
-            if i < 10:
-                line = line.replace('<CLT 0' + str(i) + '>', '')
-            else:
-                line = line.replace('<CLT ' + str(i) + '>', '')
-        line = line.replace('<CLT>', '')
-    if line.find('\n') == -1:
-        if len(line) > 64:
-            return False
-        else:
-            return True
-    else:
-        tab = line.split('\n')
-        for single_line in tab:
-            if len(single_line) > 64:
-                return False
-            else:
-                return True
+    # only the first row is checked
+    return markup(line).row_lengths()[0] <= MAX_ROW_LENGTH
@@ -4,11 +4,16 @@
 @author samuel_r
 """
 
+import multiprocessing
 import os, sys
 
+from concurrent.futures import ProcessPoolExecutor
 from os import walk
 from os.path import exists
 
+from markup import MAX_ROW_LENGTH, markup
+from xml_script import XmlScript, decode_script, script_lines
+
 
 def find_w_line(cursor, blockText):
     index = 0
@@ -24,52 +29,24 @@ def find_w_line(cursor, blockText):
 
 
 def count_rem(w_line, i):
-    if w_line.find('>') != -1:
-        count = 1
-    else:
-        count = 0
-    while i < len(w_line) and w_line[i] != '>':
-        count += 1
-        i += 1
-    return count, i + 1
+    """Length of the tag at `i`, and the index after it. Counts one more for
+    a tag that is not closed when the line has a '>' elsewhere."""
+    end = w_line.find('>', i)
+    if end == -1:
+        end = len(w_line)
+    return end - i + (w_line.find('>') != -1), end + 1
 
 
 def find_to_remove(w_line):
-    i = 0
-    to_rem = 0
-    while i < len(w_line):
-        while i < len(w_line) and w_line[i] == '<':
-            rem, i = count_rem(w_line, i)
-            to_rem += rem
-        i += 1
-    return to_rem
+    return markup(w_line).hidden()
 
 
 def cleaned_text(w_line):
-    i = 0
-    new_line = list()
-    while i < len(w_line):
-        while i < len(w_line) and w_line[i] == '<':
-            var, i = count_rem(w_line, i)
-        if i < len(w_line) and w_line[i] != '<':
-            new_line.append(w_line[i])
-        i += 1
-    return ''.join(new_line)
+    return markup(w_line).text
 
 
 def length_is_okay(line):
-    line = cleaned_text(line)
-    if line.find('\n') == -1:
-        if len(line.replace('\r', '')) > 64:
-            return False
-        else:
-            return True
-    else:
-        tab = line.split('\n')
-        for single_line in tab:
-            if len(single_line.replace('\r', '')) > 64:
-                return False
-        return True
+    return max(markup(line).row_lengths()) <= MAX_ROW_LENGTH
 
 
 class SDSE1_Analyser:
@@ -102,12 +79,8 @@ class SDSE1_Analyser:
                 continue
             for txt in os.listdir(os.path.join(self.umdimg_path, lin, lin.split('.')[0] + '.pak')):
                 f = open(os.path.join(self.umdimg_path, lin, lin.split('.')[0] + '.pak', txt), 'rb')
-                buffer = f.read()
+                buffer, _ = decode_script(f.read())
                 f.close()
-                try:
-                    buffer = buffer.decode('utf-8')
-                except UnicodeDecodeError:
-                    buffer = buffer.decode('utf-16-le')
 
                 if buffer.find("CLT 1") != -1:
                     self.reacts.append((lin, txt, buffer))
@@ -126,59 +99,132 @@ class SDSE1_Analyser:
                 print(lin + '/' + txt)
             i += 1
 
+TAG_NAMES = ('TRANSLATED', 'ORIGINAL', 'JAPANESE', 'COMMENT', 'SPEAKER')
+
+
 def open_file(filename):
     with open(filename, 'rb') as f:
-        buf = f.read()
-
-    try:
-        buf = buf.decode('utf-8')
-    except UnicodeDecodeError:
-        buf = buf.decode('utf-16-le')
+        buf, _ = decode_script(f.read())
 
     return buf
 
 
 def get_file_script(buf, tag_name='TRANSLATED'):
-    translated_s = '<' + tag_name + ' N°'
-    end_translated_s = '</' + tag_name
+    return script_lines(buf, (tag_name,))[tag_name]
+
+
+def po_script_line(e, tag_name='TRANSLATED'):
+    """Convert one parsed .po entry to its SDSE line for one tag."""
+
+    if tag_name == "SPEAKER":
+        from po_io import parse_context_speaker
+
+        _, sp = parse_context_speaker(e.msgctxt)
+        return sp or ""
+    if tag_name == "JAPANESE":
+        return "\n" + "\n".join(e.extracted_comments) + "\n"
+    if tag_name == "COMMENT":
+        return "\n" + "\n".join(e.translator_comments) + "\n"
+    if tag_name == "ORIGINAL":
+        o = e.msgid
+        if o == "[EMPTY_LINE]":
+            o = ""
+        return "\n" + o + "\n"
+    if tag_name == "TRANSLATED":
+        t = e.msgstr
+        if t == "[EMPTY_LINE]":
+            t = ""
+        return "\n" + t + "\n"
+    # Unknown tag for PO mode
+    return "\n\n"
+
+
+def po_script_lines(entries, tag_name='TRANSLATED'):
+    """Convert parsed .po entries to SDSE lines for one tag."""
+
+    return [po_script_line(e, tag_name) for e in entries]
 
-    begin_trad_offset = len(translated_s) + 4
-    begin_trad = buf.find(translated_s) + begin_trad_offset
-    end_trad = buf.find(end_translated_s)
 
-    xml_script_data = list()
+def file_stat(filename):
+    """(mtime_ns, size) of a file, used to tell if it changed on disk."""
 
-    while begin_trad != -1 and end_trad != -1:
+    st = os.stat(filename)
+    return st.st_mtime_ns, st.st_size
 
-        xml_script_data.append(buf[begin_trad:end_trad])
 
-        if buf.find(translated_s, end_trad) + begin_trad_offset < begin_trad:
-            break
+def is_script_file(filename, mode="xml"):
+    if mode == "po":
+        return filename.lower().endswith(".po")
+    return filename.endswith(".xml")
 
-        begin_trad = buf.find(translated_s, end_trad) + begin_trad_offset
-        end_trad = buf.find(end_translated_s, begin_trad)
 
-    return xml_script_data
+def parse_script_file(filename, mode="xml", tag_names=TAG_NAMES):
+    """Read and parse one script file, returning {tag_name: lines}."""
+
+    if mode == "po":
+        from pathlib import Path
+
+        from po_io import read_po
+
+        entries = read_po(Path(filename))
+        return {tag_name: po_script_lines(entries, tag_name) for tag_name in tag_names}
+
+    return script_lines(open_file(filename), tag_names)
 
 
 def right_len(line):
-    # remove <CLT> from line
-    line = cleaned_text(line)
+    # only the first row is checked
+    return markup(line).row_lengths()[0] <= MAX_ROW_LENGTH
 
-    # if single line, directly check len
-    if line.find('\n') == -1:
-        if len(line) > 64:
-            return False
+
+def parse_script_job(job):
+    """Parse one (filename, mode, tag_names) job into (file_stat, tables).
+
+    Returns None if the file no longer exists. Runs in pool worker processes.
+    """
+
+    script_file, mode, tag_names = job
+    try:
+        return file_stat(script_file), parse_script_file(script_file, mode, tag_names)
+    except FileNotFoundError:
+        return None
+
+
+# Below this many files, starting worker processes costs more than it saves.
+PARALLEL_MIN_FILES = 32
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def iter_parse_script_jobs(jobs, workers=1):
+    """Yield parse_script_job results, in the order of `jobs`.
+
+    With workers > 1 and enough files, jobs are fanned out to a process pool
+    (parsing is CPU-bound); results still come back in job order. Workers
+    are spawned rather than forked, as forking a process that runs Qt
+    threads is unsafe: parse_script_job and its jobs must pickle.
+    """
+
+    if workers > 1 and len(jobs) >= PARALLEL_MIN_FILES:
+        executor = None
+        try:
+            executor = ProcessPoolExecutor(max_workers=min(workers, len(jobs)),
+                                           mp_context=multiprocessing.get_context('spawn'))
+            results = executor.map(parse_script_job, jobs,
+                                   chunksize=max(1, len(jobs) // (workers * 8)))
+        except (OSError, NotImplementedError):
+            # no usable process pool on this system: parse in this process
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
         else:
-            return True
-    # else, split into an array and check each cell of array
-    else:
-        tab = line.split('\n')
-        for single_line in tab:
-            if len(single_line) > 64:
-                return False
-            else:
-                return True
+            with executor:
+                yield from results
+            return
+
+    for job in jobs:
+        yield parse_script_job(job)
 
 
 class XmlAnalyser:
@@ -189,6 +235,11 @@ class XmlAnalyser:
         # (editor_ui sometimes works with absolute paths).
         self.xml_path = os.path.abspath(path)
         self.script_data = dict()
+        # script path -> file_stat() taken when it was last parsed
+        self.file_stats = dict()
+        # .xml script path -> XmlScript of the file, kept while it does not
+        # change on disk so that saving it again does not re-read it
+        self.xml_scripts = dict()
 
         # DRAT 1.5.2+ uses .po (gettext). If we detect any .po files, we switch mode.
         self.mode = "xml"
@@ -203,71 +254,126 @@ class XmlAnalyser:
     def analyse_scripts(self, tag_name='TRANSLATED'):
         """Load scripts from either legacy DRAT XML or DRAT 1.5.2+ PO."""
 
-        if self.mode == "xml":
-            new_script_data = dict()
+        self.analyse_all_scripts((tag_name,))
 
-            for dirpath, dirnames, filenames in walk(self.xml_path):
-                for filen in filenames:
-                    if filen.endswith(".xml"):
-                        xml_file = os.path.join(dirpath, filen)
-                        try:
-                            buf = open_file(xml_file)
-                        except FileNotFoundError:
-                            continue
+    def script_files(self):
+        """Yield the path of every script file of the game folder."""
 
-                        new_script_data[xml_file] = get_file_script(buf, tag_name)
+        for dirpath, dirnames, filenames in walk(self.xml_path):
+            for filen in filenames:
+                if is_script_file(filen, self.mode):
+                    yield os.path.join(dirpath, filen)
 
-            self.script_data[tag_name] = new_script_data
-            return
+    def owns(self, script_file):
+        """Tell whether a path is a script file of the game folder."""
 
-        # PO mode
-        from pathlib import Path
+        return (is_script_file(script_file, self.mode)
+                and os.path.abspath(script_file).startswith(os.path.join(self.xml_path, '')))
 
-        from po_io import parse_context_speaker, read_po
+    def analyse_all_scripts(self, tag_names=TAG_NAMES):
+        """Load every tag in `tag_names` with a single walk of the game folder.
 
-        new_script_data = dict()
+        Each file is read and parsed exactly once, then split into the
+        per-tag tables of `self.script_data`.
+        """
 
-        for dirpath, _, filenames in walk(self.xml_path):
-            for filen in filenames:
-                if not filen.lower().endswith(".po"):
-                    continue
-
-                po_file = os.path.join(dirpath, filen)
-                entries = read_po(Path(po_file))
-
-                lines: list[str] = []
-
-                if tag_name == "SPEAKER":
-                    for e in entries:
-                        _, sp = parse_context_speaker(e.msgctxt)
-                        lines.append(sp or "")
-                elif tag_name == "JAPANESE":
-                    for e in entries:
-                        jp = "\n".join(e.extracted_comments)
-                        lines.append("\n" + jp + "\n")
-                elif tag_name == "COMMENT":
-                    for e in entries:
-                        c = "\n".join(e.translator_comments)
-                        lines.append("\n" + c + "\n")
-                elif tag_name == "ORIGINAL":
-                    for e in entries:
-                        o = e.msgid
-                        if o == "[EMPTY_LINE]":
-                            o = ""
-                        lines.append("\n" + o + "\n")
-                elif tag_name == "TRANSLATED":
-                    for e in entries:
-                        t = e.msgstr
-                        if t == "[EMPTY_LINE]":
-                            t = ""
-                        lines.append("\n" + t + "\n")
-                else:
-                    # Unknown tag for PO mode
-                    lines = ["\n\n" for _ in entries]
+        self.store_scripts(self.parse_scripts(self.script_files(), tag_names), tag_names)
+
+    def parse_scripts(self, script_files, tag_names=TAG_NAMES, workers=1):
+        """Parse script files into {path: (file_stat, {tag_name: lines})}.
+
+        Files that disappeared in the meantime are left out. With workers > 1
+        the files are parsed in a process pool.
+        """
+
+        jobs = [(script_file, self.mode, tag_names) for script_file in script_files]
+        results = iter_parse_script_jobs(jobs, workers)
+        return {job[0]: result for job, result in zip(jobs, results) if result is not None}
+
+    def store_scripts(self, scripts, tag_names=TAG_NAMES):
+        """Replace the tag tables with parsed scripts, as given by parse_scripts."""
+
+        new_script_data = {tag_name: dict() for tag_name in tag_names}
+
+        for script_file, (stat, tables) in scripts.items():
+            self.file_stats[script_file] = stat
+            for tag_name in tag_names:
+                new_script_data[tag_name][script_file] = tables[tag_name]
+
+        self.script_data.update(new_script_data)
+
+    def is_stale(self, script_file):
+        """Tell whether a script changed on disk since it was parsed."""
+
+        try:
+            return file_stat(script_file) != self.file_stats.get(script_file)
+        except FileNotFoundError:
+            return True
+
+    def stale_scripts(self):
+        """Return the scripts added, modified or removed since they were parsed."""
+
+        on_disk = set(self.script_files())
+        stale = [f for f in on_disk if self.is_stale(f)]
+        stale += [f for f in self.file_stats if f not in on_disk]
+        return sorted(stale)
+
+    def reload_script(self, script_file):
+        """Re-parse a single script into every loaded tag table.
+
+        A script that no longer exists is dropped from the tables.
+        Returns False in that case.
+        """
+
+        tag_names = tuple(self.script_data)
+        self.xml_scripts.pop(script_file, None)
+        try:
+            stat = file_stat(script_file)
+            tables = parse_script_file(script_file, self.mode, tag_names)
+        except FileNotFoundError:
+            self.file_stats.pop(script_file, None)
+            for tag_name in tag_names:
+                self.script_data[tag_name].pop(script_file, None)
+            return False
+
+        self.file_stats[script_file] = stat
+        for tag_name in tag_names:
+            self.script_data[tag_name][script_file] = tables[tag_name]
+        return True
+
+    def note_saved(self, script_file):
+        """Record that a script on disk now matches what is in memory."""
+
+        try:
+            self.file_stats[script_file] = file_stat(script_file)
+        except FileNotFoundError:
+            self.file_stats.pop(script_file, None)
+
+    def xml_script(self, script_file):
+        """Return the XmlScript of a .xml script as it is on disk.
+
+        Its codec is detected when the file is read, and kept for writing it.
+        """
+
+        script = self.xml_scripts.get(script_file)
+        if script is None or self.is_stale(script_file):
+            with open(script_file, 'rb') as f:
+                script = XmlScript(*decode_script(f.read()))
+            self.xml_scripts[script_file] = script
+        return script
+
+    def save_xml_lines(self, script_file, tag_name, lines):
+        """Write the lines of a tag to a .xml script.
 
-                new_script_data[po_file] = lines
+        Only the elements whose text changed are rewritten. The written
+        script is kept for the next save.
+        """
 
-        self.script_data[tag_name] = new_script_data
+        script = self.xml_script(script_file).with_lines(tag_name, lines)
+        with open(script_file, 'wb') as f:
+            f.write(script.encode())
+        self.note_saved(script_file)
+        self.xml_scripts[script_file] = script
 
     def check_line_length(self):
 
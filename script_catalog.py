@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""Catalog of the scripts of the loaded games, by file name.
+
+The open dialog and the search results give script names; the catalog
+turns them into (game, full path) with one dict lookup. The same file name
+can exist in several games (dr1xml/e00_000_000.xml and dr1po/...): such
+names are only resolved within a given game or the preferred one, never
+by guessing.
+"""
+
+from os.path import basename
+
+
+class ScriptCatalog:
+
+    def __init__(self):
+        # file name -> list of (game, full path), in loading order
+        self.by_name = dict()
+        # full path -> game
+        self.games = dict()
+
+    def add_script(self, game, path):
+        if path in self.games:
+            return
+        self.games[path] = game
+        self.by_name.setdefault(basename(path), list()).append((game, path))
+
+    def remove_script(self, path):
+        game = self.games.pop(path, None)
+        if game is None:
+            return
+        entries = self.by_name[basename(path)]
+        entries.remove((game, path))
+        if not entries:
+            del self.by_name[basename(path)]
+
+    def add_game(self, game, paths):
+        for path in paths:
+            self.add_script(game, path)
+
+    def resolve(self, name, game=None, preferred=None):
+        """
+        (game, full path) of a script given by full path or file name, or
+        None if there is no such script or the name is ambiguous.
+        :param game: only look for the script in this game
+        :param preferred: game to pick when the name exists in several games
+        """
+        if name in self.games:
+            found = [(self.games[name], name)]
+        else:
+            found = self.by_name.get(basename(name), ())
+        if game is not None:
+            found = [entry for entry in found if entry[0] == game]
+        if len(found) > 1:
+            found = [entry for entry in found if entry[0] == preferred]
+        if len(found) != 1:
+            return None
+        return found[0]
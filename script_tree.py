@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""Model of the tree of the open dialog: games, their chapters, and the
+scripts of each chapter.
+
+The scripts of a game are put in their chapter once, when the game is
+loaded, as lists of file names sorted case-insensitively. No node is an
+object: an index only records the game and chapter of its parent, and the
+rows under a node are read from these lists when the view asks for them,
+that is when the node is expanded. Filtering the scripts by the beginning
+of their name is a bisect in each list.
+"""
+
+from bisect import bisect_left, bisect_right
+from os.path import basename
+
+from PyQt5.QtCore import Qt, QAbstractItemModel, QModelIndex
+
+# internal id of an index: 0 for a game, (game + 1) << 8 for a chapter and
+# (game + 1) << 8 | (chapter + 1) for a script, game and chapter being
+# positions in ScriptTreeModel.games and parts
+_CHAPTER_BITS = 8
+_CHAPTER_MASK = (1 << _CHAPTER_BITS) - 1
+
+
+def chapter_of(name, chapters):
+    """
+    Position of the chapter of a script (e04_... is in the 5th one) among
+    `chapters` chapters, the last one being for the scripts of no chapter
+    """
+    if name[1:3].isnumeric() and int(name[1:3]) <= 7:
+        return int(name[2])
+    return chapters - 1
+
+
+class ScriptTreeModel(QAbstractItemModel):
+
+    def __init__(self, parts):
+        QAbstractItemModel.__init__(self)
+        self.parts = parts
+        self.games = list()
+        # per game, per chapter: lowercase file names, sorted, and the file
+        # names in the same order
+        self.keys = list()
+        self.names = list()
+        self.prefix = ''
+        self.refilter()
+
+    def refilter(self):
+        # per game, per chapter: (start, end) of the names shown
+        self.ranges = [[self.prefix_range(keys) for keys in chapters] for chapters in self.keys]
+        # games and chapters shown, a filter hides the ones without a match
+        if self.prefix:
+            self.shown_chapters = [[chapter for chapter, (start, end) in enumerate(ranges) if end > start]
+                                   for ranges in self.ranges]
+        else:
+            self.shown_chapters = [list(range(len(self.parts))) for _ in self.keys]
+        self.shown_games = [game for game, chapters in enumerate(self.shown_chapters) if chapters]
+
+    def prefix_range(self, keys):
+        if not self.prefix:
+            return 0, len(keys)
+        start = bisect_left(keys, self.prefix)
+        return start, bisect_left(keys, self.prefix + '\U0010ffff', start)
+
+    def set_filter(self, text):
+        """Only show the scripts whose name starts with `text`, whatever
+        the case"""
+        self.beginResetModel()
+        self.prefix = text.lower()
+        self.refilter()
+        self.endResetModel()
+
+    def add_game(self, game, paths):
+        keys = [list() for _ in self.parts]
+        names = [list() for _ in self.parts]
+        for name in sorted((basename(path) for path in paths), key=str.lower):
+            chapter = chapter_of(name, len(self.parts))
+            keys[chapter].append(name.lower())
+            names[chapter].append(name)
+
+        row = len(self.shown_games)
+        shown = not self.prefix or any(end > start for start, end in map(self.prefix_range, keys))
+        if shown:
+            self.beginInsertRows(QModelIndex(), row, row)
+        self.games.append(game)
+        self.keys.append(keys)
+        self.names.append(names)
+        self.refilter()
+        if shown:
+            self.endInsertRows()
+
+    def add_script(self, game, path):
+        self.beginResetModel()
+        name = basename(path)
+        keys, names = self.bucket(game, name)
+        position = bisect_right(keys, name.lower())
+        keys.insert(position, name.lower())
+        names.insert(position, name)
+        self.refilter()
+        self.endResetModel()
+
+    def remove_script(self, game, path):
+        self.beginResetModel()
+        name = basename(path)
+        keys, names = self.bucket(game, name)
+        position = names.index(name)
+        del keys[position]
+        del names[position]
+        self.refilter()
+        self.endResetModel()
+
+    def bucket(self, game, name):
+        position = self.games.index(game)
+        chapter = chapter_of(name, len(self.parts))
+        return self.keys[position][chapter], self.names[position][chapter]
+
+    def node(self, index):
+        """
+        (game, chapter, name) positions of the node of a valid index, the
+        ones below its level being None
+        """
+        key = index.internalId()
+        if key == 0:
+            return self.shown_games[index.row()], None, None
+        game = (key >> _CHAPTER_BITS) - 1
+        if key & _CHAPTER_MASK == 0:
+            return game, self.shown_chapters[game][index.row()], None
+        chapter = (key & _CHAPTER_MASK) - 1
+        return game, chapter, self.ranges[game][chapter][0] + index.row()
+
+    def script_at(self, index):
+        """(game, file name) of a script index, None for other nodes"""
+        game, chapter, name = self.node(index)
+        if name is None:
+            return None
+        return self.games[game], self.names[game][chapter][name]
+
+    def first_script(self):
+        """Index of the first script shown, or an invalid index"""
+        for game_row, game in enumerate(self.shown_games):
+            for chapter_row, chapter in enumerate(self.shown_chapters[game]):
+                start, end = self.ranges[game][chapter]
+                if end > start:
+                    chapter_index = self.index(chapter_row, 0, self.index(game_row, 0))
+                    return self.index(0, 0, chapter_index)
+        return QModelIndex()
+
+    def index(self, row, column=0, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row, column, 0)
+        game, chapter, _ = self.node(parent)
+        if chapter is None:
+            return self.createIndex(row, column, (game + 1) << _CHAPTER_BITS)
+        return self.createIndex(row, column, (game + 1) << _CHAPTER_BITS | (chapter + 1))
+
+    def parent(self, index):
+        if not index.isValid() or index.internalId() == 0:
+            return QModelIndex()
+        game, chapter, name = self.node(index)
+        if name is None:
+            return self.createIndex(self.shown_games.index(game), 0, 0)
+        return self.createIndex(self.shown_chapters[game].index(chapter), 0,
+                                (game + 1) << _CHAPTER_BITS)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self.shown_games)
+        if parent.column() > 0:
+            return 0
+        game, chapter, name = self.node(parent)
+        if chapter is None:
+            return len(self.shown_chapters[game])
+        if name is None:
+            start, end = self.ranges[game][chapter]
+            return end - start
+        return 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        game, chapter, name = self.node(index)
+        if chapter is None:
+            return self.games[game]
+        if name is None:
+            return self.parts[chapter]
+        return self.names[game][chapter][name]
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and section == 0:
+            return 'Script'
+        return None
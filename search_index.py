@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""Case-folded search corpus of a game, for the search dialog.
+
+Each script is kept as one lowercase text: its lines one after the other,
+separated by SOH, and the searchable tags of a line joined with NUL so
+that a match never spans two tags or two lines. A query is then a C-level
+str.find over these texts. Offsets are mapped back to line indexes with
+bisect. The set of characters of each text is kept too, so scripts missing
+a character of the query are skipped without being scanned (this prunes
+most of the corpus for names and Japanese queries).
+
+Edits and reloads only mark their script; its text is rebuilt on the next
+search. Searches can run in another thread on a snapshot of the texts,
+see iter_search.
+
+Texts and queries are lowercased character by character (see fold), so
+that an offset in a lowercased line is the same offset in the line shown
+by the editor.
+"""
+
+from bisect import bisect_right, insort
+
+SEARCH_TAGS = ('TRANSLATED', 'ORIGINAL', 'JAPANESE', 'COMMENT')
+
+_TAG_SEP = '\x00'
+_LINE_SEP = '\x01'
+
+
+def fold(text):
+    """`text` lowercased, with the same length: the few characters whose
+    lowercase is longer ('İ' becomes 'i̇') are left as they are."""
+    lower = text.lower()
+    if len(lower) == len(text):
+        return lower
+    return ''.join(c if len(c.lower()) > 1 else c.lower() for c in text)
+
+
+class SearchIndex:
+
+    def __init__(self, script_data, tag_names=SEARCH_TAGS):
+        self.script_data = script_data
+        self.tag_names = tag_names
+        # script -> (lowercase text, line start offsets, characters of the text)
+        self.texts = dict()
+        self.scripts = list()
+        # scripts whose text has to be rebuilt before the next search
+        self.stale = set()
+
+        scripts = set()
+        for tag in tag_names:
+            scripts.update(script_data.get(tag, ()))
+        for script in sorted(scripts):
+            self.index_script(script)
+
+    def index_script(self, script):
+        tables = [self.script_data.get(tag, {}).get(script, ()) for tag in self.tag_names]
+        count = max(len(lines) for lines in tables)
+        if count == 0:
+            if script in self.texts:
+                del self.texts[script]
+                self.scripts.remove(script)
+            return
+
+        # a missing line counts as an empty one, so the n-th part of a line
+        # is always the n-th tag
+        lines = [_TAG_SEP.join(fold(lines[i]) if i < len(lines) else '' for lines in tables)
+                 for i in range(count)]
+        starts = list()
+        offset = 0
+        for line in lines:
+            starts.append(offset)
+            offset += len(line) + 1
+        text = _LINE_SEP.join(lines)
+
+        if script not in self.texts:
+            insort(self.scripts, script)
+        self.texts[script] = text, starts, frozenset(text)
+
+    def invalidate(self, script):
+        """`script` was edited in memory, reloaded or removed."""
+        self.stale.add(script)
+
+    def snapshot(self):
+        """The current texts, as a list of (script, entry) that later edits
+        do not touch. To be taken by the thread editing the scripts, before
+        searching from another one."""
+        for script in self.stale:
+            self.index_script(script)
+        self.stale.clear()
+        return [(script, self.texts[script]) for script in self.scripts]
+
+    def search(self, text):
+        """Hits of the lines where one of the tags contains `text`,
+        case-insensitively, sorted by script and line index.
+
+        A hit is (script, line index, tag index, start, end): the first tag
+        of the line (in tag_names order) that matches, and where the match
+        is in its text (lowercasing keeps the offsets, see fold).
+        """
+        return [hit for hits in iter_search(self.snapshot(), text) for hit in hits]
+
+
+def iter_search(snapshot, text, batch_size=500):
+    """Yield the hits of SearchIndex.search(text) in order, by batches of
+    about `batch_size` (a script is never split)."""
+    query = fold(text)
+    chars = frozenset(query)
+    hits = list()
+    for script, (script_text, starts, script_chars) in snapshot:
+        if not chars <= script_chars:
+            continue
+
+        pos = script_text.find(query)
+        while pos != -1:
+            line = bisect_right(starts, pos) - 1
+            tag_start = max(script_text.rfind(_TAG_SEP, starts[line], pos) + 1, starts[line])
+            hits.append((script, line, script_text.count(_TAG_SEP, starts[line], pos),
+                         pos - tag_start, pos - tag_start + len(query)))
+            if line + 1 == len(starts):
+                break
+            pos = script_text.find(query, starts[line + 1])
+
+        if len(hits) >= batch_size:
+            yield hits
+            hits = list()
+    if hits:
+        yield hits
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from search_index import iter_search
+
+
+class DatabaseSearchThread(QThread):
+    """
+    Runs one search of the search dialog over a SearchIndex snapshot and
+    streams the hits by batches, already sorted. Every search has its own
+    generation number so the editor can drop batches of a search it has
+    replaced; cancel() stops the thread before the next script it scans.
+    """
+    # generation, list of (script, line index, tag index, start, end)
+    results_found = pyqtSignal(int, list)
+    # generation, number of hits
+    search_done = pyqtSignal(int, int)
+
+    def __init__(self, generation, snapshot, text):
+        QThread.__init__(self)
+        self.generation = generation
+        self.snapshot = snapshot
+        self.text = text
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def scripts(self):
+        for entry in self.snapshot:
+            if self.cancelled:
+                return
+            yield entry
+
+    def run(self):
+        total = 0
+        for hits in iter_search(self.scripts(), self.text):
+            if self.cancelled:
+                return
+            total += len(hits)
+            self.results_found.emit(self.generation, hits)
+        if self.cancelled:
+            return
+        self.search_done.emit(self.generation, total)
@@ -21,9 +21,31 @@ class DummySignal:
             cb(*a, **kw)
 
 
+class DummySignalDescriptor:
+    """pyqtSignal stand-in: each instance gets its own DummySignal."""
+
+    def __set_name__(self, owner, name):
+        self._name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return obj.__dict__.setdefault(self._name, DummySignal())
+
+
 class DummyAction:
     def __init__(self):
         self.triggered = DummySignal()
+        self.toggled = DummySignal()
+        self._checked = False
+
+    def setChecked(self, checked):
+        if checked != self._checked:
+            self._checked = checked
+            self.toggled.emit(checked)
+
+    def isChecked(self):
+        return self._checked
 
 
 class DummyButton:
@@ -52,9 +74,11 @@ class DummyLineEdit:
     def __init__(self):
         self._text = ""
         self.returnPressed = DummySignal()
+        self.textChanged = DummySignal()
 
     def setText(self, t):
         self._text = t
+        self.textChanged.emit(t)
 
     def text(self):
         return self._text
@@ -89,10 +113,22 @@ class DummyTextEdit:
     def textCursor(self):
         return DummyCursor(self._text)
 
+    def setTextCursor(self, cursor):
+        self.selection = cursor.selectedText()
+
 
 class DummyCursor:
     def __init__(self, text: str):
         self._text = text
+        self.anchor = self.pos = 0
+
+    def setPosition(self, pos, mode=0):
+        if mode == 0:
+            self.anchor = pos
+        self.pos = pos
+
+    def selectedText(self):
+        return self._text[min(self.anchor, self.pos):max(self.anchor, self.pos)]
 
     def columnNumber(self):
         return 0
@@ -117,99 +153,81 @@ class DummyProgress:
         self.value = int(v)
 
 
-class DummyListItem:
-    def __init__(self, text: str):
-        self._text = text
+class DummyStatusBar:
+    def __init__(self):
+        self.messages = []
 
-    def text(self):
-        return self._text
+    def showMessage(self, text, timeout=0):
+        self.messages.append(text)
+
+    def currentMessage(self):
+        return self.messages[-1] if self.messages else ""
 
 
-class DummyListWidget:
+class DummySelectionModel:
     def __init__(self):
-        self._items = []
-        self._cur = -1
-        self.currentItemChanged = DummySignal()
-        self.currentRowChanged = DummySignal()
-        self.itemDoubleClicked = DummySignal()
+        self.currentChanged = DummySignal()
 
-    def clear(self):
-        self._items = []
-        self._cur = -1
 
-    def addItems(self, items):
-        for it in items:
-            self._items.append(DummyListItem(it))
+class DummyListView:
+    def __init__(self):
+        self._model = None
+        self._current = None
+        self._selection = DummySelectionModel()
+        self.doubleClicked = DummySignal()
 
-    def addItem(self, it):
-        self._items.append(DummyListItem(it))
+    def setModel(self, model):
+        self._model = model
+        # like Qt, a reset drops the current index without any signal
+        model.modelReset.connect(self._reset)
+        self._reset()
 
-    def item(self, i):
-        return self._items[i]
+    def _reset(self):
+        self._current = self._model.index(-1)
 
-    def currentRow(self):
-        return self._cur
+    def model(self):
+        return self._model
 
-    def count(self):
-        return len(self._items)
+    def selectionModel(self):
+        return self._selection
 
-    def setCurrentItem(self, item):
-        prev = self.currentItem()
-        self._cur = self._items.index(item)
-        self.currentItemChanged.emit(item, prev)
+    def currentIndex(self):
+        return self._current
 
-    def setCurrentRow(self, row: int):
-        if row < 0 or row >= len(self._items):
-            self._cur = -1
-            self.currentRowChanged.emit(-1)
+    def setCurrentIndex(self, index):
+        previous = self._current
+        if index == previous:
             return
-        self._cur = row
-        self.currentRowChanged.emit(row)
-
-    def sortItems(self):
-        self._items.sort(key=lambda it: it.text())
+        self._current = index
+        self._selection.currentChanged.emit(index, previous)
 
-    def currentItem(self):
-        if self._cur < 0:
-            return None
-        return self._items[self._cur]
+    def scrollTo(self, *_):
+        pass
 
 
-class DummyTreeWidget:
+class DummyTreeView(DummyListView):
     def __init__(self):
-        self.itemDoubleClicked = DummySignal()
-        self._current = None
+        DummyListView.__init__(self)
+        self.expanded = []
 
-    def setHeaderItem(self, *_):
-        pass
+    def isExpanded(self, index):
+        return index in self.expanded
 
-    def addTopLevelItems(self, items):
-        self._top = items
+    def expand(self, index):
+        self.expanded.append(index)
 
-    def currentItem(self):
-        return self._current
+    def collapse(self, index):
+        self.expanded.remove(index)
 
-    def setCurrentItem(self, item):
-        self._current = item
+    def expandAll(self):
+        self.expanded = ['all']
 
-    def itemAt(self, *_):
-        return self._current
+    def collapseAll(self):
+        self.expanded = []
 
     def setFocus(self):
         pass
 
-    def exec_(self):
-        return 0
-
-    def collapseItem(self, *_):
-        pass
-
-    def expandItem(self, *_):
-        pass
-
-    def scrollToItem(self, *_):
-        pass
-
 
 class DummyButtonBox:
     def __init__(self):
@@ -219,7 +237,8 @@ class DummyButtonBox:
 
 class DummyDialog:
     def __init__(self):
-        self.treeWidget = DummyTreeWidget()
+        self.treeView = DummyTreeView()
+        self.filter_le = DummyLineEdit()
         self.open_btn_box = DummyButtonBox()
 
     def show(self):
@@ -275,11 +294,79 @@ def _install_qt_stubs():
                 self.run()
 
     def pyqtSignal(*_a, **_kw):
-        return DummySignal()
+        return DummySignalDescriptor()
+
+    class QModelIndex:
+        def __init__(self, row=-1, model=None, column=0, internal_id=0):
+            self._row = row
+            self._model = model
+            self._column = column
+            self._id = internal_id
+
+        def isValid(self):
+            return self._model is not None
+
+        def row(self):
+            return self._row if self._model is not None else -1
+
+        def column(self):
+            return self._column if self._model is not None else -1
+
+        def internalId(self):
+            return self._id
+
+        def model(self):
+            return self._model
+
+        def parent(self):
+            return self._model.parent(self) if self._model is not None else QModelIndex()
+
+        def _key(self):
+            return self._row, self._model, self._column, self._id
+
+        def __eq__(self, other):
+            return isinstance(other, QModelIndex) and self._key() == other._key()
+
+    class QAbstractItemModel:
+        modelReset = pyqtSignal()
+        rowsInserted = pyqtSignal()
+
+        def __init__(self, *_a):
+            pass
+
+        def createIndex(self, row, column, internal_id=0):
+            return QModelIndex(row, self, column, internal_id)
+
+        def hasIndex(self, row, column, parent=QModelIndex()):
+            return 0 <= row < self.rowCount(parent) and 0 <= column < self.columnCount(parent)
+
+        def beginResetModel(self):
+            pass
+
+        def endResetModel(self):
+            self.modelReset.emit()
+
+        def beginInsertRows(self, parent, first, last):
+            self._inserting = (first, last)
+
+        def endInsertRows(self):
+            self.rowsInserted.emit(QModelIndex(), *self._inserting)
+
+    class QAbstractListModel(QAbstractItemModel):
+        def columnCount(self, parent=QModelIndex()):
+            return 1
+
+        def index(self, row, column=0, parent=QModelIndex()):
+            if self.hasIndex(row, column, parent):
+                return self.createIndex(row, column)
+            return QModelIndex()
 
     qtcore.QThread = QThread
     qtcore.pyqtSignal = pyqtSignal
-    qtcore.Qt = types.SimpleNamespace()
+    qtcore.QModelIndex = QModelIndex
+    qtcore.QAbstractItemModel = QAbstractItemModel
+    qtcore.QAbstractListModel = QAbstractListModel
+    qtcore.Qt = types.SimpleNamespace(DisplayRole=0)
 
     class QPixmap:
         def __init__(self, *_a, **_kw):
@@ -307,6 +394,8 @@ def _install_qt_stubs():
 
     class QTextCursor:
         EndOfLine = 0
+        MoveAnchor = 0
+        KeepAnchor = 1
 
     qtgui.QTextCursor = QTextCursor
 
@@ -337,25 +426,6 @@ def _install_qt_stubs():
     qtwidgets.QMainWindow = QMainWindow
     qtwidgets.QDialog = DummyDialog
 
-    class QTreeWidgetItem:
-        def __init__(self, parent=None, *_a, **_kw):
-            self._text = {}
-            self._expanded = False
-            self._parent = parent
-
-        def setText(self, col, text):
-            self._text[col] = text
-
-        def text(self, col):
-            return self._text.get(col, "")
-
-        def parent(self):
-            return self._parent
-
-        def isExpanded(self):
-            return self._expanded
-
-    qtwidgets.QTreeWidgetItem = QTreeWidgetItem
     qtwidgets.QMessageBox = DummyMessageBox
 
     class QShortcut:
@@ -385,8 +455,10 @@ def _install_qt_stubs():
         obj.save_action = getattr(obj, 'save_action', DummyAction())
         obj.save_toolbox = getattr(obj, 'save_toolbox', DummyButton())
         obj.delete_json_file = getattr(obj, 'delete_json_file', DummyAction())
+        obj.loose_dupes_action = getattr(obj, 'loose_dupes_action', DummyAction())
+        obj.pretranslate_action = getattr(obj, 'pretranslate_action', DummyAction())
 
-        obj.txt_files = getattr(obj, 'txt_files', DummyListWidget())
+        obj.txt_files = getattr(obj, 'txt_files', DummyListView())
 
         obj.translated = getattr(obj, 'translated', DummyTextEdit())
         obj.comment = getattr(obj, 'comment', DummyTextEdit())
@@ -396,6 +468,7 @@ def _install_qt_stubs():
         obj.speaker = getattr(obj, 'speaker', DummyLabel())
         obj.jp_text = getattr(obj, 'jp_text', DummyLineEdit())
         obj.jp_result = getattr(obj, 'jp_result', DummyTextEdit())
+        obj.fuzzy_matches = getattr(obj, 'fuzzy_matches', DummyTextEdit())
         obj.search_btn = getattr(obj, 'search_btn', DummyButton())
 
         obj.prev_script = getattr(obj, 'prev_script', DummyButton())
@@ -403,6 +476,7 @@ def _install_qt_stubs():
 
         obj.copy_from_original = getattr(obj, 'copy_from_original', DummyButton())
         obj.copy_from_japanese = getattr(obj, 'copy_from_japanese', DummyButton())
+        obj.copy_from_tm = getattr(obj, 'copy_from_tm', DummyButton())
         obj.reload = getattr(obj, 'reload', DummyButton())
         obj.search_in_data = getattr(obj, 'search_in_data', DummyButton())
 
@@ -414,16 +488,19 @@ def _install_qt_stubs():
         obj.xml_progress = getattr(obj, 'xml_progress', DummyProgress())
         obj.overall_progress = getattr(obj, 'overall_progress', DummyProgress())
 
+        obj.statusbar = getattr(obj, 'statusbar', DummyStatusBar())
+
         obj.line_count = getattr(obj, 'line_count', DummyLCD())
         obj.check_line_icon = getattr(obj, 'check_line_icon', DummyLabel())
 
         # Search dialog widgets
         obj.search_le = getattr(obj, 'search_le', DummyLineEdit())
-        obj.file_list = getattr(obj, 'file_list', DummyListWidget())
+        obj.file_list = getattr(obj, 'file_list', DummyListView())
 
         # open/search dialogs
         if isinstance(obj, DummyDialog):
-            obj.treeWidget = getattr(obj, 'treeWidget', DummyTreeWidget())
+            obj.treeView = getattr(obj, 'treeView', DummyTreeView())
+            obj.filter_le = getattr(obj, 'filter_le', DummyLineEdit())
             obj.open_btn_box = getattr(obj, 'open_btn_box', DummyButtonBox())
 
     uic.loadUi = loadUi
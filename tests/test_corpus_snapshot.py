@@ -0,0 +1,110 @@
+import os
+from pathlib import Path
+
+import corpus_snapshot
+from corpus_snapshot import SNAPSHOT_NAME, load_game, read_snapshot, write_snapshot
+from script_analyser import TAG_NAMES, XmlAnalyser
+
+
+def _write_po(path: Path, msgstr: str):
+    path.write_text(
+        f'msgid ""\nmsgstr ""\n\n#. JP\n# note\nmsgctxt "0001 | MAKOTO"\nmsgid "Hello"\nmsgstr "{msgstr}"\n',
+        encoding='utf-8',
+    )
+
+
+def _load(root: Path, **kw):
+    xa = XmlAnalyser(str(root))
+    return xa, load_game(xa, TAG_NAMES, **kw)
+
+
+def _game(tmp_path: Path) -> Path:
+    root = tmp_path / 'dr1'
+    (root / 'sub').mkdir(parents=True)
+    _write_po(root / 'a.po', 'Bonjour')
+    _write_po(root / 'sub' / 'b.po', '')
+    return root
+
+
+def test_load_game_cold_then_warm(tmp_path: Path):
+    root = _game(tmp_path)
+
+    cold, counts = _load(root)
+    assert counts == (0, 2)
+    assert (root / SNAPSHOT_NAME).exists()
+
+    warm, counts = _load(root)
+    assert counts == (2, 0)
+    assert warm.script_data == cold.script_data
+    assert warm.file_stats == cold.file_stats
+    assert warm.stale_scripts() == []
+
+    # Same content with a new mtime: reused thanks to the hash.
+    st = (root / 'a.po').stat()
+    os.utime(root / 'a.po', ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert _load(root)[1] == (2, 0)
+    assert _load(root)[1] == (2, 0)
+
+    # Real edit: only that file is parsed again.
+    _write_po(root / 'a.po', 'Salut')
+    xa, counts = _load(root)
+    assert counts == (1, 1)
+    assert xa.script_data['TRANSLATED'][str(root / 'a.po')] == ['\nSalut\n']
+
+    # Removed file: dropped from the snapshot.
+    (root / 'sub' / 'b.po').unlink()
+    assert _load(root)[1] == (1, 0)
+    assert list(read_snapshot(str(root), 'po')) == ['a.po']
+
+    assert _load(root, rebuild=True)[1] == (0, 1)
+
+
+def test_read_snapshot_rejects_bad_files(tmp_path: Path):
+    root = _game(tmp_path)
+    snap = root / SNAPSHOT_NAME
+    assert read_snapshot(str(root), 'po') == {}
+
+    _load(root)
+    assert read_snapshot(str(root), 'xml') == {}
+    assert read_snapshot(str(root), 'po', ('TRANSLATED',)) == {}
+
+    raw = snap.read_bytes()
+    snap.write_bytes(raw[:8] + b'\x00\x63' + raw[10:])
+    assert read_snapshot(str(root), 'po') == {}
+
+    snap.write_bytes(raw[:10] + b'not zlib')
+    assert read_snapshot(str(root), 'po') == {}
+    assert _load(root)[1] == (0, 2)
+
+
+def test_load_game_skips_vanishing_files(tmp_path: Path, monkeypatch):
+    root = _game(tmp_path)
+    a_po = str(root / 'a.po')
+
+    real_stat = corpus_snapshot.file_stat
+    real_parse = corpus_snapshot.iter_parse_script_jobs
+
+    # a.po disappears before its stat, b.po right after being parsed.
+    def parse_then_delete(jobs, workers=1):
+        parsed = list(real_parse(jobs, workers))
+        (root / 'sub' / 'b.po').unlink()
+        return iter(parsed)
+
+    monkeypatch.setattr(corpus_snapshot, 'file_stat',
+                        lambda f: (_ for _ in ()).throw(FileNotFoundError()) if f == a_po else real_stat(f))
+    monkeypatch.setattr(corpus_snapshot, 'iter_parse_script_jobs', parse_then_delete)
+    xa, counts = _load(root)
+    assert counts == (0, 1)
+    assert read_snapshot(str(root), 'po') == {}
+
+    # Both files vanish between the snapshot check and their parse.
+    monkeypatch.undo()
+    _write_po(root / 'sub' / 'b.po', '')
+    monkeypatch.setattr(corpus_snapshot, 'iter_parse_script_jobs', lambda jobs, workers=1: iter([None] * len(jobs)))
+    xa, counts = _load(root)
+    assert counts == (0, 0)
+    assert xa.script_data['ORIGINAL'] == {}
+
+
+def test_write_snapshot_failure_is_not_fatal(tmp_path: Path):
+    assert write_snapshot(str(tmp_path / 'missing'), 'po', TAG_NAMES, {}) is False
@@ -0,0 +1,118 @@
+from pathlib import Path
+
+from dirty_tracker import DirtyTracker
+
+
+def test_dirty_tracker_mark_and_clear():
+    t = DirtyTracker()
+    assert t.is_dirty("a.po") is False
+    assert t.is_line_dirty("a.po", "TRANSLATED", 3) is False
+
+    # Clearing a line that was never marked is a no-op.
+    t.mark("a.po", "TRANSLATED", 5, False)
+    assert t.dirty_files() == []
+
+    t.mark("a.po", "TRANSLATED", 3)
+    t.mark("a.po", "TRANSLATED", 3)
+    t.mark("a.po", "COMMENT", 0)
+    t.mark("b.po", "TRANSLATED", 1)
+    assert t.is_line_dirty("a.po", "TRANSLATED", 3) is True
+    assert t.is_line_dirty("a.po", "TRANSLATED", 2) is False
+    assert t.is_dirty("a.po", "TRANSLATED") is True
+    assert t.dirty_files() == ["a.po", "b.po"]
+    assert t.dirty_files("COMMENT") == ["a.po"]
+
+    t.mark("a.po", "TRANSLATED", 3, False)
+    t.mark("a.po", "TRANSLATED", 10, False)
+    assert t.is_dirty("a.po", "TRANSLATED") is False
+    assert t.is_dirty("a.po") is True
+
+    t.clear("a.po", "COMMENT")
+    assert t.is_dirty("a.po") is False
+
+    t.clear("b.po")
+    t.clear("b.po")
+    assert t.dirty_files() == []
+
+
+def _write_po(path: Path):
+    path.write_text(
+        'msgid ""\nmsgstr ""\n\nmsgctxt "0001"\nmsgid "Hello"\nmsgstr ""\n\nmsgctxt "0002"\nmsgid "World"\nmsgstr ""\n',
+        encoding='utf-8',
+    )
+
+
+def test_editor_ui_title_star_without_disk_reads(tmp_path: Path, monkeypatch):
+    (tmp_path / 'script_data' / 'dr1po').mkdir(parents=True)
+    po = tmp_path / 'script_data' / 'dr1po' / 'e00_000_000.po'
+    _write_po(po)
+    monkeypatch.chdir(tmp_path)
+
+    import editor_ui
+
+    editor_ui.expanduser = lambda p: str(tmp_path / 'sdse_data_file.json')
+    w = editor_ui.Ui_MainWindow()
+    w.switch_file(str(po), game='dr1po', line_index=0)
+    assert w._title == 'e00_000_000.po - Another SDSE ' + editor_ui.VERSION
+
+    # Navigating must not touch the disk any more.
+    import po_io
+    monkeypatch.setattr(po_io, 'iter_po', lambda *_: (_ for _ in ()).throw(AssertionError('disk read')))
+
+    w.translated.setPlainText('Bonjour')
+    w.go_next_script()
+    assert w._title == 'e00_000_000.po* - Another SDSE ' + editor_ui.VERSION
+    assert w.modified.dirty_files('TRANSLATED') == [str(po)]
+
+    monkeypatch.undo()
+    monkeypatch.chdir(tmp_path)
+    w.save()
+    assert w.modified.dirty_files() == []
+    assert w.script_database_changed() is False
+
+
+def test_dirty_tracker_dirty_lines():
+    t = DirtyTracker()
+    assert t.dirty_lines("a.po", "TRANSLATED") == []
+    t.mark("a.po", "TRANSLATED", 4)
+    t.mark("a.po", "TRANSLATED", 1)
+    t.mark("a.po", "COMMENT", 2)
+    assert t.dirty_lines("a.po", "TRANSLATED") == [1, 4]
+
+
+def test_dirty_tracker_edit_back_to_loaded_text_is_clean():
+    t = DirtyTracker()
+    t.edit("a.po", "TRANSLATED", 2, "\nold\n", "\nnew\n")
+    t.edit("a.po", "TRANSLATED", 2, "\nnew\n", "\nnewer\n")
+    t.edit("a.po", "TRANSLATED", 5, "\nx\n", "\ny\n")
+    assert t.dirty_lines("a.po", "TRANSLATED") == [2, 5]
+
+    t.edit("a.po", "TRANSLATED", 2, "\nnewer\n", "\nold\n")
+    assert t.dirty_lines("a.po", "TRANSLATED") == [5]
+    t.edit("a.po", "TRANSLATED", 5, "\ny\n", "\nx\n")
+    assert t.is_dirty("a.po") is False
+
+    # once clean, the next edit starts from the text it had then
+    t.edit("a.po", "TRANSLATED", 2, "\nold\n", "\nagain\n")
+    t.clear("a.po", "TRANSLATED")
+    t.edit("a.po", "TRANSLATED", 2, "\nagain\n", "\nold\n")
+    assert t.is_line_dirty("a.po", "TRANSLATED", 2) is True
+
+
+def test_editor_ui_line_typed_back_is_not_unsaved(tmp_path: Path, monkeypatch):
+    (tmp_path / 'script_data' / 'dr1po').mkdir(parents=True)
+    po = tmp_path / 'script_data' / 'dr1po' / 'e00_000_000.po'
+    _write_po(po)
+    monkeypatch.chdir(tmp_path)
+
+    import editor_ui
+
+    editor_ui.expanduser = lambda p: str(tmp_path / 'sdse_data_file.json')
+    w = editor_ui.Ui_MainWindow()
+    w.switch_file(str(po), game='dr1po', line_index=0)
+
+    w.set_script_line('dr1po', str(po), 'TRANSLATED', 0, '\nBonjour\n')
+    assert w.script_database_changed() is True
+    w.set_script_line('dr1po', str(po), 'TRANSLATED', 0, '\n\n')
+    assert w.script_database_changed() is False
+    assert w.modified.dirty_files() == []
@@ -0,0 +1,58 @@
+import re
+
+from dupes_index import DupesIndex, loose_keys
+from markup import markup
+
+
+def test_groups_and_siblings():
+    scripts = {
+        'a.po': ['\nHello\n', '\nWorld\n', '\nHello\n'],
+        'b.po': ['\nBye\n', '\nHello\n'],
+        'c.po': ['\nWorld\n'],
+        'd.po': [],
+    }
+    dupes = DupesIndex(scripts)
+
+    assert len(dupes) == 2
+    assert list(dupes) == ['\nHello\n', '\nWorld\n']
+    assert dupes.siblings('b.po', 1) == [('a.po', 0), ('a.po', 2), ('b.po', 1)]
+    assert dupes.siblings('c.po', 0) == [('a.po', 1), ('c.po', 0)]
+    assert dupes.siblings('b.po', 0) == []
+    assert dupes.siblings('unknown.po', 0) == []
+    assert dupes.group('a.po', 2) == dupes.group('b.po', 1) == 0
+
+    # the group texts are the strings of the script data, not copies
+    assert next(iter(dupes)) is scripts['a.po'][0]
+
+
+def test_no_dupes():
+    dupes = DupesIndex({'a.po': ['\nA\n', '\nB\n']})
+    assert len(dupes) == 0
+    assert dupes.siblings('a.po', 1) == []
+
+
+def test_loose_keys():
+    lines = ['\nHello <CLT 03>world<CLT>\n', '\nHello  world \n', '\nHello\nworld\n',
+             '\n<CLT 03><CLT>\n', '\n<CLT>\n', '\nHello <unclosed\n', '\nHello\n']
+    assert loose_keys(lines) == ['Hello world', 'Hello world', 'Hello world',
+                                 '\n<CLT 03><CLT>\n', '\n<CLT>\n', 'Hello', 'Hello']
+
+
+def test_loose_keys_remove_the_markup_of_each_line():
+    # an unclosed tag ends with its line, not in the next one
+    lines = ['\nA <CLT 03\n', '\nB> C\n', '\n<b>D <CLT>\n', '\nE<\n', '\n>F\n']
+    expected = [re.sub(r'\s+', ' ', markup(line).text).strip() for line in lines]
+    assert loose_keys(lines) == expected == ['A', 'B> C', 'D', 'E', '>F']
+
+
+def test_loose_groups():
+    scripts = {
+        'a.po': ['\nHello <CLT 03>world<CLT>\n', '\n<CLT>\n'],
+        'b.po': ['\nHello world\n', '\n<CLT 03>\n'],
+    }
+    assert DupesIndex(scripts).siblings('a.po', 0) == []
+    dupes = DupesIndex(scripts, loose=True)
+    assert list(dupes) == ['Hello world']
+    assert dupes.siblings('b.po', 0) == [('a.po', 0), ('b.po', 0)]
+    # lines that are only markup are not all dupes of each other
+    assert dupes.siblings('a.po', 1) == []
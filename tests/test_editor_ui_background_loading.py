@@ -0,0 +1,96 @@
+import json
+from pathlib import Path
+
+from corpus_loader import LoadThread
+
+
+def _write_po(path: Path, entries):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = ['msgid ""', 'msgstr ""', '']
+    for i, (mid, mstr) in enumerate(entries):
+        lines += [f'msgctxt "{i:04d}"', f'msgid "{mid}"', f'msgstr "{mstr}"', '']
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+
+
+def _setup(tmp_path: Path, monkeypatch, saved):
+    data = tmp_path / 'script_data'
+    _write_po(data / 'dr1po' / 'e00_000_000.po', [('Hello', ''), ('Hello', 'Salut')])
+    _write_po(data / 'dr2po' / 'e01_000_000.po', [('World', 'Monde')])
+    _write_po(data / 'dr2po' / '11_Report.po', [('Menu', '')])
+    (tmp_path / 'sdse_data_file.json').write_text(json.dumps(saved), encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+
+    import editor_ui
+
+    monkeypatch.setattr(editor_ui, 'listdir', lambda p: ['dr1po', 'dr2po'])
+    monkeypatch.setattr(editor_ui, 'expanduser', lambda p: str(tmp_path / 'sdse_data_file.json'))
+    return editor_ui
+
+
+def test_restored_game_is_loaded_first_and_reopened(tmp_path: Path, monkeypatch):
+    script = str(tmp_path / 'script_data' / 'dr2po' / 'e01_000_000.po')
+    editor_ui = _setup(tmp_path, monkeypatch, {'name': script, 'game': 'dr2po', 'line_index': 0})
+
+    opened = []
+    real_switch = editor_ui.Ui_MainWindow.switch_file
+
+    def switch_file(self, *args):
+        # the restored script is opened before the other games are loaded
+        opened.append(list(self.games))
+        real_switch(self, *args)
+
+    monkeypatch.setattr(editor_ui.Ui_MainWindow, 'switch_file', switch_file)
+    w = editor_ui.Ui_MainWindow(workers=1)
+
+    assert opened == [['dr2po']]
+    assert w.games == ['dr2po', 'dr1po']
+    assert w.script_ppath == script and w.current_game == 'dr2po'
+    assert w.translated.toPlainText() == 'Monde'
+
+    # the open dialog tree got one top level item per game, in loading order
+    tree = w.tree_model
+    assert [tree.data(tree.index(row)) for row in range(tree.rowCount())] == ['dr2po', 'dr1po']
+
+    # dupes and counters are built per game as it arrives
+    assert list(w.dupes['dr1po']) == ['\nHello\n']
+    assert w.game_progress == {'dr2po': [1, 2], 'dr1po': [1, 2]}
+
+    messages = w.statusbar.messages
+    assert messages[0] == 'Chargement des scripts...'
+    assert 'Chargement de dr2po : 2/2 scripts' in messages
+    assert messages.index('dr2po chargé') < messages.index('dr1po chargé')
+    assert messages[-1].startswith('2 jeux chargés en ')
+
+
+def test_restore_failure_does_not_stop_loading(tmp_path: Path, monkeypatch, capsys):
+    script = str(tmp_path / 'script_data' / 'dr1po' / 'gone.po')
+    editor_ui = _setup(tmp_path, monkeypatch, {'name': script, 'game': 'dr1po', 'line_index': 0})
+
+    w = editor_ui.Ui_MainWindow(workers=1)
+    assert 'Could not reopen ' + script + '.' in capsys.readouterr().out
+    assert w.games == ['dr1po', 'dr2po']
+
+
+def test_restore_of_a_script_under_another_game_is_refused(tmp_path: Path, monkeypatch, capsys):
+    script = str(tmp_path / 'script_data' / 'dr2po' / 'e01_000_000.po')
+    editor_ui = _setup(tmp_path, monkeypatch, {'name': script, 'game': 'dr1po', 'line_index': 0})
+
+    w = editor_ui.Ui_MainWindow(workers=1)
+    assert 'Could not reopen ' + script + '.' in capsys.readouterr().out
+    assert script not in w.data['dr1po'].script_data['ORIGINAL']
+    assert w.script_ppath != script
+
+
+def test_restore_with_a_broken_state(tmp_path: Path, monkeypatch, capsys):
+    script = str(tmp_path / 'script_data' / 'dr2po' / 'e01_000_000.po')
+    editor_ui = _setup(tmp_path, monkeypatch, {'name': script, 'game': 'dr2po'})
+
+    editor_ui.Ui_MainWindow(workers=1)
+    assert 'Could not reopen ' + script + '.' in capsys.readouterr().out
+
+
+def test_load_thread_batches():
+    assert LoadThread('.', ['a', 'b'], 'b').batches() == [['b'], ['a']]
+    assert LoadThread('.', ['a'], 'a').batches() == [['a']]
+    assert LoadThread('.', ['a', 'b'], 'c').batches() == [['a', 'b']]
+    assert LoadThread('.', ['a', 'b']).batches() == [['a', 'b']]
@@ -74,8 +74,7 @@ def test_editor_ui_po_flow(tmp_path: Path, monkeypatch):
     w.show_search_results(0)
 
     # Go to script via search result
-    item = w.search_ui.file_list.item(0)
-    w.go_to_script(item)
+    w.go_to_script(w.search_model.index(0))
 
     # Jisho search (thread stub runs synchronously)
     w.jp_text.setText('日本語')
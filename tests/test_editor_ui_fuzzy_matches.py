@@ -0,0 +1,68 @@
+from pathlib import Path
+
+from fuzzy_index import FuzzyIndex
+
+
+def _write_po(path: Path, entries):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = ['msgid ""', 'msgstr ""', '']
+    for i, (mid, mstr) in enumerate(entries):
+        lines += [f'msgctxt "{i:04d}"', f'msgid "{mid}"', f'msgstr "{mstr}"', '']
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+
+
+def test_fuzzy_matches_in_dupes_tab(tmp_path: Path, monkeypatch):
+    dr1 = tmp_path / 'script_data' / 'dr1po' / 'e00_000_000.po'
+    dr2 = tmp_path / 'script_data' / 'dr2po' / 'e00_000_000.po'
+    _write_po(dr1, [('The door is open.', 'La porte est ouverte.'), ('Nothing alike', 'Rien')])
+    _write_po(dr2, [('The door is opened.', ''), ('Where is the key?', ''), ('Where is the key!', '')])
+    monkeypatch.chdir(tmp_path)
+
+    import editor_ui
+
+    monkeypatch.setattr(editor_ui, 'listdir', lambda p: ['dr1po', 'dr2po'])
+    monkeypatch.setattr(editor_ui, 'expanduser', lambda p: str(tmp_path / 'sdse_data_file.json'))
+    monkeypatch.setattr(editor_ui, '_git_commit_po', lambda path: None)
+    w = editor_ui.Ui_MainWindow(workers=1)
+    assert len(w.fuzzy) == 2
+
+    w.switch_file(str(dr2), 'dr2po')
+    shown = w.fuzzy_matches.toPlainText()
+    assert shown == '83 % (dr1po)\nThe door is open.\n→ La porte est ouverte.'
+
+    w.txt_files.setCurrentIndex(w.line_model.index(1))
+    assert w.fuzzy_matches.toPlainText() == 'Aucune ligne similaire traduite.'
+
+    # a line translated in the editor is indexed once saved
+    w.translated.setPlainText('Où est la clé ?')
+    w.txt_files.setCurrentIndex(w.line_model.index(2))
+    assert w.fuzzy_matches.toPlainText() == 'Aucune ligne similaire traduite.'
+    w.save()
+    w.txt_files.setCurrentIndex(w.line_model.index(1))
+    w.txt_files.setCurrentIndex(w.line_model.index(2))
+    assert '→ Où est la clé ?' in w.fuzzy_matches.toPlainText()
+
+
+def test_fuzzy_index_not_ready_yet(tmp_path: Path, monkeypatch):
+    po = tmp_path / 'script_data' / 'dr1po' / 'e00_000_000.po'
+    _write_po(po, [('Hello there', ''), ('Hello there!', '')])
+    monkeypatch.chdir(tmp_path)
+
+    import editor_ui
+
+    monkeypatch.setattr(editor_ui, 'expanduser', lambda p: str(tmp_path / 'sdse_data_file.json'))
+    monkeypatch.setattr(editor_ui, '_git_commit_po', lambda path: None)
+    w = editor_ui.Ui_MainWindow(workers=1)
+
+    # while the index is built, lines translated are kept for later
+    w.fuzzy = None
+    w.switch_file(str(po), 'dr1po')
+    assert w.fuzzy_matches.toPlainText() == 'Recherche de lignes similaires en préparation...'
+    w.translated.setPlainText('Salut')
+    w.txt_files.setCurrentIndex(w.line_model.index(1))
+    w.save()
+    assert w.fuzzy_pending == ['\nHello there\n']
+
+    w.on_fuzzy_index_ready(FuzzyIndex())
+    assert w.fuzzy.lines == ['\nHello there\n'] and w.fuzzy_pending == []
+    assert '→ Salut' in w.fuzzy_matches.toPlainText()
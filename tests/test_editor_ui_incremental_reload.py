@@ -0,0 +1,93 @@
+import os
+from pathlib import Path
+
+import script_analyser
+from script_analyser import XmlAnalyser
+
+
+def _write_po(path: Path, entries):
+    lines = ['msgid ""', 'msgstr ""', '']
+    for i, (mid, mstr) in enumerate(entries):
+        lines += [f'msgctxt "{i:04d}"', f'msgid "{mid}"', f'msgstr "{mstr}"', '']
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+
+
+def _bump_mtime(path: Path):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def test_xml_analyser_stale_scripts_and_reload(tmp_path: Path):
+    root = tmp_path / 'dr1'
+    root.mkdir()
+    a_po, b_po = root / 'a.po', root / 'b.po'
+    _write_po(a_po, [('A', '')])
+    _write_po(b_po, [('B', '')])
+
+    xa = XmlAnalyser(str(root))
+    xa.analyse_all_scripts()
+    assert xa.stale_scripts() == []
+    assert xa.is_stale(str(a_po)) is False
+
+    _write_po(a_po, [('A', 'a'), ('A2', '')])
+    _bump_mtime(a_po)
+    b_po.unlink()
+    _write_po(root / 'c.po', [('C', '')])
+    assert xa.is_stale(str(b_po)) is True
+    assert xa.stale_scripts() == sorted([str(a_po), str(b_po), str(root / 'c.po')])
+
+    assert xa.reload_script(str(a_po)) is True
+    assert xa.script_data['TRANSLATED'][str(a_po)] == ['\na\n', '\n\n']
+    assert xa.reload_script(str(b_po)) is False
+    assert str(b_po) not in xa.script_data['ORIGINAL']
+    assert str(b_po) not in xa.file_stats
+
+    xa.note_saved(str(b_po))
+    assert str(b_po) not in xa.file_stats
+
+
+def test_switch_file_only_parses_changed_scripts(tmp_path: Path, monkeypatch):
+    game_dir = tmp_path / 'script_data' / 'dr1po'
+    game_dir.mkdir(parents=True)
+    po1 = game_dir / 'e00_000_000.po'
+    po2 = game_dir / 'e00_000_001.po'
+    _write_po(po1, [('Hello', ''), ('World', '')])
+    _write_po(po2, [('Hello', ''), ('Other', 'Autre')])
+    monkeypatch.chdir(tmp_path)
+
+    import editor_ui
+
+    editor_ui.expanduser = lambda p: str(tmp_path / 'sdse_data_file.json')
+    w = editor_ui.Ui_MainWindow()
+
+    parsed = []
+    real_parse = script_analyser.parse_script_file
+    monkeypatch.setattr(script_analyser, 'parse_script_file',
+                        lambda f, *a: parsed.append(f) or real_parse(f, *a))
+
+    w.switch_file(str(po1), game='dr1po', line_index=0)
+    w.switch_file(str(po2), game='dr1po', line_index=0)
+    assert parsed == []
+
+    # Saving does not make the file look modified on disk.
+    w.translated.setPlainText('Bonjour')
+    w.save()
+    w.switch_file(str(po1), game='dr1po', line_index=0)
+    assert parsed == []
+
+    # An external edit is picked up when the file is opened again.
+    _write_po(po2, [('Hi', 'Salut'), ('Other', 'Autre')])
+    _bump_mtime(po2)
+    w.switch_file(str(po2), game='dr1po', line_index=0)
+    assert parsed == [str(po2)]
+    assert w.translated.toPlainText() == 'Salut'
+    assert w.game_progress['dr1po'] == [2, 4]
+    assert 'Hello\n' not in ''.join(w.dupes['dr1po'])
+
+    # Reload only looks at what changed: here a removed file, nothing to parse.
+    parsed.clear()
+    po1.unlink()
+    w.reload_ui()
+    assert parsed == []
+    assert str(po1) not in w.data['dr1po'].script_data['ORIGINAL']
+    assert w.game_progress['dr1po'] == [2, 2]
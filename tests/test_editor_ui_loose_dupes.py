@@ -0,0 +1,42 @@
+import json
+from pathlib import Path
+
+
+def _write_po(path: Path, entries):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = ['msgid ""', 'msgstr ""', '']
+    for i, (mid, mstr) in enumerate(entries):
+        lines += [f'msgctxt "{i:04d}"', f'msgid "{mid}"', f'msgstr "{mstr}"', '']
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+
+
+def test_loose_dupes_follow_the_option(tmp_path: Path, monkeypatch):
+    po1 = tmp_path / 'script_data' / 'dr1po' / 'e00_000_000.po'
+    po2 = tmp_path / 'script_data' / 'dr1po' / 'e00_000_001.po'
+    _write_po(po1, [('Hello <CLT 03>world<CLT>', ''), ('Other', '')])
+    _write_po(po2, [('Hello  world ', '')])
+    saved = tmp_path / 'sdse_data_file.json'
+    saved.write_text(json.dumps({'name': str(po1), 'game': 'dr1po', 'line_index': 0,
+                                 'loose_dupes': True}), encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+
+    import editor_ui
+
+    monkeypatch.setattr(editor_ui, 'expanduser', lambda p: str(saved))
+    w = editor_ui.Ui_MainWindow(workers=1)
+
+    # the option is restored before the games are loaded
+    assert w.loose_dupes and w.loose_dupes_action.isChecked()
+    assert sorted(w.dupes['dr1po'].siblings(str(po1), 0)) == [(str(po1), 0), (str(po2), 0)]
+
+    w.translated.setPlainText('Bonjour le monde')
+    w.update_script_database('dr1po', str(po1), 0)
+    assert w.data['dr1po'].script_data['TRANSLATED'][str(po2)][0] == '\nBonjour le monde\n'
+    assert w.data_modified_in_dupes
+
+    # back to exact dupes
+    w.loose_dupes_action.setChecked(False)
+    assert w.dupes['dr1po'].siblings(str(po1), 0) == []
+
+    w.put_in_json()
+    assert json.loads(saved.read_text(encoding='utf-8'))['loose_dupes'] is False
@@ -0,0 +1,53 @@
+from pathlib import Path
+
+
+def _write_po(path: Path, entries):
+    lines = ['msgid ""', 'msgstr ""', '']
+    for i, (mid, mstr) in enumerate(entries):
+        lines += [f'msgctxt "{i:04d}"', f'msgid "{mid}"', f'msgstr "{mstr}"', '']
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+
+
+def _recount(w, game):
+    per_file = {}
+    for script, lines in w.data[game].script_data['TRANSLATED'].items():
+        per_file[script] = sum(1 for line in lines if line[1:-1] != '')
+    total = sum(len(v) for v in w.data[game].script_data['TRANSLATED'].values())
+    return per_file, [sum(per_file.values()), total]
+
+
+def test_progress_counters_follow_edits_and_dupes(tmp_path: Path, monkeypatch):
+    game_dir = tmp_path / 'script_data' / 'dr1po'
+    game_dir.mkdir(parents=True)
+    po1 = game_dir / 'e00_000_000.po'
+    po2 = game_dir / 'e00_000_001.po'
+    _write_po(po1, [('Hello', ''), ('World', 'Monde')])
+    _write_po(po2, [('Hello', ''), ('Other', '')])
+    monkeypatch.chdir(tmp_path)
+
+    import editor_ui
+
+    editor_ui.expanduser = lambda p: str(tmp_path / 'sdse_data_file.json')
+    w = editor_ui.Ui_MainWindow()
+    w.switch_file(str(po1), game='dr1po', line_index=0)
+
+    assert w.game_progress['dr1po'] == [1, 4]
+    assert w.global_progress_label.text() == '1 / 4'
+    assert w.progress_file_label.text() == '1 / 2'
+
+    # 'Hello' is a dupe: translating it fills both files.
+    w.translated.setPlainText('Bonjour')
+    w.go_next_script()
+    assert (w.file_progress['dr1po'], w.game_progress['dr1po']) == _recount(w, 'dr1po')
+    assert w.game_progress['dr1po'] == [3, 4]
+    assert w.global_progress_label.text() == '3 / 4'
+
+    # Emptying a translated line decrements; rewriting a translated one does not move.
+    w.translated.setPlainText('')
+    w.go_prev_script()
+    w.translated.setPlainText('Salut')
+    w.go_next_script()
+    w.translated.setPlainText('Autre')
+    w.go_prev_script()
+    assert (w.file_progress['dr1po'], w.game_progress['dr1po']) == _recount(w, 'dr1po')
+    assert w.game_progress['dr1po'] == [3, 4]
@@ -87,7 +87,7 @@ def test_editor_ui_change_text_discard_branches(tmp_path: Path, monkeypatch):
     # Cover the two "discard" branches:
     # - when file_has_changed is True (line ~437)
     # - when file_has_changed is False (line ~445)
-    item0 = w.txt_files.item(0)
+    item0 = w.line_model.index(0)
 
     w.discard = True
     w.file_has_changed = True
@@ -114,7 +114,7 @@ def test_editor_ui_star_title_on_unsaved(tmp_path: Path, monkeypatch):
 
     # Make disk != memory so script_database_changed returns True (line 496)
     w.data['dr1xml'].script_data['TRANSLATED'][str(xml)][0] = "\nDIFF\n"
-    w.change_text(w.txt_files.item(0), None)
+    w.change_text(w.line_model.index(0), editor_ui.QModelIndex())
 
 
 def test_editor_ui_update_script_database_force_line520(tmp_path: Path, monkeypatch):
@@ -131,9 +131,11 @@ def test_editor_ui_update_script_database_force_line520(tmp_path: Path, monkeypa
     w = editor_ui.Ui_MainWindow()
     w.switch_file(str(po), game='dr1po', line_index=0)
 
-    # Force dupes structure so original_line is considered a dupe but only within same file
-    original_line = w.data['dr1po'].script_data['ORIGINAL'][str(po)][0]
-    w.dupes['dr1po'][original_line] = [{'script_name': str(po), 'line_index': 0}]
+    # Force a dupe whose occurrences are all in the same file
+    for lines in w.data['dr1po'].script_data.values():
+        lines[str(po)].append(lines[str(po)][0])
+    w.create_game_dupes('dr1po')
+    assert w.dupes['dr1po'].siblings(str(po), 0) == [(str(po), 0), (str(po), 1)]
     w.data_modified_in_dupes = False
 
     w.translated.setPlainText('X')
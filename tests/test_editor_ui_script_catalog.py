@@ -0,0 +1,113 @@
+from pathlib import Path
+
+
+def _write_po(path: Path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text('msgid ""\nmsgstr ""\n\nmsgctxt "0000"\nmsgid "%s"\nmsgstr ""\n' % text, encoding='utf-8')
+
+
+def test_same_script_name_in_two_games(tmp_path: Path, monkeypatch):
+    dr1 = tmp_path / 'script_data' / 'dr1po' / 'e00_000_000.po'
+    dr2 = tmp_path / 'script_data' / 'dr2po' / 'e00_000_000.po'
+    _write_po(dr1, 'From dr1')
+    _write_po(dr2, 'From dr2')
+    monkeypatch.chdir(tmp_path)
+
+    import editor_ui
+
+    monkeypatch.setattr(editor_ui, 'listdir', lambda p: ['dr1po', 'dr2po'])
+    monkeypatch.setattr(editor_ui, 'expanduser', lambda p: str(tmp_path / 'sdse_data_file.json'))
+    w = editor_ui.Ui_MainWindow(workers=1)
+
+    # picking the script in the dr2po branch of the open dialog opens dr2po's file
+    game = w.tree_model.index(1)
+    assert w.tree_model.data(game) == 'dr2po'
+    script = w.tree_model.index(0, 0, w.tree_model.index(0, 0, game))
+    w.change_file(script)
+    assert (w.current_game, w.script_ppath) == ('dr2po', str(dr2))
+    assert w.original.toPlainText() == 'From dr2'
+
+    # without a game, the name resolves to the current game's script
+    assert w.find_script_path('e00_000_000.po') == str(dr2)
+    assert w.find_script_path('e00_000_000.po', 'dr1po') == str(dr1)
+
+    # the catalog follows reloads
+    dr1.unlink()
+    w.refresh_scripts('dr1po', [str(dr1)])
+    prologue = w.tree_model.index(0, 0, w.tree_model.index(0))
+    assert w.tree_model.rowCount(prologue) == 0
+    w.current_game = 'dr1po'
+    assert w.find_ppath('e00_000_000.po') is True
+    assert w.script_ppath == str(dr2)
+    _write_po(dr1, 'Back')
+    w.refresh_scripts('dr1po', [str(dr1)])
+    assert w.find_script_path('e00_000_000.po') == str(dr1)
+    assert w.tree_model.rowCount(prologue) == 1
+
+
+def test_type_to_filter_in_open_dialog(tmp_path: Path, monkeypatch):
+    for name in ('e04_123_045.po', 'e04_123_046.po', 'e05_000_000.po'):
+        _write_po(tmp_path / 'script_data' / 'dr1po' / name, name)
+    monkeypatch.chdir(tmp_path)
+
+    import editor_ui
+
+    monkeypatch.setattr(editor_ui, 'expanduser', lambda p: str(tmp_path / 'sdse_data_file.json'))
+    w = editor_ui.Ui_MainWindow(workers=1)
+    tree = w.open_ui.treeView
+
+    w.open_ui_launch()
+    assert tree.currentIndex() == w.tree_model.index(0)
+
+    # typing selects the first match, Enter opens it
+    w.open_ui.filter_le.setText('e04_123_046')
+    assert tree.isExpanded('all')
+    assert w.tree_model.script_at(tree.currentIndex()) == ('dr1po', 'e04_123_046.po')
+    w.open_ui.filter_le.returnPressed.emit()
+    assert w.script_ppath == str(tmp_path / 'script_data' / 'dr1po' / 'e04_123_046.po')
+
+    # no match keeps the selection, clearing the filter folds the tree
+    w.open_ui.filter_le.setText('x')
+    assert w.tree_model.rowCount() == 0
+    w.open_ui.filter_le.setText('')
+    assert tree.expanded == []
+    assert w.tree_model.rowCount() == 1
+
+
+def test_search_hit_opens_in_the_game_searched(tmp_path: Path, monkeypatch):
+    dr1 = tmp_path / 'script_data' / 'dr1po' / 'e00_000_000.po'
+    dr2 = tmp_path / 'script_data' / 'dr2po' / 'e01_000_000.po'
+    _write_po(dr1, 'Hello')
+    _write_po(dr2, 'World')
+    monkeypatch.chdir(tmp_path)
+
+    import editor_ui
+
+    monkeypatch.setattr(editor_ui, 'listdir', lambda p: ['dr1po', 'dr2po'])
+    monkeypatch.setattr(editor_ui, 'expanduser', lambda p: str(tmp_path / 'sdse_data_file.json'))
+    w = editor_ui.Ui_MainWindow(workers=1)
+
+    w.switch_file(str(dr1), 'dr1po')
+    w.search_ui.search_le.setText('hello')
+    w.search_in_all_database()
+    w.switch_file(str(dr2), 'dr2po')
+
+    # a hit of an older search in dr1po opens in dr1po
+    w.go_to_script(w.search_model.index(0))
+    assert (w.current_game, w.script_ppath) == ('dr1po', str(dr1))
+    assert str(dr1) not in w.data['dr2po'].script_data['ORIGINAL']
+
+    # a script is never opened or read into another game
+    w.switch_file(str(dr1), 'dr2po')
+    assert (w.current_game, w.script_ppath) == ('dr1po', str(dr1))
+    other = tmp_path / 'elsewhere' / 'e02_000_000.po'
+    _write_po(other, 'Other')
+    w.refresh_scripts('dr2po', [str(dr1), str(other)])
+    assert sorted(w.data['dr2po'].script_data['ORIGINAL']) == [str(dr2)]
+    assert w.game_progress['dr2po'] == [0, 1]
+
+    # a new script of the game folder is still picked up
+    new = tmp_path / 'script_data' / 'dr2po' / 'e02_000_000.po'
+    _write_po(new, 'New')
+    w.refresh_scripts('dr2po', [str(new)])
+    assert w.catalog.games[str(new)] == 'dr2po'
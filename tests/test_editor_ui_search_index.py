@@ -0,0 +1,151 @@
+from pathlib import Path
+
+
+def _write_po(path: Path, entries):
+    lines = ['msgid ""', 'msgstr ""', '']
+    for i, (mid, mstr) in enumerate(entries):
+        lines += [f'msgctxt "{i:04d}"', f'msgid "{mid}"', f'msgstr "{mstr}"', '']
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+
+
+def _results(w):
+    model = w.search_ui.file_list.model()
+    return [model.data(model.index(row)) for row in range(model.rowCount())]
+
+
+def test_search_uses_index_and_sees_edits(tmp_path: Path, monkeypatch):
+    game_dir = tmp_path / 'script_data' / 'dr1po'
+    game_dir.mkdir(parents=True)
+    po1 = game_dir / 'e00_000_000.po'
+    _write_po(po1, [('Hello there', ''), ('Other', ''), ('hello again', 'Rebonjour')])
+    monkeypatch.chdir(tmp_path)
+
+    import editor_ui
+
+    editor_ui.expanduser = lambda p: str(tmp_path / 'sdse_data_file.json')
+    w = editor_ui.Ui_MainWindow()
+    w.switch_file(str(po1), game='dr1po', line_index=0)
+
+    w.search_ui.search_le.setText('HELLO')
+    w.search_in_all_database()
+    assert _results(w) == [str(po1) + '||0', str(po1) + '||2']
+
+    # each hit previews its own line, with the match selected
+    w.show_search_results(1)
+    assert w.search_ui.translated.toPlainText() == 'Rebonjour'
+    assert w.search_ui.original.selection == 'hello'
+    w.show_search_results(0)
+    assert w.search_ui.original.toPlainText() == 'Hello there'
+    assert w.search_ui.original.selection == 'Hello'
+    assert w.search_model.hit_span(0) == (1, 1, 6)
+
+    # a line edited in memory is found without reloading anything
+    w.translated.setPlainText('Salut la compagnie')
+    w.go_next_script()
+    w.search_ui.search_le.setText('compagnie')
+    w.search_in_all_database()
+    assert _results(w) == [str(po1) + '||0']
+
+    w.search_ui.search_le.setText('nowhere to be found')
+    w.search_in_all_database()
+    assert _results(w) == []
+
+    # a character longer once lowercased does not shift the selection
+    w.set_script_line('dr1po', str(po1), 'ORIGINAL', 1, '\nİstanbul et Paris\n')
+    w.search_ui.search_le.setText('PARIS')
+    w.search_in_all_database()
+    w.show_search_results(0)
+    assert w.search_ui.original.selection == 'Paris'
+
+
+def test_search_batches_of_replaced_searches_are_dropped(tmp_path: Path, monkeypatch):
+    game_dir = tmp_path / 'script_data' / 'dr1po'
+    game_dir.mkdir(parents=True)
+    po1 = game_dir / 'e00_000_000.po'
+    _write_po(po1, [('Hello', ''), ('Other', '')])
+    monkeypatch.chdir(tmp_path)
+
+    import editor_ui
+    from search_worker import DatabaseSearchThread
+
+    editor_ui.expanduser = lambda p: str(tmp_path / 'sdse_data_file.json')
+    w = editor_ui.Ui_MainWindow()
+    w.switch_file(str(po1), game='dr1po', line_index=0)
+
+    w.search_ui.search_le.setText('hello')
+    w.search_in_all_database()
+    first = w.search_thread
+    assert w.statusbar.currentMessage() == '1 résultat(s) pour "hello"'
+
+    w.search_ui.search_le.setText('other')
+    w.search_in_all_database()
+    assert first.cancelled and w.search_thread is not first
+
+    # late batches and end of the first search change nothing
+    w.add_search_results(first.generation, [(str(po1), 0)])
+    w.search_finished(first.generation, 1)
+    assert _results(w) == [str(po1) + '||1']
+    assert w.statusbar.currentMessage() == '1 résultat(s) pour "other"'
+    w.show_search_results(-1)
+
+    # a cancelled thread stops before its next batch
+    out = []
+    thread = DatabaseSearchThread(7, w.search_index['dr1po'].snapshot(), 'o')
+    thread.results_found.connect(lambda *a: out.append(a))
+    thread.search_done.connect(lambda *a: out.append(a))
+    thread.cancel()
+    thread.run()
+    assert out == []
+
+    # and a thread cancelled during a scan stops before the next script
+    snapshot = w.search_index['dr1po'].snapshot()
+    pulled = []
+
+    def entries():
+        for i in range(3):
+            pulled.append(i)
+            if i == 1:
+                thread.cancel()
+            yield snapshot[0]
+
+    thread = DatabaseSearchThread(8, entries(), 'o')
+    thread.results_found.connect(lambda *a: out.append(a))
+    thread.search_done.connect(lambda *a: out.append(a))
+    thread.run()
+    assert out == [] and pulled == [0, 1]
+
+
+def test_closing_the_window_stops_the_search(tmp_path: Path, monkeypatch):
+    game_dir = tmp_path / 'script_data' / 'dr1po'
+    game_dir.mkdir(parents=True)
+    po1 = game_dir / 'e00_000_000.po'
+    _write_po(po1, [('Hello', '')])
+    monkeypatch.chdir(tmp_path)
+
+    import editor_ui
+
+    editor_ui.expanduser = lambda p: str(tmp_path / 'sdse_data_file.json')
+    w = editor_ui.Ui_MainWindow()
+    w.switch_file(str(po1), game='dr1po', line_index=0)
+    w.search_ui.search_le.setText('hello')
+    w.search_in_all_database()
+
+    calls = []
+    w.search_thread.cancel = lambda: calls.append('cancel')
+    w.search_thread.wait = lambda: calls.append('wait')
+
+    class Ev:
+        def accept(self):
+            pass
+
+        def ignore(self):
+            pass
+
+    # closing is cancelled: the search goes on
+    w.modification_has_been_made = lambda tag: 2
+    w.closeEvent(Ev())
+    assert calls == []
+
+    w.modification_has_been_made = lambda tag: 3
+    w.closeEvent(Ev())
+    assert calls == ['cancel', 'wait']
@@ -0,0 +1,159 @@
+import subprocess
+from pathlib import Path
+
+
+def _write_po(path: Path, entries):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = ['msgid ""', 'msgstr ""', '']
+    for i, (mid, mstr) in enumerate(entries):
+        lines += [f'msgctxt "{i:04d}"', f'msgid "{mid}"', f'msgstr "{mstr}"', '']
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+
+
+def test_translation_memory_across_games(tmp_path: Path, monkeypatch):
+    data = tmp_path / 'script_data'
+    dr1 = data / 'dr1po' / 'e00_000_000.po'
+    dr2a = data / 'dr2po' / 'e00_000_000.po'
+    dr2b = data / 'dr2po' / 'e01_000_000.po'
+    _write_po(dr1, [('Hello', 'Bonjour'), ('World', '')])
+    _write_po(dr2a, [('Hello', ''), ('World', ''), ('Other', '')])
+    _write_po(dr2b, [('Hello', ''), ('Other', 'Autre')])
+    monkeypatch.chdir(tmp_path)
+
+    import editor_ui
+
+    monkeypatch.setattr(editor_ui, 'listdir', lambda p: ['dr1po', 'dr2po'])
+    monkeypatch.setattr(editor_ui, 'expanduser', lambda p: str(tmp_path / 'sdse_data_file.json'))
+    monkeypatch.setattr(editor_ui, '_git_commit_po', lambda path: None)
+    commits = []
+    monkeypatch.setattr(editor_ui, '_git_commit_pos',
+                        lambda paths, message=None: commits.append((sorted(paths), message)))
+    written = []
+    real_update = editor_ui.update_po_file
+    monkeypatch.setattr(editor_ui, 'update_po_file',
+                        lambda path, **kw: (written.append(path.name), real_update(path, **kw)))
+    w = editor_ui.Ui_MainWindow(workers=1)
+
+    # the dr1 translation is offered on the same line of dr2
+    w.switch_file(str(dr2a), 'dr2po')
+    assert w.tm_suggestion == ('\nBonjour\n', 'dr1po')
+    assert not w.copy_from_tm._disabled
+    assert w.statusbar.currentMessage() == 'Traduction en mémoire (dr1po) : Bonjour'
+    w.copy_from_tm_func()
+    assert w.translated.toPlainText() == 'Bonjour'
+
+    # nothing to offer for a line translated nowhere
+    w.txt_files.setCurrentIndex(w.line_model.index(1))
+    assert w.tm_suggestion is None and w.copy_from_tm._disabled
+    w.copy_from_tm_func()
+    assert w.translated.toPlainText() == ''
+
+    # translating a line in the editor feeds the memory once it is saved
+    w.translated.setPlainText('Monde')
+    w.txt_files.setCurrentIndex(w.line_model.index(2))
+    assert w.tm.lookup('\nWorld\n') is None
+
+    # the dupes of dr2po already got 'Bonjour'
+    assert w.data['dr2po'].script_data['TRANSLATED'][str(dr2b)][0] == '\nBonjour\n'
+
+    w.save()
+    assert w.tm.lookup('\nWorld\n') == ('\nMonde\n', 'dr2po')
+    # a translation taken from the memory keeps its game
+    assert w.tm.lookup('\nHello\n') == ('\nBonjour\n', 'dr1po')
+
+    # one batch over all the games, one write per file
+    written.clear()
+    w.pretranslate_from_tm()
+    assert sorted(written) == ['e00_000_000.po', 'e00_000_000.po']
+    # and one git commit for the batch
+    assert commits == [(sorted([str(dr1), str(dr2a)]), 'Pretranslated 2 files')]
+    assert w.data['dr1po'].script_data['TRANSLATED'][str(dr1)][1] == '\nMonde\n'
+    assert w.data['dr2po'].script_data['TRANSLATED'][str(dr2a)][2] == '\nAutre\n'
+    assert w.statusbar.currentMessage() == '2 ligne(s) prétraduite(s) dans 2 fichier(s)'
+    assert w.game_progress['dr2po'][0] == 5
+    assert w.modified.dirty_files() == []
+    # the current line shows what was filled in
+    assert w.translated.toPlainText() == 'Autre'
+    assert 'msgstr "Autre"' in dr2a.read_text(encoding='utf-8')
+
+    # the pending edits are checked first
+    w.check_files_modifications = lambda: False
+    written.clear()
+    w.pretranslate_from_tm()
+    assert written == []
+
+
+def test_discarded_edits_are_not_learned(tmp_path: Path, monkeypatch):
+    po = tmp_path / 'script_data' / 'dr1po' / 'e00_000_000.po'
+    _write_po(po, [('Hello', ''), ('World', '')])
+    monkeypatch.chdir(tmp_path)
+
+    import editor_ui
+
+    monkeypatch.setattr(editor_ui, 'expanduser', lambda p: str(tmp_path / 'sdse_data_file.json'))
+    w = editor_ui.Ui_MainWindow(workers=1)
+
+    w.switch_file(str(po), 'dr1po')
+    w.translated.setPlainText('Salut')
+    w.txt_files.setCurrentIndex(w.line_model.index(1))
+    # the stub answers Discard
+    w.reload_ui()
+    assert w.data['dr1po'].script_data['TRANSLATED'][str(po)][0] == '\n\n'
+    assert w.tm.lookup('\nHello\n') is None
+    assert w.fuzzy.lines == []
+
+
+def test_pretranslate_does_not_write_discarded_edits(tmp_path: Path, monkeypatch):
+    data = tmp_path / 'script_data'
+    dr1 = data / 'dr1po' / 'e00_000_000.po'
+    dr2 = data / 'dr2po' / 'e00_000_000.po'
+    _write_po(dr1, [('World', 'Monde')])
+    _write_po(dr2, [('Hello', ''), ('Other', ''), ('World', '')])
+    monkeypatch.chdir(tmp_path)
+
+    import editor_ui
+
+    monkeypatch.setattr(editor_ui, 'listdir', lambda p: ['dr1po', 'dr2po'])
+    monkeypatch.setattr(editor_ui, 'expanduser', lambda p: str(tmp_path / 'sdse_data_file.json'))
+    monkeypatch.setattr(editor_ui, '_git_commit_po', lambda path: None)
+    w = editor_ui.Ui_MainWindow(workers=1)
+
+    # an edit stored in memory, then discarded when asked (the stub answers Discard)
+    w.switch_file(str(dr2), 'dr2po')
+    w.translated.setPlainText('Salut')
+    w.txt_files.setCurrentIndex(w.line_model.index(1))
+    w.pretranslate_from_tm()
+
+    text = dr2.read_text(encoding='utf-8')
+    assert 'Salut' not in text and 'msgstr "Monde"' in text
+    assert w.data['dr2po'].script_data['TRANSLATED'][str(dr2)] == ['\n\n', '\n\n', '\nMonde\n']
+    assert w.modified.dirty_files() == []
+
+
+def _git(cwd, *args):
+    return subprocess.run(['git', *args], cwd=cwd, capture_output=True, text=True, check=True).stdout
+
+
+def test_git_commit_pos_commits_once_per_repo(tmp_path: Path):
+    import editor_ui
+
+    repo = tmp_path / 'repo'
+    files = [repo / 'dr1po' / 'a.po', repo / 'dr1po' / 'b.po', repo / 'dr2po' / 'c.po']
+    for f in files:
+        _write_po(f, [('Hello', 'Bonjour')])
+    _git(repo, 'init', '-q')
+    _git(repo, 'config', 'user.email', 'sdse@example.com')
+    _git(repo, 'config', 'user.name', 'sdse')
+    outside = tmp_path / 'outside' / 'd.po'
+    _write_po(outside, [('Hello', '')])
+
+    editor_ui._git_commit_pos([str(f) for f in files] + [str(outside)], 'Pretranslated 3 files').join()
+    assert _git(repo, 'log', '--format=%s').splitlines() == ['Pretranslated 3 files']
+    assert _git(repo, 'ls-files').split() == ['dr1po/a.po', 'dr1po/b.po', 'dr2po/c.po']
+
+    _write_po(files[0], [('Hello', 'Salut')])
+    editor_ui._git_commit_po(str(files[0])).join()
+    assert _git(repo, 'log', '-1', '--format=%s').strip() == 'Updated dr1po/a.po'
+
+    # errors never reach the UI
+    editor_ui._git_commit_pos([str(tmp_path / 'missing' / 'e.po')]).join()
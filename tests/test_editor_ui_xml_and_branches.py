@@ -85,7 +85,7 @@ def test_editor_ui_misc_branches(tmp_path: Path, monkeypatch, capsys):
     w.switch_file(str(po1), game='dr1po', line_index=0)
     w.data['dr1po'].script_data['SPEAKER'][str(po1)] = ['NO NAME']
     w.data['dr1po'].script_data['JAPANESE'][str(po1)] = []
-    w.change_text(None, None)
+    w.change_text(editor_ui.QModelIndex(), editor_ui.QModelIndex())
 
     # script_database_changed for PO tag variants
     for tag in ('SPEAKER', 'JAPANESE', 'COMMENT', 'ORIGINAL', 'TRANSLATED'):
@@ -108,8 +108,8 @@ def test_editor_ui_misc_branches(tmp_path: Path, monkeypatch, capsys):
     w.save_file(str(xml1), 'TRANSLATED')
     w.script_database_changed('TRANSLATED')
 
-    # modification_has_been_made: currentItem None
-    w.txt_files.clear()
+    # modification_has_been_made: no current line
+    w.line_model.set_count(0)
     assert w.modification_has_been_made('TRANSLATED') == 0
 
     # search_in_all_database early return
@@ -152,48 +152,42 @@ def test_editor_ui_change_file_and_closeEvent_branches(tmp_path: Path, monkeypat
     editor_ui.expanduser = lambda p: str(root / 'sdse_data_file.json')
     w = editor_ui.Ui_MainWindow()
 
-    # change_file: else branch expand/collapse
-    item = editor_ui.QTreeWidgetItem()
-    item.setText(0, w.parts[0])
-    w.change_file(item, 0)
-    item._expanded = True
-    w.change_file(item, 0)
+    # change_file: invalid index, then expand/collapse of a game node
+    w.change_file(editor_ui.QModelIndex())
+    game = w.tree_model.index(0)
+    w.change_file(game)
+    assert w.open_ui.treeView.isExpanded(game)
+    w.change_file(game)
+    assert not w.open_ui.treeView.isExpanded(game)
 
     # change_file: script branch + early returns
-    game = editor_ui.QTreeWidgetItem()
-    game.setText(0, 'dr1po')
-    part = editor_ui.QTreeWidgetItem(game)
-    part.setText(0, w.parts[0])
-    script = editor_ui.QTreeWidgetItem(part)
-    script.setText(0, 'missing')
+    part = w.tree_model.index(0, 0, game)
+    script = w.tree_model.index(0, 0, part)
 
     w.current_game = 'dr1po'
     w.check_files_modifications = lambda: False
-    w.change_file(script, 0)  # returns at check_files_modifications
+    w.change_file(script)  # returns at check_files_modifications
 
     w.check_files_modifications = lambda: True
     w.find_ppath = lambda *_: False
-    w.change_file(script, 0)
+    w.change_file(script)
 
     w.find_ppath = lambda *_: True
     w.script_ppath = str(po1)
     w.switch_file = lambda *_a, **_kw: None
-    w.change_file(script, 0)
+    w.change_file(script)
 
     # restore real switch_file for later closeEvent/save paths
     w.switch_file = editor_ui.Ui_MainWindow.switch_file.__get__(w)
 
     # go_to_script early returns
-    w.search_sepatator = '||'
-    class It:
-        def text(self):
-            return 'x||0'
+    w.search_model.add_hits([('x', 0, 0, 1, 2)])
     w.current_game = 'dr1po'
     w.check_files_modifications = lambda: False
-    w.go_to_script(It())
+    w.go_to_script(w.search_model.index(0))
     w.check_files_modifications = lambda: True
     w.find_ppath = lambda *_: False
-    w.go_to_script(It())
+    w.go_to_script(w.search_model.index(0))
 
     # closeEvent branches
     class Ev:
@@ -241,3 +235,27 @@ def test_editor_ui_run_as_main(tmp_path: Path, monkeypatch):
     # Running as __main__ should execute the guard at the bottom of editor_ui.py.
     with pytest.raises(SystemExit):
         runpy.run_path(str(Path(__file__).parent.parent / 'editor_ui.py'), run_name='__main__')
+
+
+def test_editor_ui_save_file_xml_rewrites_changed_elements_only(tmp_path: Path, monkeypatch):
+    root = tmp_path
+    (root / 'script_data' / 'dr1xml').mkdir(parents=True)
+    xml = root / 'script_data' / 'dr1xml' / 'e00_000_000.xml'
+    _write_xml(xml, original='Hello', translated='Bonjour', comment='note')
+
+    monkeypatch.chdir(root)
+
+    import editor_ui
+
+    editor_ui.expanduser = lambda p: str(root / 'sdse_data_file.json')
+    w = editor_ui.Ui_MainWindow()
+    w.switch_file(str(xml), game='dr1xml', line_index=0)
+
+    w.set_script_line('dr1xml', str(xml), 'TRANSLATED', 0, '\nSalut\n')
+    w.save_file(str(xml), 'TRANSLATED')
+    assert xml.read_bytes().decode('utf-16-le') == (
+        "<ORIGINAL N°001>\nHello\n</ORIGINAL N°001>\n"
+        "<TRANSLATED N°001>\nSalut\n</TRANSLATED N°001>\n"
+        "<COMMENT N°001>\nnote\n</COMMENT N°001>\n"
+    )
+    assert not w.modified.is_dirty(str(xml), 'TRANSLATED')
@@ -0,0 +1,37 @@
+from fuzzy_index import FuzzyIndex, trigrams
+
+
+def test_trigrams_are_padded():
+    assert trigrams('ok') == {' ok', 'ok '}
+    assert trigrams('') == set()
+
+
+def test_search_scores_and_order():
+    index = FuzzyIndex(['\nThe door is open.\n', '\nThe door is closed.\n',
+                        '\nSomething else entirely\n', '\nThe door is open.\n'])
+    assert len(index) == 3
+
+    matches = index.search('\nThe <CLT 03>door<CLT> is  OPEN!\n')
+    assert [line for _, line in matches][:2] == ['\nThe door is open.\n', '\nThe door is closed.\n']
+    assert matches[0][0] > 0.8 > matches[1][0] > 0.5
+    assert all(0 <= score <= 1 for score, _ in matches)
+
+    # the line itself is not its own match, and weak matches can be dropped
+    assert [line for _, line in index.search('\nThe door is open.\n', min_score=0.5)] == \
+        ['\nThe door is closed.\n']
+    assert index.search('\nzzz\n') == []
+
+
+def test_incremental_add_and_budget():
+    index = FuzzyIndex()
+    index.add('\nHello world\n')
+    index.add('\nHello world\n')
+    index.add_lines(['\nHello there\n', '\nGoodbye world\n'])
+    assert index.lines == ['\nHello world\n', '\nHello there\n', '\nGoodbye world\n']
+
+    assert index.search('\nHello world!\n', count=1)[0][1] == '\nHello world\n'
+    # with a tiny budget, only the lines with the rarest trigram are scored
+    assert [line for _, line in index.search('\nGoodbye world!\n', min_score=0.1)] == \
+        ['\nGoodbye world\n', '\nHello world\n']
+    assert [line for _, line in index.search('\nGoodbye world!\n', budget=1, min_score=0.1)] == \
+        ['\nGoodbye world\n']
@@ -0,0 +1,48 @@
+from PyQt5.QtCore import QModelIndex
+
+from list_models import LineIndexModel, SearchResultsModel
+
+
+def test_line_index_model():
+    model = LineIndexModel()
+    resets = []
+    model.modelReset.connect(lambda: resets.append(1))
+    model.set_count(3)
+
+    assert resets == [1]
+    assert model.rowCount() == 3
+    assert [model.data(model.index(row)) for row in range(3)] == ['0', '1', '2']
+    assert model.data(model.index(1), role=1) is None
+    assert model.data(QModelIndex()) is None
+    assert model.rowCount(model.index(0)) == 0
+
+
+def test_search_results_model_appends_and_clears():
+    model = SearchResultsModel('||')
+    inserted = []
+    model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+
+    model.add_hits([('/g/a.po', 3, 0, 1, 4), ('/g/a.po', 9, 2, 5, 6)])
+    model.add_hits([])
+    model.add_hits([('/g/b.po', 0, 1, 1, 2)])
+    assert inserted == [(0, 1), (2, 2)]
+    assert [model.data(model.index(row)) for row in range(model.rowCount())] == \
+        ['/g/a.po||3', '/g/a.po||9', '/g/b.po||0']
+    assert model.hit(1) == ('/g/a.po', 9)
+    assert model.hit_span(1) == (2, 5, 6)
+    # scripts are stored once, hits are two integers
+    assert model.scripts == ['/g/a.po', '/g/b.po']
+    assert list(model.file_ids) == [0, 0, 1]
+    assert model.data(model.index(0), role=1) is None
+    assert model.rowCount(model.index(0)) == 0
+
+    model.clear()
+    assert model.rowCount() == 0 and model.scripts == []
+
+
+def test_models_keep_the_qt_virtual_methods():
+    # Qt calls match(start, role, value, hits, flags) for the keyboard
+    # search of the views: a method of that name would replace it
+    for model in (LineIndexModel, SearchResultsModel):
+        for name in ('match', 'sibling', 'flags', 'roleNames'):
+            assert name not in vars(model)
@@ -0,0 +1,89 @@
+import random
+
+from markup import MAX_ROW_LENGTH, Markup, markup
+from save import length_is_okay as save_length_is_okay
+from script_analyser import cleaned_text, find_to_remove, length_is_okay
+
+
+def _legacy_count_rem(w_line, i):
+    if w_line.find('>') != -1:
+        count = 1
+    else:
+        count = 0
+    while i < len(w_line) and w_line[i] != '>':
+        count += 1
+        i += 1
+    return count, i + 1
+
+
+def _legacy_find_to_remove(w_line):
+    # Reference: the character loops script_analyser used before markup.
+    i = 0
+    to_rem = 0
+    while i < len(w_line):
+        while i < len(w_line) and w_line[i] == '<':
+            rem, i = _legacy_count_rem(w_line, i)
+            to_rem += rem
+        i += 1
+    return to_rem
+
+
+def _legacy_cleaned_text(w_line):
+    i = 0
+    new_line = list()
+    while i < len(w_line):
+        while i < len(w_line) and w_line[i] == '<':
+            var, i = _legacy_count_rem(w_line, i)
+        if i < len(w_line) and w_line[i] != '<':
+            new_line.append(w_line[i])
+        i += 1
+    return ''.join(new_line)
+
+
+PIECES = ['Bonjour', ' ', '\n', '\r', 'é', '<CLT 03>', '<CLT>', '<', '>', 'x' * 30]
+
+
+def _random_lines(seed, count=3000):
+    rnd = random.Random(seed)
+    for _ in range(count):
+        yield ''.join(rnd.choice(PIECES) for _ in range(rnd.randint(0, 10)))
+
+
+def test_text_matches_legacy_loops_on_random_lines():
+    for line in _random_lines(25):
+        assert cleaned_text(line) == _legacy_cleaned_text(line)
+        if '<' not in line[line.rfind('>') + 1:] or '>' not in line:
+            # the legacy loop counted one more for a tag not closed
+            assert find_to_remove(line) == _legacy_find_to_remove(line)
+
+
+def test_visible_column():
+    line = '<CLT 03>Bon<CLT>jour'
+    m = Markup(line)
+    assert m.tags == [(0, 8), (11, 16)]
+    assert [m.visible_column(column) for column in (0, 4, 8, 10, 11, 13, 16, 20)] == [0, 0, 0, 2, 3, 3, 3, 7]
+    for line in _random_lines(26, 300):
+        m = markup(line)
+        for column in range(len(line) + 1):
+            assert m.visible_column(column) == len(cleaned_text(line[:column]))
+
+
+def test_row_lengths_and_length_checks():
+    m = markup('<CLT 03>abc<CLT>\r\n\n' + 'x' * 70)
+    assert m.text == 'abc\r\n\n' + 'x' * 70
+    assert m.row_lengths() == [3, 0, 70]
+    assert m.hidden() == 13
+    assert markup('').row_lengths() == [0]
+
+    assert length_is_okay('<CLT 03>' + 'x' * MAX_ROW_LENGTH + '<CLT>') is True
+    assert length_is_okay('short\n' + 'x' * (MAX_ROW_LENGTH + 1)) is False
+    # the save check only looks at the first row
+    assert save_length_is_okay('short\n' + 'x' * (MAX_ROW_LENGTH + 1)) is True
+    assert save_length_is_okay('<CLT 99>' + 'x' * MAX_ROW_LENGTH) is True
+
+
+def test_markup_is_memoized_per_line():
+    line = 'memo <CLT 01>test'
+    assert markup(line) is markup(''.join(['memo <CLT 01>', 'test']))
+    plain = Markup('no markup')
+    assert plain.text is plain.line and plain.tags == []
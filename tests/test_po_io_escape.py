@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from po_io import _quote_po_string, _unquote_po_string
+
+
+def _legacy_unquote(body: str) -> str:
+    # Reference: the per-character decoder po_io used before.
+    out = []
+    i = 0
+    while i < len(body):
+        c = body[i]
+        if c != "\\":
+            out.append(c)
+            i += 1
+        elif i + 1 >= len(body):
+            out.append("\\")
+            i += 1
+        else:
+            out.append({"n": "\n", "t": "\t", "r": "\r"}.get(body[i + 1], body[i + 1]))
+            i += 2
+    return "".join(out)
+
+
+def test_unquote_matches_legacy_decoder_on_random_bodies():
+    rnd = random.Random(0)
+    alphabet = ["a", "é", "\\", '"', "n", "t", "r", "q", "\n", " ", "<", ">"]
+    for _ in range(5000):
+        body = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 16)))
+        assert _unquote_po_string('"' + body + '"') == _legacy_unquote(body)
+
+
+def test_unquote_fast_path_and_known_escapes():
+    assert _unquote_po_string('  "no escapes here"  ') == "no escapes here"
+    assert _unquote_po_string(r'"a\nb\tc\rd\"e\\f\qg\"') == 'a\nb\tc\rd"e\\fqg\\'
+
+
+def test_quote_unquote_roundtrip():
+    s = 'Il a dit "non"\n\tpuis \\ rien\r'
+    assert _unquote_po_string(_quote_po_string(s)) == s
+
+
+def test_unquote_rejects_unquoted():
+    with pytest.raises(ValueError):
+        _unquote_po_string("abc")
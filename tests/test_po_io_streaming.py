@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import pytest
+
+from po_io import PoEntry, iter_po, read_po, write_po
+
+
+def test_iter_po_yields_before_end_of_file(tmp_path: Path):
+    p = tmp_path / "s.po"
+    write_po(p, [PoEntry(msgctxt="0001", msgid="A", msgstr="a"), PoEntry(msgctxt="0002", msgid="B", msgstr="")])
+
+    # Corrupt the tail: the first entry must still come out before the error.
+    with p.open("a", encoding="utf-8") as f:
+        f.write("\nmsgstr \"orphan\"\n")
+
+    it = iter_po(p)
+    first = next(it)
+    assert first.msgid == "A"
+    assert first.msgstr == "a"
+    assert next(it).msgid == "B"
+    with pytest.raises(ValueError):
+        next(it)
+
+
+def test_read_po_matches_iter_po_on_large_catalog(tmp_path: Path):
+    p = tmp_path / "big.po"
+    entries = [
+        PoEntry(msgctxt=f"{i:04d} | X", msgid=f"line {i}\nnext", msgstr=f"ligne {i}", translator_comments=[f"c{i}"])
+        for i in range(5000)
+    ]
+    write_po(p, entries)
+
+    got = read_po(p)
+    assert got == list(iter_po(p))
+    assert got == entries
+
+
+def test_iter_po_header_only_and_crlf(tmp_path: Path):
+    p = tmp_path / "h.po"
+    p.write_bytes(b'msgid ""\r\nmsgstr ""\r\n')
+    assert read_po(p) == []
+
+    p.write_bytes(b'msgid ""\r\nmsgstr ""\r\n\r\n\r\nmsgid "a"\r\n"b"\r\nmsgstr "c"')
+    assert [(e.msgid, e.msgstr) for e in read_po(p)] == [("ab", "c")]
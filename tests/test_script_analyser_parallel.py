@@ -0,0 +1,108 @@
+import pickle
+from pathlib import Path
+
+import pytest
+
+import corpus_snapshot
+import script_analyser
+from script_analyser import XmlAnalyser, iter_parse_script_jobs, parse_script_job
+
+
+def _write_po(path: Path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        'msgid ""\nmsgstr ""\n\n'
+        '#. JP\nmsgctxt "0001 | MAKOTO"\nmsgid "%s"\nmsgstr "T %s"\n' % (text, text),
+        encoding="utf-8",
+    )
+
+
+def _games(tmp_path: Path, count=6):
+    roots = []
+    for game in ("dr1", "dr2"):
+        root = tmp_path / game
+        for i in range(count):
+            _write_po(root / ("e%02d.po" % i), "%s line %d" % (game, i))
+        roots.append(root)
+    return roots
+
+
+def test_parallel_parse_matches_serial(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(script_analyser, "PARALLEL_MIN_FILES", 2)
+    root = _games(tmp_path)[0]
+
+    serial = XmlAnalyser(str(root))
+    files = list(serial.script_files())
+    expected = serial.parse_scripts(files)
+
+    parallel = XmlAnalyser(str(root)).parse_scripts(files, workers=2)
+    assert list(parallel) == list(expected)
+    assert parallel == expected
+
+    jobs = [(f, "po", ("ORIGINAL",)) for f in files]
+    assert [r[1] for r in iter_parse_script_jobs(jobs, workers=2)] == \
+        [{"ORIGINAL": expected[f][1]["ORIGINAL"]} for f in files]
+
+
+def test_iter_load_games_keeps_game_order(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(script_analyser, "PARALLEL_MIN_FILES", 2)
+    roots = _games(tmp_path)
+
+    analysers = [XmlAnalyser(str(root)) for root in roots]
+    loaded = list(corpus_snapshot.iter_load_games(analysers, workers=3))
+    assert [a for a, _ in loaded] == analysers
+    assert [counts for _, counts in loaded] == [(0, 6), (0, 6)]
+    for root, analyser in zip(roots, analysers):
+        assert analyser.script_data["TRANSLATED"][str(root / "e03.po")] == ["\nT %s line 3\n" % root.name]
+
+    again = [XmlAnalyser(str(root)) for root in roots]
+    assert [counts for _, counts in corpus_snapshot.iter_load_games(again, workers=3)] == [(6, 0), (6, 0)]
+    assert [a.script_data for a in again] == [a.script_data for a in analysers]
+
+
+@pytest.mark.parametrize("fail_on", ["init", "map"])
+def test_parse_falls_back_to_serial_without_process_pool(tmp_path: Path, monkeypatch, fail_on):
+    monkeypatch.setattr(script_analyser, "PARALLEL_MIN_FILES", 2)
+    shutdowns = []
+
+    class BrokenPool:
+        def __init__(self, max_workers, mp_context=None):
+            if fail_on == "init":
+                raise NotImplementedError()
+
+        def map(self, *args, **kwargs):
+            raise OSError()
+
+        def shutdown(self, cancel_futures=False):
+            shutdowns.append(cancel_futures)
+
+    monkeypatch.setattr(script_analyser, "ProcessPoolExecutor", BrokenPool)
+    root = _games(tmp_path, 3)[0]
+    jobs = [(str(root / ("e%02d.po" % i)), "po", ("ORIGINAL",)) for i in range(3)]
+    jobs.append((str(root / "missing.po"), "po", ("ORIGINAL",)))
+
+    results = list(iter_parse_script_jobs(jobs, workers=4))
+    assert [r[1]["ORIGINAL"] for r in results[:3]] == [["\ndr1 line %d\n" % i] for i in range(3)]
+    assert results[3] is None
+    assert shutdowns == ([] if fail_on == "init" else [True])
+
+
+def test_parse_workers_are_spawned(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(script_analyser, "PARALLEL_MIN_FILES", 2)
+    contexts = []
+    real_pool = script_analyser.ProcessPoolExecutor
+
+    def pool(max_workers, mp_context=None):
+        contexts.append(mp_context.get_start_method())
+        return real_pool(max_workers, mp_context=mp_context)
+
+    monkeypatch.setattr(script_analyser, "ProcessPoolExecutor", pool)
+    root = _games(tmp_path, 2)[0]
+    jobs = [(str(root / ("e%02d.po" % i)), "po", ("ORIGINAL",)) for i in range(2)]
+    # what a spawned worker receives
+    assert pickle.loads(pickle.dumps(parse_script_job)) is parse_script_job
+    assert pickle.loads(pickle.dumps(jobs)) == jobs
+
+    results = list(iter_parse_script_jobs(jobs, workers=2))
+    assert contexts == ["spawn"]
+    assert [r[1]["ORIGINAL"] for r in results] == [["\ndr1 line %d\n" % i] for i in range(2)]
@@ -0,0 +1,81 @@
+from pathlib import Path
+
+import po_io
+import script_analyser
+from script_analyser import TAG_NAMES, XmlAnalyser
+
+
+def _write_po(path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        "\n".join(
+            [
+                'msgid ""',
+                'msgstr ""',
+                '',
+                '#. JP1',
+                '# note1',
+                'msgctxt "0001 | MAKOTO"',
+                'msgid "Hello"',
+                'msgstr "Bonjour"',
+                '',
+            ]
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+
+
+def _write_xml(path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(
+        (
+            "<ORIGINAL N°001>\nHello\n</ORIGINAL N°001>\n"
+            "<TRANSLATED N°001>\nBonjour\n</TRANSLATED N°001>\n"
+            "<COMMENT N°001>\nnote\n</COMMENT N°001>\n"
+        ).encode("utf-16-le")
+    )
+
+
+def test_analyse_all_scripts_po_parses_each_file_once(tmp_path: Path, monkeypatch):
+    root = tmp_path / "dr1"
+    _write_po(root / "a.po")
+    _write_po(root / "sub" / "b.po")
+
+    calls = []
+    real_read_po = po_io.read_po
+    monkeypatch.setattr(po_io, "read_po", lambda p: calls.append(p) or real_read_po(p))
+
+    a = XmlAnalyser(str(root))
+    a.analyse_all_scripts()
+
+    assert len(calls) == 2
+    for tag in TAG_NAMES:
+        assert len(a.script_data[tag]) == 2
+
+    po = str(root / "a.po")
+    assert a.script_data["TRANSLATED"][po] == ["\nBonjour\n"]
+    assert a.script_data["ORIGINAL"][po] == ["\nHello\n"]
+    assert a.script_data["COMMENT"][po] == ["\nnote1\n"]
+    assert a.script_data["JAPANESE"][po] == ["\nJP1\n"]
+    assert a.script_data["SPEAKER"][po] == ["MAKOTO"]
+
+
+def test_analyse_all_scripts_xml_matches_per_tag_loading(tmp_path: Path, monkeypatch):
+    root = tmp_path / "dr1"
+    _write_xml(root / "e00_000_000.xml")
+    _write_xml(root / "e00_000_001.xml")
+
+    per_tag = XmlAnalyser(str(root))
+    for tag in TAG_NAMES:
+        per_tag.analyse_scripts(tag)
+
+    calls = []
+    real_open_file = script_analyser.open_file
+    monkeypatch.setattr(script_analyser, "open_file", lambda f: calls.append(f) or real_open_file(f))
+
+    single = XmlAnalyser(str(root))
+    single.analyse_all_scripts()
+
+    assert len(calls) == 2
+    assert single.script_data == per_tag.script_data
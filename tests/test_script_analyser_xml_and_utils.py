@@ -53,3 +53,51 @@ def test_xmlanalyser_xml_mode(tmp_path: Path):
     # open_file should decode it
     decoded = open_file(str(xml))
     assert "Hello" in decoded
+
+
+def test_xmlanalyser_keeps_the_saved_xml_script(tmp_path: Path):
+    root = tmp_path / "script_data" / "dr1"
+    root.mkdir(parents=True)
+    xml = root / "e00_000_000.xml"
+    xml.write_bytes((
+        "<ORIGINAL N°001>\nHello\n</ORIGINAL N°001>\n"
+        "<TRANSLATED N°001>\nBonjour\n</TRANSLATED N°001>\n"
+    ).encode("utf-16-le"))
+
+    a = XmlAnalyser(str(root))
+    a.analyse_all_scripts(("ORIGINAL", "TRANSLATED"))
+    script = a.xml_script(str(xml))
+    assert script.lines("TRANSLATED") == ["\nBonjour\n"]
+    assert a.xml_script(str(xml)) is script
+
+    a.save_xml_lines(str(xml), "TRANSLATED", ["\nSalut\n"])
+    assert xml.read_bytes().decode("utf-16-le").count("\nSalut\n") == 1
+    saved = a.xml_script(str(xml))
+    assert saved is not script and saved.lines("TRANSLATED") == ["\nSalut\n"]
+    assert not a.is_stale(str(xml))
+
+    # changed by someone else: read again
+    xml.write_bytes(xml.read_bytes().replace("Salut".encode("utf-16-le"), "Coucou!".encode("utf-16-le")))
+    assert a.xml_script(str(xml)).lines("TRANSLATED") == ["\nCoucou!\n"]
+
+    a.reload_script(str(xml))
+    assert str(xml) not in a.xml_scripts
+
+
+def test_xmlanalyser_writes_xml_scripts_back_in_their_encoding(tmp_path: Path):
+    root = tmp_path / "script_data" / "dr1"
+    root.mkdir(parents=True)
+    xml = root / "e00_000_000.xml"
+    xml.write_bytes(
+        "\ufeff<ORIGINAL N°001>\nHello\n</ORIGINAL N°001>\n"
+        "<TRANSLATED N°001>\nBonjour\n</TRANSLATED N°001>\n".encode("utf-8"))
+
+    a = XmlAnalyser(str(root))
+    a.analyse_all_scripts(("ORIGINAL", "TRANSLATED"))
+    assert a.script_data["TRANSLATED"][str(xml)] == ["\nBonjour\n"]
+
+    a.save_xml_lines(str(xml), "TRANSLATED", ["\nSalut, ça va ?\n"])
+    assert xml.read_bytes().decode("utf-8") == (
+        "\ufeff<ORIGINAL N°001>\nHello\n</ORIGINAL N°001>\n"
+        "<TRANSLATED N°001>\nSalut, ça va ?\n</TRANSLATED N°001>\n")
+    assert open_file(str(xml)).startswith("\ufeff<ORIGINAL")
@@ -0,0 +1,79 @@
+import random
+
+from script_analyser import TAG_NAMES, get_file_script, parse_script_file
+from xml_script import script_lines
+
+
+def _legacy_get_file_script(buf, tag_name='TRANSLATED'):
+    # Reference: the find loop get_file_script used before script_lines.
+    translated_s = '<' + tag_name + ' N°'
+    end_translated_s = '</' + tag_name
+
+    begin_trad_offset = len(translated_s) + 4
+    begin_trad = buf.find(translated_s) + begin_trad_offset
+    end_trad = buf.find(end_translated_s)
+
+    xml_script_data = list()
+    while begin_trad != -1 and end_trad != -1:
+        xml_script_data.append(buf[begin_trad:end_trad])
+        if buf.find(translated_s, end_trad) + begin_trad_offset < begin_trad:
+            break
+        begin_trad = buf.find(translated_s, end_trad) + begin_trad_offset
+        end_trad = buf.find(end_translated_s, begin_trad)
+    return xml_script_data
+
+
+PIECES = ['Bonjour', ' ', '\n', 'é', 'à', '<CLT 03>', '<CLT>', '<', '>', '/', 'N°', '001',
+          '…', '\r\n', '\t', 'ORIGINAL', 'TRANSLATED']
+
+
+def _random_text(rnd):
+    # element markup in a text would break the file for DRAT too
+    text = ''.join(rnd.choice(PIECES) for _ in range(rnd.randint(0, 12)))
+    text = text.replace('</', '< /').replace(' N°', ' n°')
+    return '\n' + text + '\n'
+
+
+def _random_script(rnd, max_lines=999):
+    # DRAT layout: one element per tag and line, some tags missing from a
+    # script, text around and between the elements
+    tags = [tag for tag in TAG_NAMES if rnd.random() < 0.8]
+    rnd.shuffle(tags)
+    parts = [rnd.choice(['', '﻿', '<?xml version="1.0"?>\n'])]
+    for i in range(1, rnd.randint(0, 30) % max_lines + 1):
+        for tag in tags:
+            parts.append('<%s N°%03d>%s</%s N°%03d>%s'
+                         % (tag, i, rnd.choice(['', _random_text(rnd)]), tag, i, rnd.choice(['\n', '', '\r\n'])))
+    return ''.join(parts)
+
+
+def test_script_lines_matches_legacy_scanner_on_random_scripts():
+    rnd = random.Random(23)
+    for _ in range(2000):
+        buf = _random_script(rnd)
+        tables = script_lines(buf, TAG_NAMES)
+        for tag in TAG_NAMES:
+            assert tables[tag] == _legacy_get_file_script(buf, tag)
+            assert get_file_script(buf, tag) == tables[tag]
+
+
+def test_script_lines_ignores_other_tags():
+    buf = '<ORIGINAL N°001>\nA\n</ORIGINAL N°001>\n<OTHER N°001>\nB\n</OTHER N°001>\n'
+    assert script_lines(buf, ('ORIGINAL', 'COMMENT')) == {'ORIGINAL': ['\nA\n'], 'COMMENT': []}
+    assert get_file_script('', 'TRANSLATED') == []
+
+
+def test_four_digit_keys_no_longer_leak_the_bracket():
+    buf = ''.join('<TRANSLATED N°%03d>\nL%d\n</TRANSLATED N°%03d>\n' % (i, i, i) for i in (999, 1000))
+    assert _legacy_get_file_script(buf) == ['\nL999\n', '>\nL1000\n']
+    assert get_file_script(buf) == ['\nL999\n', '\nL1000\n']
+
+
+def test_parse_script_file_reads_all_tags(tmp_path):
+    rnd = random.Random(5)
+    buf = _random_script(rnd)
+    xml = tmp_path / 'e00_000_000.xml'
+    xml.write_bytes(buf.encode('utf-16-le'))
+    tables = parse_script_file(str(xml))
+    assert tables == {tag: _legacy_get_file_script(xml.read_bytes().decode('utf-16-le'), tag)
+                      for tag in TAG_NAMES}
@@ -0,0 +1,30 @@
+from script_catalog import ScriptCatalog
+
+
+def test_resolve_by_name_path_and_game():
+    catalog = ScriptCatalog()
+    catalog.add_game('dr1po', ['/s/dr1po/e00_000_000.po', '/s/dr1po/e01_000_001.po'])
+    catalog.add_game('dr2po', ['/s/dr2po/e00_000_000.po'])
+    catalog.add_script('dr2po', '/s/dr2po/e00_000_000.po')
+
+    assert catalog.resolve('e01_000_001.po') == ('dr1po', '/s/dr1po/e01_000_001.po')
+    assert catalog.resolve('/s/dr2po/e00_000_000.po') == ('dr2po', '/s/dr2po/e00_000_000.po')
+    assert catalog.resolve('e01_000_001.po', game='dr2po') is None
+    assert catalog.resolve('missing.po') is None
+
+    # the same file name in two games is never guessed
+    assert catalog.resolve('e00_000_000.po') is None
+    assert catalog.resolve('e00_000_000.po', game='dr2po') == ('dr2po', '/s/dr2po/e00_000_000.po')
+    assert catalog.resolve('e00_000_000.po', preferred='dr1po') == ('dr1po', '/s/dr1po/e00_000_000.po')
+
+
+def test_remove_script():
+    catalog = ScriptCatalog()
+    catalog.add_game('dr1po', ['/s/dr1po/a.po'])
+    catalog.add_game('dr2po', ['/s/dr2po/a.po'])
+
+    catalog.remove_script('/s/dr1po/a.po')
+    catalog.remove_script('/s/dr1po/unknown.po')
+    assert catalog.resolve('a.po') == ('dr2po', '/s/dr2po/a.po')
+    catalog.remove_script('/s/dr2po/a.po')
+    assert catalog.by_name == {} and catalog.games == {}
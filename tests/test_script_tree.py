@@ -0,0 +1,92 @@
+from PyQt5.QtCore import QModelIndex
+
+from script_tree import ScriptTreeModel, chapter_of
+
+PARTS = ('Prologue', 'Chapitre 1', 'Chapitre 2', 'Chapitre 3', 'Chapitre 4',
+         'Chapitre 5', 'Chapitre 6', 'Epilogue', 'Autres')
+
+
+def _children(model, parent=QModelIndex()):
+    return [model.index(row, 0, parent) for row in range(model.rowCount(parent))]
+
+
+def _texts(model, parent=QModelIndex()):
+    return [model.data(index) for index in _children(model, parent)]
+
+
+def test_chapter_of():
+    assert chapter_of('e00_000_000.po', len(PARTS)) == 0
+    assert chapter_of('e04_123_045.po', len(PARTS)) == 4
+    assert chapter_of('e07_001_000.po', len(PARTS)) == 7
+    assert chapter_of('e08_001_000.po', len(PARTS)) == 8
+    assert chapter_of('novel_000.po', len(PARTS)) == 8
+
+
+def test_tree_levels_and_parents():
+    model = ScriptTreeModel(PARTS)
+    model.add_game('dr1po', ['/s/dr1po/e01_000_001.po', '/s/dr1po/E01_000_000.po',
+                             '/s/dr1po/novel_000.po'])
+    model.add_game('dr2po', [])
+
+    assert model.headerData(0, None) == 'Script'
+    assert model.headerData(1, None) is None
+    assert model.columnCount() == 1
+    assert _texts(model) == ['dr1po', 'dr2po']
+
+    game = model.index(0)
+    assert _texts(model, game) == list(PARTS)
+    chapter = model.index(1, 0, game)
+    assert _texts(model, chapter) == ['E01_000_000.po', 'e01_000_001.po']
+    assert _texts(model, model.index(8, 0, game)) == ['novel_000.po']
+
+    script = model.index(1, 0, chapter)
+    assert model.script_at(script) == ('dr1po', 'e01_000_001.po')
+    assert model.script_at(chapter) is None and model.script_at(game) is None
+    assert model.rowCount(script) == 0
+    assert model.rowCount(model.createIndex(0, 1, 0)) == 0
+    assert model.parent(script) == chapter
+    assert model.parent(chapter) == game
+    assert not model.parent(game).isValid()
+    assert model.data(script, role=1) is None
+    assert not model.index(2, 0, chapter).isValid()
+
+
+def test_filter_by_prefix():
+    model = ScriptTreeModel(PARTS)
+    model.add_game('dr1po', ['/s/e04_123_045.po', '/s/e04_123_046.po', '/s/e04_124_000.po',
+                             '/s/e05_123_045.po'])
+    model.add_game('dr2po', ['/s/e00_000_000.po'])
+    assert model.first_script() == model.index(0, 0, model.index(4, 0, model.index(0)))
+
+    model.set_filter('E04_123')
+    assert _texts(model) == ['dr1po']
+    chapters = _children(model, model.index(0))
+    assert _texts(model, model.index(0)) == ['Chapitre 4']
+    assert _texts(model, chapters[0]) == ['e04_123_045.po', 'e04_123_046.po']
+    first = model.first_script()
+    assert model.script_at(first) == ('dr1po', 'e04_123_045.po')
+    assert model.parent(first) == chapters[0]
+
+    # games added while filtering only show up when they match
+    model.add_game('dr3po', ['/s/e01_000_000.po'])
+    assert _texts(model) == ['dr1po']
+    model.add_game('dr4po', ['/s/e04_123_999.po'])
+    assert _texts(model) == ['dr1po', 'dr4po']
+
+    model.set_filter('zzz')
+    assert model.rowCount() == 0
+    assert not model.first_script().isValid()
+
+    model.set_filter('')
+    assert _texts(model) == ['dr1po', 'dr2po', 'dr3po', 'dr4po']
+
+
+def test_add_and_remove_script():
+    model = ScriptTreeModel(PARTS)
+    model.add_game('dr1po', ['/s/e01_000_002.po'])
+    chapter = model.index(1, 0, model.index(0))
+
+    model.add_script('dr1po', '/s/e01_000_001.po')
+    assert _texts(model, chapter) == ['e01_000_001.po', 'e01_000_002.po']
+    model.remove_script('dr1po', '/s/e01_000_002.po')
+    assert _texts(model, chapter) == ['e01_000_001.po']
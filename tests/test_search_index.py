@@ -0,0 +1,121 @@
+import random
+
+from search_index import SEARCH_TAGS, SearchIndex, fold, iter_search
+
+
+def _scan(script_data, text):
+    """The linear search the index replaces."""
+    hits = set()
+    for tag in SEARCH_TAGS:
+        for script, lines in script_data.get(tag, {}).items():
+            for i, line in enumerate(lines):
+                if text.lower() in line.lower():
+                    hits.add((script, i))
+    return sorted(hits)
+
+
+def _lines(hits):
+    return [(script, line) for script, line, *_ in hits]
+
+
+def _corpus(rng, scripts=20, lines=30):
+    words = ['Makoto', 'porte', 'ÉCOLE', 'école', 'ouvre', 'nuit', 'Kirigiri', '希望', 'の', '<CLT 03>', 'a']
+    data = {tag: {} for tag in SEARCH_TAGS}
+    for s in range(scripts):
+        script = '/game/e%02d.po' % s
+        for tag in SEARCH_TAGS:
+            # JAPANESE/COMMENT may be shorter than the other tags
+            count = lines if tag in ('TRANSLATED', 'ORIGINAL') else rng.randrange(lines)
+            data[tag][script] = ['\n' + ' '.join(rng.choice(words) for _ in range(rng.randrange(6))) + '\n'
+                                 for _ in range(count)]
+    return data
+
+
+def test_search_matches_linear_scan():
+    rng = random.Random(1)
+    data = _corpus(rng)
+    index = SearchIndex(data)
+    queries = ['makoto', 'École', 'porte ouvre', '希望の', 'a', 'ri', '', 'nuit nuit nuit', 'absent', 'e\n']
+    for query in queries:
+        assert _lines(index.search(query)) == _scan(data, query), query
+
+
+def test_search_does_not_match_across_tags():
+    data = {'ORIGINAL': {'s': ['\nabc\n']}, 'TRANSLATED': {'s': ['\ndef\n']}}
+    index = SearchIndex(data)
+    assert _lines(index.search('abc')) == [('s', 0)]
+    assert index.search('c\ndef') == []
+
+
+def test_index_follows_edits_and_reloads():
+    rng = random.Random(2)
+    data = _corpus(rng, scripts=5, lines=10)
+    index = SearchIndex(data)
+
+    data['TRANSLATED']['/game/e01.po'][3] = '\nUne toute nouvelle réplique\n'
+    index.invalidate('/game/e01.po')
+    assert _lines(index.search('NOUVELLE')) == [('/game/e01.po', 3)]
+
+    # reloaded script with more lines, and a removed one
+    data['ORIGINAL']['/game/e02.po'].append('\nligne ajoutée\n')
+    data['TRANSLATED']['/game/e02.po'].append('\n\n')
+    index.invalidate('/game/e02.po')
+    for tag in SEARCH_TAGS:
+        data[tag].pop('/game/e03.po')
+    index.invalidate('/game/e03.po')
+
+    for query in ('ajoutée', 'makoto', 'nouvelle', 'kirigiri porte'):
+        assert _lines(index.search(query)) == _scan(data, query), query
+
+
+def test_index_tolerates_missing_tags():
+    index = SearchIndex({'ORIGINAL': {'s': ['\nHello\n']}})
+    assert _lines(index.search('hello')) == [('s', 0)]
+
+
+def test_iter_search_streams_sorted_batches():
+    data = {'ORIGINAL': {'/g/%02d.po' % s: ['\nla porte\n'] * 7 for s in range(6)}}
+    index = SearchIndex(data)
+    batches = list(iter_search(index.snapshot(), 'PORTE', batch_size=10))
+    # a script is never split between two batches
+    assert [len(b) for b in batches] == [14, 14, 14]
+    assert [hit for b in batches for hit in b] == index.search('porte')
+    assert _lines(index.search('porte')) == _scan(data, 'porte')
+    assert list(iter_search(index.snapshot(), 'absent')) == []
+
+
+def test_snapshot_is_not_affected_by_later_edits():
+    data = {'ORIGINAL': {'s': ['\nhello\n']}}
+    index = SearchIndex(data)
+    snapshot = index.snapshot()
+    data['ORIGINAL']['s'][0] = '\nbye\n'
+    index.invalidate('s')
+    assert _lines(h for b in iter_search(snapshot, 'hello') for h in b) == [('s', 0)]
+    assert index.search('hello') == []
+
+
+def test_hits_point_to_the_first_matching_tag():
+    rng = random.Random(3)
+    data = _corpus(rng)
+    index = SearchIndex(data)
+    for query in ('makoto', 'É', 'porte ouvre', '希望', '\nkiri'):
+        for script, line, tag, start, end in index.search(query):
+            tables = [data[t][script] for t in SEARCH_TAGS]
+            texts = [lines[line].lower() if line < len(lines) else '' for lines in tables]
+            assert tag == min(i for i, text in enumerate(texts) if query.lower() in text)
+            assert texts[tag][start:end] == query.lower()
+            assert texts[tag].find(query.lower()) == start
+
+
+def test_spans_are_offsets_in_the_original_text():
+    # 'İ'.lower() is two characters long: it must not shift what follows
+    line = '\nİSTANBUL, İzmir et Paris\n'
+    index = SearchIndex({'ORIGINAL': {'s': [line]}})
+    for query in ('paris', 'stanbul', 'İzMIR', 'İ'):
+        hits = index.search(query)
+        assert hits, query
+        for _, _, _, start, end in hits:
+            assert line[start:end].lower() == query.lower(), query
+    assert [h[3:] for h in index.search('i')] == [(14, 15)]
+    assert fold(line) == '\nİstanbul, İzmir et paris\n'
+    assert fold('École') == 'école'
@@ -0,0 +1,39 @@
+from translation_memory import TranslationMemory
+
+
+def _data(scripts):
+    return {
+        'ORIGINAL': {script: ['\n%s\n' % o for o, _ in lines] for script, lines in scripts.items()},
+        'TRANSLATED': {script: ['\n%s\n' % t for _, t in lines] for script, lines in scripts.items()},
+    }
+
+
+def test_lookup_across_games():
+    tm = TranslationMemory()
+    tm.add_game('dr1', _data({'a.po': [('Hello', 'Bonjour'), ('World', '')]}))
+    tm.add_game('dr2', _data({'b.po': [('Hello', 'Salut'), ('World', 'Monde')]}))
+
+    # the first translation found is kept, new ones are added
+    assert tm.lookup('\nHello\n') == ('\nBonjour\n', 'dr1')
+    assert tm.lookup('\nWorld\n') == ('\nMonde\n', 'dr2')
+    assert tm.lookup('\nOther\n') is None
+
+    # edits override it, but not with an empty translation
+    assert tm.learn('dr2', '\nHello\n', '\nCoucou\n') is True
+    assert tm.learn('dr1', '\nHello\n', '\n\n') is False
+    assert tm.learn('dr1', '\nHello\n', '\nCoucou\n') is False
+    assert tm.lookup('\nHello\n') == ('\nCoucou\n', 'dr2')
+
+
+def test_pretranslations():
+    tm = TranslationMemory()
+    tm.add_game('dr1', _data({'a.po': [('Hello', 'Bonjour'), ('World', 'Monde')]}))
+    data = _data({
+        'b.po': [('Hello', ''), ('Other', ''), ('World', 'Terre')],
+        'c.po': [('Other', '')],
+        'd.po': [('World', ''), ('Hello', '')],
+    })
+    assert tm.pretranslations(data) == {
+        'b.po': [(0, '\nBonjour\n')],
+        'd.po': [(0, '\nMonde\n'), (1, '\nBonjour\n')],
+    }
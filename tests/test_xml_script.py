@@ -0,0 +1,84 @@
+import codecs
+
+import pytest
+
+from xml_script import XmlScript, decode_script, detect_encoding, splice_lines
+
+
+def _script(lines, tag='TRANSLATED', first=1):
+    return ''.join('<ORIGINAL N°%03d>\nO%d\n</ORIGINAL N°%03d>\n<%s N°%03d>%s</%s N°%03d>\n'
+                   % (i, i, i, tag, i, line, tag, i) for i, line in enumerate(lines, first))
+
+
+def test_index_all_tags_in_one_pass():
+    buffer = _script(['\nA\n', '\n\n', '\nmulti\nline\n'])
+    script = XmlScript(buffer)
+    assert script.lines('TRANSLATED') == ['\nA\n', '\n\n', '\nmulti\nline\n']
+    assert script.lines('ORIGINAL') == ['\nO1\n', '\nO2\n', '\nO3\n']
+    assert script.count('TRANSLATED') == 3
+    assert script.key('ORIGINAL', 2) == '003'
+    assert script.line('TRANSLATED', 2) == '\nmulti\nline\n'
+    assert [buffer[start:end] for start, end in script.spans('TRANSLATED')] == script.lines('TRANSLATED')
+    assert script.count('COMMENT') == 0
+    assert script.spans('COMMENT') == [] and script.lines('COMMENT') == []
+
+
+def test_splice_only_changed_elements():
+    buffer = _script(['\nA\n', '\nB\n', '\nA\n'])
+    spans = XmlScript(buffer).spans('TRANSLATED')
+
+    assert splice_lines(buffer, spans, ['\nA\n', '\nB\n', '\nA\n']) == buffer
+    # the same text elsewhere in the file is left alone
+    assert splice_lines(buffer, spans, ['\nA\n', '\nB\n', '\nC\n']) == _script(['\nA\n', '\nB\n', '\nC\n'])
+    assert splice_lines(buffer, spans, ['\nlonger text\n', '\nB\n', '\n\n']) == \
+        _script(['\nlonger text\n', '\nB\n', '\n\n'])
+    # elements past the given lines are kept
+    assert splice_lines(buffer, spans, ['\nZ\n']) == _script(['\nZ\n', '\nB\n', '\nA\n'])
+
+
+def test_with_lines_updates_the_offsets():
+    script = XmlScript(_script(['\nA\n', '\nB\n']))
+    new = script.with_lines('TRANSLATED', ['\nlonger A\n', '\nB\n'])
+    assert new.buffer == _script(['\nlonger A\n', '\nB\n'])
+    assert new.lines('TRANSLATED') == ['\nlonger A\n', '\nB\n']
+    assert new.lines('ORIGINAL') == ['\nO1\n', '\nO2\n']
+    # the original script is left as it was
+    assert script.lines('TRANSLATED') == ['\nA\n', '\nB\n']
+
+
+def test_four_digit_keys():
+    script = XmlScript(_script(['\nX\n', '\nY\n'], first=999))
+    assert script.key('TRANSLATED', 1) == '1000'
+    assert script.line('TRANSLATED', 1) == '\nY\n'
+    new = script.with_lines('TRANSLATED', ['\nX\n', '\nYY\n'])
+    assert new.buffer == _script(['\nX\n', '\nYY\n'], first=999)
+    assert '</TRANSLATED N°1000>\n' in new.buffer
+
+
+def test_detect_encoding():
+    text = _script(['\nété\n'])
+    assert detect_encoding(text.encode('utf-16-le')) == 'utf-16-le'
+    assert detect_encoding(text.encode('utf-16-be')) == 'utf-16-be'
+    assert detect_encoding(text.encode('utf-8')) == 'utf-8'
+    assert detect_encoding(codecs.BOM_UTF8 + text.encode('utf-8')) == 'utf-8'
+    assert detect_encoding(codecs.BOM_UTF16_LE + text.encode('utf-16-le')) == 'utf-16-le'
+    assert detect_encoding(codecs.BOM_UTF16_BE + text.encode('utf-16-be')) == 'utf-16-be'
+    assert detect_encoding(b'') == 'utf-8'
+
+
+def test_decode_script_keeps_the_bom_and_falls_back_to_utf16():
+    text = '\ufeff' + _script(['\nA\n'])
+    assert decode_script(text.encode('utf-16-le')) == (text, 'utf-16-le')
+    assert decode_script(text.encode('utf-8')) == (text, 'utf-8')
+    # no BOM and a first character that is not ASCII
+    assert decode_script('日本'.encode('utf-16-le')) == ('日本', 'utf-16-le')
+    with pytest.raises(UnicodeDecodeError):
+        decode_script(b'<\x00\x00\xd8')
+
+
+def test_with_lines_keeps_the_encoding():
+    script = XmlScript(_script(['\nA\n']), 'utf-8')
+    new = script.with_lines('TRANSLATED', ['\nÉ\n'])
+    assert new.encoding == 'utf-8'
+    assert new.encode() == _script(['\nÉ\n']).encode('utf-8')
+    assert XmlScript('').encoding == 'utf-16-le'
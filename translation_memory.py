@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""Translation memory shared by all the loaded games.
+
+The dupes of a game (see dupes_index) only link the lines of that game; the
+memory remembers a translation for every ORIGINAL line of every game, so
+that a line already translated in dr1 can be offered, or filled in, in
+dr2. Lines are matched on their exact text with one dict lookup, and the
+translations are the strings of the script data, not copies.
+"""
+
+
+class TranslationMemory:
+
+    def __init__(self):
+        # ORIGINAL line -> (TRANSLATED line, game it was found in)
+        self.translations = dict()
+
+    def add_script(self, game, script_data, script):
+        """Remember the translated lines of a script, without overriding
+        what is already known. Returns the ORIGINAL lines it did not know."""
+        translations = self.translations
+        added = list()
+        for original, translated in zip(script_data['ORIGINAL'][script],
+                                        script_data['TRANSLATED'].get(script, ())):
+            if translated[1:-1] != '' and original not in translations:
+                translations[original] = translated, game
+                added.append(original)
+        return added
+
+    def add_game(self, game, script_data):
+        for script in script_data['ORIGINAL']:
+            self.add_script(game, script_data, script)
+
+    def learn(self, game, original, translated):
+        """A line was translated (again) and saved. Returns whether the
+        memory changed: a translation it already has keeps its game."""
+        known = self.translations.get(original)
+        if translated[1:-1] == '' or (known is not None and known[0] == translated):
+            return False
+        self.translations[original] = translated, game
+        return True
+
+    def lookup(self, original):
+        """(TRANSLATED line, game) known for an ORIGINAL line, or None"""
+        return self.translations.get(original)
+
+    def pretranslations(self, script_data):
+        """
+        The untranslated lines of a game the memory has a translation for,
+        as {script: [(line index, TRANSLATED line)]}
+        """
+        get = self.translations.get
+        found = dict()
+        for script, originals in script_data['ORIGINAL'].items():
+            lines = list()
+            for line_index, (original, translated) in enumerate(
+                    zip(originals, script_data['TRANSLATED'].get(script, ()))):
+                if translated[1:-1] == '':
+                    known = get(original)
+                    if known is not None:
+                        lines.append((line_index, known[0]))
+            if lines:
+                found[script] = lines
+        return found
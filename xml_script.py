@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""Lines of the legacy DRAT .xml scripts.
+
+For each tag (TRANSLATED, ORIGINAL, ...), a script holds one element per
+line, in line order: <TRANSLATED N°001>\\ntext\\n</TRANSLATED N°001>. An
+XmlScript locates the text of all the elements in one regex pass, so that
+reading or comparing a line is a slice, and writing a script only replaces
+the text of the elements that changed, with one join. script_lines reads
+the lines of several tags with the same single pass, without the offsets.
+
+DRAT writes its scripts in UTF-16-LE, but UTF-8 ones exist too: the codec
+of a file is picked once from its first bytes (see detect_encoding), and
+kept with its XmlScript to write it back the same way.
+"""
+
+import codecs
+import re
+from array import array
+
+# an element: its tag, its N° key and its text. The text is read by runs
+# of characters other than '<', which is much faster than a lazy '.*?'
+_ELEMENT = re.compile('<([A-Z_]+) N°([^>]*)>([^<]*(?:<(?!/\\1 N°)[^<]*)*)</\\1 N°')
+
+
+def detect_encoding(data):
+    """
+    Codec of the bytes of a script, from its BOM or else from its first two
+    bytes: the first character of a script is ASCII ('<', a BOM, a line
+    break), so a NUL byte next to it tells UTF-16 and its byte order. The
+    BOM is not consumed, it stays in the text and is written back.
+    """
+    if data.startswith(codecs.BOM_UTF8):
+        return 'utf-8'
+    if data.startswith(codecs.BOM_UTF16_LE):
+        return 'utf-16-le'
+    if data.startswith(codecs.BOM_UTF16_BE):
+        return 'utf-16-be'
+    if data[1:2] == b'\x00' and data[:1] != b'\x00':
+        return 'utf-16-le'
+    if data[:1] == b'\x00' and data[1:2] != b'\x00':
+        return 'utf-16-be'
+    return 'utf-8'
+
+
+def decode_script(data):
+    """(text, codec) of the bytes of a script, see detect_encoding. Bytes
+    that are not UTF-8 after all are read as UTF-16-LE."""
+    encoding = detect_encoding(data)
+    try:
+        return data.decode(encoding), encoding
+    except UnicodeDecodeError:
+        if encoding != 'utf-8':
+            raise
+        return data.decode('utf-16-le'), 'utf-16-le'
+
+
+class XmlScript:
+
+    def __init__(self, buffer, encoding='utf-16-le'):
+        self.buffer = buffer
+        # codec the script is written with
+        self.encoding = encoding
+        # tag -> N° keys of its elements, and where their text starts and
+        # ends in the buffer, in line order
+        self.keys = dict()
+        self.starts = dict()
+        self.ends = dict()
+        for match in _ELEMENT.finditer(buffer):
+            tag = match.group(1)
+            if tag not in self.keys:
+                self.keys[tag] = list()
+                self.starts[tag] = array('I')
+                self.ends[tag] = array('I')
+            start, end = match.span(3)
+            self.keys[tag].append(match.group(2))
+            self.starts[tag].append(start)
+            self.ends[tag].append(end)
+
+    def encode(self):
+        return self.buffer.encode(self.encoding)
+
+    def count(self, tag_name):
+        return len(self.keys.get(tag_name, ()))
+
+    def key(self, tag_name, index):
+        return self.keys[tag_name][index]
+
+    def line(self, tag_name, index):
+        return self.buffer[self.starts[tag_name][index]:self.ends[tag_name][index]]
+
+    def lines(self, tag_name):
+        return [self.buffer[start:end] for start, end in self.spans(tag_name)]
+
+    def spans(self, tag_name):
+        """(start, end) offsets of the text of the `tag_name` elements"""
+        return list(zip(self.starts.get(tag_name, ()), self.ends.get(tag_name, ())))
+
+    def with_lines(self, tag_name, lines):
+        """The script with the text of its `tag_name` elements replaced by
+        `lines` (see splice_lines)"""
+        return XmlScript(splice_lines(self.buffer, self.spans(tag_name), lines), self.encoding)
+
+
+def script_lines(buffer, tag_names):
+    """{tag name: text of its elements, in line order}, for `tag_names`"""
+    tables = {tag_name: list() for tag_name in tag_names}
+    for tag, _, text in _ELEMENT.findall(buffer):
+        lines = tables.get(tag)
+        if lines is not None:
+            lines.append(text)
+    return tables
+
+
+def splice_lines(buffer, spans, lines):
+    """
+    `buffer` with the text of its elements at `spans` replaced by `lines`.
+    Only the elements whose text differs are rewritten, and elements past
+    the last line are left as they are.
+    """
+    pieces = list()
+    position = 0
+    for (start, end), line in zip(spans, lines):
+        if end - start == len(line) and buffer.startswith(line, start):
+            continue
+        pieces.append(buffer[position:start])
+        pieces.append(line)
+        position = end
+    pieces.append(buffer[position:])
+    return ''.join(pieces)